@@ -1,52 +1,42 @@
 import sys
-import time
 
-import serial
 import serial.tools.list_ports
 
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QLineEdit,
-    QComboBox, QPlainTextEdit, QVBoxLayout, QHBoxLayout, QGroupBox
+    QComboBox, QVBoxLayout, QHBoxLayout, QGroupBox
 )
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont
 
+from log_console import LogConsole
+from serial_async import serial_reader
+from serial_io import find_board
+from telemetry import Status, parse_lines
+from telemetry_store import store_for
+
 
 # =========================================================
-# SERIAL READER THREAD (runs in background)
+# BOARD DETECTOR THREAD (probes all ports at once)
 # =========================================================
-class SerialReader(QThread):
-    line_received = pyqtSignal(str)
+class PortDetector(QThread):
+    log = pyqtSignal(str)
+    found = pyqtSignal(str)
+    not_found = pyqtSignal()
 
-    def __init__(self, port, baud=115200):
+    def __init__(self, ports):
         super().__init__()
-        self.port = port
-        self.baud = baud
-        self._running = True
-        self.ser = None
+        self.ports = ports
 
     def run(self):
-        try:
-            self.ser = serial.Serial(self.port, self.baud, timeout=1)
-        except Exception as e:
-            self.line_received.emit(f"[ERROR] Could not open {self.port}: {e}")
-            return
-
-        while self._running:
-            try:
-                if self.ser.in_waiting:
-                    line = self.ser.readline().decode(errors="ignore").strip()
-                    if line:
-                        self.line_received.emit(line)
-            except Exception as e:
-                self.line_received.emit(f"[SERIAL ERROR] {e}")
-                break
-
-        if self.ser:
-            self.ser.close()
-
-    def stop(self):
-        self._running = False
+        port = find_board(
+            self.ports,
+            on_skip=lambda p, e: self.log.emit(f"{p} skipped ({e})")
+        )
+        if port:
+            self.found.emit(port)
+        else:
+            self.not_found.emit()
 
 
 # =========================================================
@@ -56,6 +46,8 @@ class PhlotonAutomatedFlashTool(QWidget):
     def __init__(self):
         super().__init__()
         self.serial_thread = None
+        self.store = None
+        self.detector = None
 
         # 1️⃣ Build GUI first
         self.init_ui()
@@ -102,7 +94,7 @@ class PhlotonAutomatedFlashTool(QWidget):
             border: 1px solid #b7d7f7;
             padding: 4px;
         }
-        QPlainTextEdit {
+        QPlainTextEdit, LogConsole {
             background: #ffffff;
             border: 1px solid #9cb9d9;
             font-family: Consolas;
@@ -167,7 +159,7 @@ class PhlotonAutomatedFlashTool(QWidget):
         log_layout = QVBoxLayout()
 
         self.status_label = QLabel("Status: Not Connected")
-        self.log_console = QPlainTextEdit()
+        self.log_console = LogConsole("auto_detect_flash_tool")
         self.log_console.setReadOnly(True)
         self.log_console.setFont(QFont("Consolas", 9))
 
@@ -187,49 +179,51 @@ class PhlotonAutomatedFlashTool(QWidget):
             self.log_console.appendPlainText("No COM ports found")
             return
 
-        for p in ports:
-            self.log_console.appendPlainText(f"Trying {p.device}...")
-            try:
-                ser = serial.Serial(p.device, 115200, timeout=1)
-                ser.reset_input_buffer()
-
-                start = time.time()
-                while time.time() - start < 2.0:
-                    if ser.in_waiting:
-                        line = ser.readline().decode(errors="ignore")
-                        if (
-                            "Enter option number" in line or
-                            "Device MAC ID" in line
-                        ):
-                            ser.close()
-                            self.log_console.appendPlainText(
-                                f"Detected board on {p.device}"
-                            )
-                            self.start_serial_listener(p.device)
-                            return
-
-                ser.close()
-            except Exception as e:
-                self.log_console.appendPlainText(
-                    f"{p.device} skipped ({e})"
-                )
-
-        self.log_console.appendPlainText("No compatible device detected")
+        devices = [p.device for p in ports]
+        self.log_console.appendPlainText(f"Trying {', '.join(devices)}...")
+
+        self.detector = PortDetector(devices)
+        self.detector.log.connect(self.log_console.appendPlainText)
+        self.detector.found.connect(self.board_detected)
+        self.detector.not_found.connect(
+            lambda: self.log_console.appendPlainText("No compatible device detected")
+        )
+        self.detector.start()
+
+    def board_detected(self, port):
+        self.log_console.appendPlainText(f"Detected board on {port}")
+        self.start_serial_listener(port)
 
     def start_serial_listener(self, port):
         self.status_label.setText("Status: Connected")
 
-        self.serial_thread = SerialReader(port)
-        self.serial_thread.line_received.connect(self.handle_serial_line)
+        if self.serial_thread:
+            self.serial_thread.stop()
+            self.serial_thread.wait()
+            self.serial_thread.deleteLater()
+        if self.store:
+            self.store.close()
+
+        self.serial_thread = serial_reader(port, self)
+        self.store = store_for(port)
+        self.serial_thread.data.connect(self.handle_serial_line)
+        self.serial_thread.error.connect(
+            lambda msg: self.log_console.appendPlainText(f"[SERIAL ERROR] {msg}")
+        )
         self.serial_thread.start()
 
-    def handle_serial_line(self, line):
-        self.log_console.appendPlainText(line)
-
-        if "CHARGER:CONNECTED" in line:
-            self.charger_label.setText("Charger: Connected")
-        elif "CHARGER:DISCONNECTED" in line:
-            self.charger_label.setText("Charger: Disconnected")
+    def handle_serial_line(self, text):
+        # batches still queued from a reader replaced on re-detect are dropped
+        if self.sender() is not self.serial_thread:
+            return
+        self.log_console.appendPlainText(text)
+
+        records = parse_lines(text)
+        self.serial_thread.track(records)
+        self.store.add(records, self.serial_thread.arrived())
+        for rec in records:
+            if isinstance(rec, Status) and rec.name == "CHARGER":
+                self.charger_label.setText(f"Charger: {rec.state.title()}")
 
 
 # =========================================================
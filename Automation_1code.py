@@ -1,11 +1,13 @@
 import sys
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QLineEdit,
-    QComboBox, QPlainTextEdit, QVBoxLayout, QHBoxLayout, QGroupBox
+    QComboBox, QVBoxLayout, QHBoxLayout, QGroupBox
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
 
+from log_console import LogConsole
+
 
 class PhlotonAutomatedFlashTool(QWidget):
     def __init__(self):
@@ -56,7 +58,7 @@ class PhlotonAutomatedFlashTool(QWidget):
             padding: 4px;
         }
 
-        QPlainTextEdit {
+        QPlainTextEdit, LogConsole {
             background: #ffffff;
             border: 1px solid #9cb9d9;
             font-family: Consolas;
@@ -129,7 +131,7 @@ class PhlotonAutomatedFlashTool(QWidget):
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
 
         # Log text area
-        self.log_console = QPlainTextEdit()
+        self.log_console = LogConsole("automation_1_flash_tool")
         self.log_console.setReadOnly(True)
         self.log_console.setFont(QFont("Consolas", 9))
 
@@ -1,18 +1,22 @@
 import sys
-import os
-import glob
-import subprocess
-import time
-import serial
+import threading
 
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QThread, QTimer, pyqtSignal
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton,
-    QFileDialog, QPlainTextEdit, QVBoxLayout, QHBoxLayout,
-    QComboBox, QGroupBox
+    QFileDialog, QVBoxLayout, QHBoxLayout,
+    QComboBox, QGroupBox, QProgressBar, QCheckBox
 )
 from serial.tools import list_ports
 
+from adc_convert import RawDecoder, calibration_for
+from chip_cache import cache
+from device_watcher import bind_combo, watcher
+from log_console import LogConsole
+from pipeline import detect_chip, flash_firmware
+from serial_async import serial_reader
+from telemetry_store import store_for
+
 
 # ============================================================
 # LIGHT THEME
@@ -24,37 +28,40 @@ def apply_light_theme(app):
     QGroupBox { border:1px solid #b7d7f7; margin-top:10px; padding-top:16px; }
     QGroupBox::title { color:#0b4f7c; font-weight:bold; }
     QPushButton { background:#eef5fb; border:1px solid #9ec9eb; padding:6px; }
-    QPlainTextEdit { font-family:Consolas; font-size:10pt; }
+    QPlainTextEdit, LogConsole { font-family:Consolas; font-size:10pt; }
     """)
 
 
 # ============================================================
 # WORKER: CHIP DETECTION
 # ============================================================
+DETECT_DEBOUNCE_MS = 300
+
+
 class ChipDetectWorker(QThread):
-    detected = pyqtSignal(str)
+    detected = pyqtSignal(str, str)     # chip, MAC
     failed = pyqtSignal()
 
     def __init__(self, port):
         super().__init__()
         self.port = port
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Kill the esptool run; a cancelled worker emits nothing."""
+        self._cancel.set()
 
     def run(self):
         try:
-            p = subprocess.run(
-                [sys.executable, "-m", "esptool", "--port", self.port, "chip_id"],
-                capture_output=True, text=True, timeout=5
-            )
-            out = p.stdout.lower()
-            if "esp32-s3" in out:
-                self.detected.emit("esp32s3")
-            elif "esp32-s2" in out:
-                self.detected.emit("esp32s2")
-            elif "esp32" in out:
-                self.detected.emit("esp32")
-            else:
-                self.failed.emit()
+            info = detect_chip(self.port, cancel=self._cancel)
         except:
+            info = None
+
+        if self._cancel.is_set():
+            return
+        if info:
+            self.detected.emit(info.chip, info.mac)
+        else:
             self.failed.emit()
 
 
@@ -62,82 +69,22 @@ class ChipDetectWorker(QThread):
 # WORKER: FLASH TOOL
 # ============================================================
 class FlashWorker(QThread):
-    log = pyqtSignal(str)
+    log = pyqtSignal(str)           # one esptool line at a time, as printed
+    progress = pyqtSignal(int)      # 0-100 across all images
     finished = pyqtSignal(bool)
 
-    def __init__(self, port, chip, firmware):
+    def __init__(self, port, chip, firmware, diff=False):
         super().__init__()
         self.port = port
         self.chip = chip
         self.firmware = firmware
+        self.diff = diff        # write only the regions whose digest differs
 
     def run(self):
-        fw_dir = os.path.dirname(self.firmware)
-        boot = part = None
-
-        # auto-find bootloader + partition files
-        for root, _, _ in os.walk(fw_dir):
-            if not boot:
-                b = glob.glob(os.path.join(root, "*bootloader*.bin"))
-                if b:
-                    boot = b[0]
-
-            if not part:
-                p = glob.glob(os.path.join(root, "*partitions*.bin"))
-                if p:
-                    part = p[0]
-
-            if boot and part:
-                break
-
-        if not boot or not part:
-            self.log.emit("ERROR: bootloader or partition bin not found!")
-            self.finished.emit(False)
-            return
-
-        cmd = [
-            sys.executable, "-m", "esptool",
-            "--chip", self.chip,
-            "--port", self.port,
-            "--baud", "921600",
-            "--before", "default_reset",
-            "--after", "hard_reset",
-            "write_flash", "-z",
-            "0x0000", boot,
-            "0x8000", part,
-            "0x10000", self.firmware
-        ]
-
-        p = subprocess.run(cmd, capture_output=True, text=True)
-        self.log.emit(p.stdout + p.stderr)
-        self.finished.emit(p.returncode == 0)
-
-
-# ============================================================
-# SERIAL MONITOR THREAD
-# ============================================================
-class SerialReader(QThread):
-    data = pyqtSignal(str)
-
-    def __init__(self, port):
-        super().__init__()
-        self.port = port
-        self.running = True
-
-    def run(self):
-        try:
-            ser = serial.Serial(self.port, 115200, timeout=1)
-            while self.running:
-                if ser.in_waiting:
-                    line = ser.readline().decode(errors="ignore").strip()
-                    if line:
-                        self.data.emit(line)
-            ser.close()
-        except:
-            pass
-
-    def stop(self):
-        self.running = False
+        ok = flash_firmware(
+            self.port, self.chip, self.firmware, self.log.emit, self.progress.emit, self.diff
+        )
+        self.finished.emit(ok)
 
 
 # ============================================================
@@ -148,12 +95,20 @@ class AutomationTool(QWidget):
         super().__init__()
         self.chip = None
         self.reader = None
+        self.store = None
+        self.detector = None
+        self.monitor_port = None
 
         self.setWindowTitle("Phloton Automated Flash Tool")
 
         self.build_ui()
         self.refresh_ports()
 
+        # follow hotplug: the board re-enumerates after hard_reset
+        self.port_events = bind_combo(self.port_cb)
+        self.port_events.added.connect(self.port_added)
+        self.port_events.removed.connect(self.port_removed)
+
         self.status.setText("Status: Not Connected")
         self.flash_btn.setEnabled(False)
 
@@ -207,11 +162,27 @@ class AutomationTool(QWidget):
         self.flash_btn = QPushButton("Flash")
         self.flash_btn.clicked.connect(self.flash)
 
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 100)
+
+        self.diff_cb = QCheckBox("Skip unchanged regions")
+        self.diff_cb.setChecked(True)
+
+        station = QPushButton("Flash Station (all ports)")
+        station.clicked.connect(self.open_station)
+
+        monitor = QPushButton("Monitor All Boards")
+        monitor.clicked.connect(self.open_monitor)
+
         fl.addWidget(QLabel("Application (.bin):"))
         fl.addWidget(self.bin_edit)
         fl.addWidget(browse)
         fl.addSpacing(6)
         fl.addWidget(self.flash_btn)
+        fl.addWidget(self.diff_cb)
+        fl.addWidget(self.progress)
+        fl.addWidget(station)
+        fl.addWidget(monitor)
         fl.addStretch()
 
         top.addWidget(flash, 1)
@@ -223,7 +194,7 @@ class AutomationTool(QWidget):
         ll = QVBoxLayout(log_box)
 
         self.status = QLabel("Status:")
-        self.log = QPlainTextEdit()
+        self.log = LogConsole("automation_tool")
         self.log.setReadOnly(True)
 
         ll.addWidget(self.status)
@@ -231,7 +202,12 @@ class AutomationTool(QWidget):
 
         main.addWidget(log_box, 1)
 
-        self.port_cb.currentTextChanged.connect(self.detect_chip)
+        # the combo changes in bursts (refresh, hotplug); probe once it settles
+        self.detect_timer = QTimer(self)
+        self.detect_timer.setSingleShot(True)
+        self.detect_timer.setInterval(DETECT_DEBOUNCE_MS)
+        self.detect_timer.timeout.connect(self.detect_chip)
+        self.port_cb.currentTextChanged.connect(self.port_changed)
 
     # ========================================================
     # HELPERS
@@ -249,28 +225,49 @@ class AutomationTool(QWidget):
     # ========================================================
     # CHIP DETECTION
     # ========================================================
+    def port_changed(self, _):
+        self.flash_btn.setEnabled(False)
+        self.detect_timer.start()
+
     def detect_chip(self):
+        # a detection for the previous selection is no longer wanted
+        if self.detector:
+            self.detector.cancel()
+            self.detector = None
+
         port = self.port_cb.currentText()
         if not port:
             self.status.setText("Status: Not Connected")
             self.flash_btn.setEnabled(False)
             return
 
+        known = cache().get(port)
+        if known:
+            self.chip_ok(known.chip, known.mac)
+            return
+
         self.status.setText("Status: Detecting Chip")
         self.flash_btn.setEnabled(False)
 
-        self.detector = ChipDetectWorker(port)
-        self.detector.detected.connect(self.chip_ok)
-        self.detector.failed.connect(self.chip_fail)
-        self.detector.start()
+        worker = ChipDetectWorker(port)
+        worker.setParent(self)          # outlives self.detector if superseded
+        worker.detected.connect(
+            lambda chip, mac, w=worker: w is self.detector and self.chip_ok(chip, mac)
+        )
+        worker.failed.connect(lambda w=worker: w is self.detector and self.chip_fail())
+        worker.finished.connect(worker.deleteLater)
+        self.detector = worker
+        worker.start()
 
-    def chip_ok(self, chip):
+    def chip_ok(self, chip, mac=""):
+        self.detector = None
         self.chip = chip
-        self.chip_lbl.setText(f"Chip: {chip}")
+        self.chip_lbl.setText(f"Chip: {chip} ({mac})" if mac else f"Chip: {chip}")
         self.flash_btn.setEnabled(True)
         self.status.setText("Status: Ready")
 
     def chip_fail(self):
+        self.detector = None
         self.chip_lbl.setText("Chip: --")
         self.flash_btn.setEnabled(False)
         self.status.setText("Status: Chip Detect Failed")
@@ -282,34 +279,89 @@ class AutomationTool(QWidget):
         self.log.clear()
         self.status.setText("Status: Flashing")
 
+        # esptool needs the port; resume monitoring in after_flash
+        self.monitor_port = None
+        if self.reader:
+            self.reader.stop()
+
         self.worker = FlashWorker(
             self.port_cb.currentText(),
             self.chip,
-            self.bin_edit.text()
+            self.bin_edit.text(),
+            self.diff_cb.isChecked()
         )
+        self.progress.setValue(0)
         self.worker.log.connect(self.log.appendPlainText)
+        self.worker.progress.connect(self.progress.setValue)
         self.worker.finished.connect(self.after_flash)
         self.worker.start()
 
+    def open_station(self):
+        # imported here: flash_station builds on this module's workers
+        from flash_station import FlashStation
+
+        self.station = FlashStation(self.bin_edit.text())
+        self.station.resize(1100, 700)
+        self.station.show()
+
+    def open_monitor(self):
+        from board_monitor import BoardMonitor
+
+        self.monitor = BoardMonitor()
+        self.monitor.resize(1100, 700)
+        self.monitor.show()
+
     def after_flash(self, ok):
         if ok:
             self.status.setText("Status: Monitoring")
-            time.sleep(2)
-            self.start_serial()
+            self.monitor_port = self.port_cb.currentText()
+            if self.monitor_port in watcher().ports:
+                self.start_serial()
         else:
             self.status.setText("Status: Flash Failed")
 
     # ========================================================
     # SERIAL MONITOR
     # ========================================================
+    def port_added(self, port):
+        if port == self.monitor_port:
+            self.start_serial()
+
+    def port_removed(self, port):
+        if port == self.monitor_port and self.reader:
+            self.reader.stop()
+
     def start_serial(self):
         if self.reader:
             self.reader.stop()
+            self.reader.wait()
+            self.reader.deleteLater()
+
+        if self.store:
+            self.store.close()
 
-        self.reader = SerialReader(self.port_cb.currentText())
+        self.reader = serial_reader(self.monitor_port, self)
+        self.store = store_for(self.monitor_port)
+        self.decoder = RawDecoder(calibration_for(self.store.board))
         self.reader.data.connect(self.log.appendPlainText)
+        self.reader.data.connect(self.record_telemetry)
+        self.reader.frames.connect(self.record_frames)
+        self.reader.error.connect(self.log.appendPlainText)
         self.reader.start()
 
+    def record_telemetry(self, text):
+        # batches still queued from a reader replaced on reconnect are dropped
+        if self.sender() is self.reader:
+            self.record(self.decoder.feed(text))
+
+    def record_frames(self, frames):
+        if self.sender() is self.reader:
+            self.record(self.decoder.frames(frames))
+
+    def record(self, records):
+        self.reader.track(records)
+        self.store.add(records, self.reader.arrived())
+
 
 # ============================================================
 # MAIN
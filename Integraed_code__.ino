@@ -14,6 +14,19 @@ HardwareSerial ec200uSerial(1);
 #define VREF 1100  // mV for esp_adc calibration
 static esp_adc_cal_characteristics_t adc_chars;
 
+// Raw streaming: print ADC counts at this rate (max ~250 Hz at 115200 baud)
+// for the host to convert (adc_convert.py), instead of the 1 Hz text block.
+// 0 = off.
+#define RAW_STREAM_HZ 0
+
+// Send telemetry (converted or raw) as binary frames instead of text lines;
+// see telemetry_frames.py for the layout. Status lines stay text.
+#define BINARY_FRAMES 0
+#define FRAME_SYNC0 0xA5
+#define FRAME_SYNC1 0x5A
+#define FRAME_READINGS 0x01
+#define FRAME_RAW 0x02
+
 const float SERIES_RESISTOR = 10000.0;     // 10k pull-up or pull-down resistor
 const float NOMINAL_RESISTANCE = 10000.0;  // at 25°C
 const float NOMINAL_TEMPERATURE = 25.0;    // 25°C (in Celsius)
@@ -98,6 +111,36 @@ int shiftIndex = 0;
 // This controls CREATE FILE only when LED mode is active.
 bool sdInitialized = false;
 
+// --- Binary frames: sync, type, seq, len, payload, CRC-16/CCITT-FALSE ---
+uint16_t frameSeq = 0;
+
+uint16_t crc16(const uint8_t* data, size_t len) {
+  uint16_t crc = 0xFFFF;
+  for (size_t i = 0; i < len; i++) {
+    crc ^= (uint16_t)data[i] << 8;
+    for (int b = 0; b < 8; b++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+void sendFrame(uint8_t type, const void* payload, uint8_t len) {
+  uint8_t buf[6 + 32 + 2];
+  buf[0] = FRAME_SYNC0;
+  buf[1] = FRAME_SYNC1;
+  buf[2] = type;
+  buf[3] = frameSeq & 0xFF;
+  buf[4] = frameSeq >> 8;
+  buf[5] = len;
+  memcpy(buf + 6, payload, len);
+  uint16_t crc = crc16(buf + 2, 4 + len);
+  buf[6 + len] = crc & 0xFF;
+  buf[7 + len] = crc >> 8;
+  Serial.write(buf, 8 + len);
+  frameSeq++;
+}
+
 void IRAM_ATTR buttonISR() {
   buttonPressed = true;
 }
@@ -353,6 +396,32 @@ void loop() {
   static unsigned long prevMillis = 0;
   unsigned long now = millis();
 
+#if RAW_STREAM_HZ
+  // ------ Raw counts, in telemetry.CHANNELS order ------
+  static unsigned long prevRawMicros = 0;
+  unsigned long nowMicros = micros();
+  if (nowMicros - prevRawMicros >= 1000000UL / RAW_STREAM_HZ) {
+    prevRawMicros = nowMicros;
+    uint16_t counts[8] = {
+      (uint16_t)analogRead(AMBIENT_PIN), (uint16_t)analogRead(COLDSINK_PIN),
+      (uint16_t)analogRead(HEATSINK_PIN), (uint16_t)analogRead(FLASKTOP_PIN),
+      (uint16_t)analogRead(CSFAN_CURR_PIN), (uint16_t)analogRead(HSFAN_CURR_PIN),
+      (uint16_t)analogRead(PIN_VBATISNS), (uint16_t)analogRead(VOLTAGE_PIN)
+    };
+#if BINARY_FRAMES
+    sendFrame(FRAME_RAW, counts, sizeof(counts));
+#else
+    Serial.printf("RAW %d %d %d %d %d %d %d %d\n",
+                  counts[0], counts[1], counts[2], counts[3],
+                  counts[4], counts[5], counts[6], counts[7]);
+#endif
+  }
+  // the ADC fit the host needs, for tools that connect after boot
+  if (now - prevMillis >= 1000) {
+    prevMillis = now;
+    Serial.printf("RAWCAL %d %d\n", adc_chars.coeff_a, adc_chars.coeff_b);
+  }
+#else
   if (now - prevMillis >= 1000) {
     prevMillis = now;
 
@@ -362,23 +431,27 @@ void loop() {
     float tH = readThermistor(HEATSINK_PIN);
     float tF = readThermistor(FLASKTOP_PIN);
 
+#if !BINARY_FRAMES
     printTemperature(tA, "Ambient");
     printTemperature(tC, "Cold Sink");
     printTemperature(tH, "Heat Sink");
     printTemperature(tF, "Flask Top");
+#endif
 
+    // analogReadMilliVolts() is already calibrated mV: no VCC/ADC_MAX scaling
     int adcCold = analogReadMilliVolts(CSFAN_CURR_PIN);
-    float voltageCSFan = adcCold * (VCC / ADC_MAX);
+    float voltageCSFan = adcCold;  // mV
     //float voltageCSFan = esp_adc_cal_raw_to_voltage(adcCold, &adc_chars); // V
-    float currentCold = voltageCSFan / (GAIN * CSSHUNT_RESISTOR) / 1000;
+    float currentCold = voltageCSFan / (GAIN * CSSHUNT_RESISTOR) / 1000;  // A
 
     int adcHot = analogReadMilliVolts(HSFAN_CURR_PIN);
-    float voltageHSFan = adcHot * (VCC / ADC_MAX);
+    float voltageHSFan = adcHot;  // mV
     //float voltageHSFan = esp_adc_cal_raw_to_voltage(adcHot, &adc_chars); // V
-    float currentHot = voltageHSFan / (GAIN * HSSHUNT_RESISTOR) / 1000;
+    float currentHot = voltageHSFan / (GAIN * HSSHUNT_RESISTOR) / 1000;  // A
 
     int adcValue = analogRead(VOLTAGE_PIN);
-    float inputVoltage = (esp_adc_cal_raw_to_voltage(adcValue, &adc_chars)) * DIVIDER_RATIO;
+    // V, as printed below and as the host's RAW conversion computes it
+    float inputVoltage = esp_adc_cal_raw_to_voltage(adcValue, &adc_chars) * DIVIDER_RATIO / 1000.0;
 
     //------VBATISNS-------------------------------
     const int NUM_SAMPLES = 10;
@@ -393,10 +466,16 @@ void loop() {
     float voltageISNS = adcisns / 1000.0;
     float currentisns = (adcisns - 1650) / 132.0;
     //------------------------------------------------
+#if BINARY_FRAMES
+    // telemetry.CHANNELS order; a disconnected thermistor is NaN
+    float values[8] = { tA, tC, tH, tF, currentCold, currentHot, currentisns, inputVoltage };
+    sendFrame(FRAME_READINGS, values, sizeof(values));
+#else
     Serial.printf("Current CSFAN: %.3f A\n", currentCold);
     Serial.printf("Current HSFAN: %.3f A\n", currentHot);
     Serial.printf("CurrentISNS: %.3f A\n", currentisns);
     Serial.printf("Voltage: %.3f V\n", inputVoltage);
+#endif
     //Serial.printf("VoltageHS: %.3f V\n", voltageHSFan);
     //Serial.printf("VoltageCS: %.3f V\n", voltageCSFan);
 
@@ -405,6 +484,7 @@ void loop() {
     //Serial.printf("ADCISNS: %d\n", adcValue);
     //Serial.printf("ADCISNS(mV): %d\n", adcisns);
   }
+#endif
 }
 
 void runMulticolor() {
@@ -7,6 +7,14 @@ from PyQt5.QtWidgets import (
     QVBoxLayout, QLabel, QPushButton, QComboBox, QMessageBox
 )
 
+from adc_convert import RawDecoder, calibration_for
+from device_watcher import bind_combo
+from serial_async import serial_reader
+from stream_stats import BoardStats
+from telemetry import REFRESH_INTERVAL_MS, LatestReadings, format_reading
+from telemetry_store import store_for
+from trend_plot import trend_plot
+
 
 class BoardTester(QMainWindow):
     def __init__(self):
@@ -14,9 +22,6 @@ class BoardTester(QMainWindow):
         self.setWindowTitle("Board Auto Test GUI")
         self.resize(500, 400)
 
-        # Serial object
-        self.ser = None
-
         # Central widget
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -59,15 +64,42 @@ class BoardTester(QMainWindow):
 
         self.central_widget.setLayout(layout)
 
-        # Timer for updating serial data
+        # telemetry channel -> (label, caption)
+        self.readings = {
+            "Voltage": (self.voltage_label, "Voltage"),
+            "Ambient": (self.ambient_label, "Ambient"),
+            "Cold Sink": (self.coldsink_label, "Cold Sink"),
+            "Heat Sink": (self.heatsink_label, "Heat Sink"),
+            "Flask Top": (self.flashtop_label, "Flask Top"),
+            "CSFAN": (self.csfan_label, "CSFAN Current"),
+            "HSFAN": (self.hsfan_label, "HSFAN Current"),
+        }
+
+        # rolling chart of the same channels
+        self.plot = trend_plot(self.readings)
+        layout.addWidget(self.plot, 1)
+
+        # cadence, jitter, latency, backlog and drops of the serial stream
+        self.ingest_label = QLabel("Ingest: ---")
+        layout.addWidget(self.ingest_label)
+
+        # Readings are drained in the background (serial_async) as fast as
+        # the board prints; the labels repaint at most every REFRESH_INTERVAL_MS
+        self.reader = None
+        self.store = None
+        self.latest = LatestReadings()
+        self.stats = BoardStats()
         self.timer = QTimer()
-        self.timer.timeout.connect(self.read_serial_data)
+        self.timer.timeout.connect(self.refresh_readings)
 
         # Connect button actions
         self.connect_button.clicked.connect(self.connect_serial)
         self.start_button.clicked.connect(self.start_test)
         self.stop_button.clicked.connect(self.stop_test)
 
+        # Follow ports as they are plugged and unplugged
+        self.port_events = bind_combo(self.port_combo)
+
     def refresh_ports(self):
         """Refresh available serial ports."""
         ports = serial.tools.list_ports.comports()
@@ -76,52 +108,78 @@ class BoardTester(QMainWindow):
             self.port_combo.addItem(port.device)
 
     def connect_serial(self):
-        """Connect to the selected COM port."""
+        """Connect to the selected COM port and start draining it."""
         port_name = self.port_combo.currentText()
-        try:
-            self.ser = serial.Serial(port_name, 115200, timeout=1)
-            self.status_label.setText(f"Status: Connected to {port_name}")
-        except serial.SerialException as e:
-            QMessageBox.critical(self, "Error", f"Could not open {port_name}\n{e}")
+        if self.reader:
+            self.reader.stop()
+            self.reader.wait()
+            self.reader.deleteLater()
+
+        if self.store:
+            self.store.close()
+
+        self.reader = serial_reader(port_name, self)
+        self.store = store_for(port_name)
+        self.decoder = RawDecoder(calibration_for(self.store.board))
+        self.stats = BoardStats()
+        self.reader.data.connect(self.handle_data)
+        self.reader.frames.connect(self.handle_frames)
+        self.reader.error.connect(self.serial_error)
+        self.reader.start()
+        self.status_label.setText(f"Status: Connected to {port_name}")
+
+    def from_current_reader(self):
+        """False in a slot for a reader that a reconnect or error has replaced."""
+        return self.reader is not None and self.sender() is self.reader
+
+    def serial_error(self, msg):
+        if not self.from_current_reader():
+            return
+        self.timer.stop()
+        self.reader.deleteLater()
+        self.reader = None
+        self.status_label.setText("Status: Disconnected")
+        QMessageBox.critical(self, "Error", msg)
 
     def start_test(self):
-        """Start reading data."""
-        if self.ser and self.ser.is_open:
-            self.timer.start(1000)  # every 1 second
+        """Start showing readings."""
+        if self.reader:
+            self.timer.start(REFRESH_INTERVAL_MS)
             self.status_label.setText("Status: Testing...")
         else:
             QMessageBox.warning(self, "Warning", "Please connect to a board first!")
 
     def stop_test(self):
-        """Stop reading data."""
+        """Stop showing readings."""
         self.timer.stop()
         self.status_label.setText("Status: Test Stopped")
 
-    def read_serial_data(self):
-        """Read and parse serial data from the board."""
-        if not self.ser or not self.ser.is_open:
-            return
-
-        try:
-            line = self.ser.readline().decode("utf-8").strip()
-            if line:
-                # Example parsing from your code’s Serial output
-                if "Ambient:" in line:
-                    self.ambient_label.setText(line)
-                elif "Cold Sink:" in line:
-                    self.coldsink_label.setText(line)
-                elif "Heat Sink:" in line:
-                    self.heatsink_label.setText(line)
-                elif "Flask Top:" in line:
-                    self.flashtop_label.setText(line)
-                elif "Current CSFAN:" in line:
-                    self.csfan_label.setText(line)
-                elif "Current HSFAN:" in line:
-                    self.hsfan_label.setText(line)
-                elif "Voltage:" in line:
-                    self.voltage_label.setText(line)
-        except Exception as e:
-            print("Serial Read Error:", e)
+    def handle_data(self, text):
+        if self.from_current_reader():
+            self.handle_records(self.decoder.feed(text))
+
+    def handle_frames(self, frames):
+        if self.from_current_reader():
+            self.handle_records(self.decoder.frames(frames))
+
+    def handle_records(self, records):
+        self.reader.track(records)
+        self.stats.add(records, self.reader.arrived())
+        self.latest.add(records)
+        self.store.add(records, self.reader.arrived())
+        self.plot.add(records)
+
+    def refresh_readings(self):
+        """Show the latest value of every changed channel, and the ingest metrics."""
+        for rec in self.latest.take_changed():
+            if rec.channel in self.readings:
+                label, caption = self.readings[rec.channel]
+                label.setText(
+                    f"{caption}: {format_reading(rec)}   ({self.stats.brief(rec.channel)})"
+                )
+                label.setToolTip(self.stats.describe(rec.channel))
+        if self.reader:
+            self.ingest_label.setText(f"Ingest: {self.reader.metrics.format()}")
 
 
 if __name__ == "__main__":
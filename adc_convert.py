@@ -0,0 +1,211 @@
+"""Host-side conversion of raw ADC counts, for boards in raw streaming mode.
+
+With RAW_STREAM_HZ set, Integraed_code__.ino stops converting on the MCU
+and prints one line of 12-bit counts per sample, in telemetry.CHANNELS
+order, plus its ADC calibration once a second:
+
+    RAW 1702 412 2150 998 37 120 2048 1091
+    RAWCAL 20473 78
+
+The tools convert every RAW line of a batch with one set of NumPy
+operations. The math is the firmware's, one stage per function:
+
+    counts -> mV            esp_adc_cal linear fit (coeff_a, coeff_b)
+    mV -> degC              divider resistance, then the Beta equation
+    mV -> A                 shunt amplifier (GAIN, CS/HS shunt) and the ISNS sensor
+    mV -> V                 input divider (DIVIDER_RATIO)
+
+Constants are per board. The ADC fit comes from the board itself (RAWCAL,
+or the "Gradient/Offset of ADC-Voltage curve" boot lines). Everything else
+defaults to the firmware's #defines and can be overridden per board in
+calibration.json:
+
+    {"303a:1001:F4:12:FA:00:11:22": {"beta": 3380, "cs_shunt": 0.302}}
+
+    decoder = RawDecoder(calibration_for(board))
+    records = decoder.feed(text)     # Readings/Statuses, like parse_lines()
+"""
+import os
+import re
+import json
+from collections import namedtuple
+
+import numpy as np
+
+from telemetry import CHANNELS, Reading, parse_lines
+from telemetry_frames import TYPE_RAW, TYPE_READINGS, readings
+
+
+CALIBRATION_FILE = os.environ.get(
+    "PHLOTON_CALIBRATION", os.path.expanduser("~/.config/phloton/calibration.json")
+)
+
+Calibration = namedtuple("Calibration", [
+    "coeff_a", "coeff_b",                       # esp_adc_cal: mV = (a * raw + 2^15) / 2^16 + b
+    "series_resistor", "nominal_resistance", "nominal_temperature", "beta",
+    "vcc_mv", "offset_mv", "open_low_mv", "open_high_mv",
+    "gain", "cs_shunt", "hs_shunt",
+    "isns_zero_mv", "isns_mv_per_a",
+    "divider_ratio",
+], defaults=[
+    # esp_adc_cal default-Vref (1100 mV) fit for ADC_ATTEN_DB_6, until the board says
+    20473, 78,
+    10000.0, 10000.0, 25.0, 3434.0,
+    3300.0, 25.0, 50.0, 4050.0,
+    100.0, 0.3, 0.05,
+    1650.0, 132.0,
+    11.0,
+])
+
+DEFAULT = Calibration()
+
+RAW_PREFIX = "RAW "
+_RAWCAL = re.compile(r"RAWCAL\s+(\d+)\s+(\d+)")
+_GRADIENT = re.compile(r"Gradient of ADC-Voltage curve:\s*(\d+)")
+_OFFSET = re.compile(r"Offset of ADC-Voltage curve:\s*(\d+)")
+
+# column of each channel in a RAW line
+TEMP_COLS = slice(0, 4)
+CS_COL, HS_COL, ISNS_COL, VOLTAGE_COL = 4, 5, 6, 7
+
+
+def calibration_for(board, path=CALIBRATION_FILE):
+    """DEFAULT with the overrides calibration.json has for `board`."""
+    try:
+        with open(path) as f:
+            overrides = json.load(f).get(board, {})
+    except (OSError, ValueError):
+        overrides = {}
+    return DEFAULT._replace(**{k: v for k, v in overrides.items() if k in Calibration._fields})
+
+
+# ============================================================
+# CONVERSIONS (arrays in, arrays out)
+# ============================================================
+def counts_to_mv(raw, cal=DEFAULT):
+    """esp_adc_cal_raw_to_voltage() over an array of 12-bit counts."""
+    raw = np.asarray(raw, np.int64)
+    return ((cal.coeff_a * raw + (1 << 15)) >> 16) + cal.coeff_b
+
+
+def thermistor_c(mv, cal=DEFAULT):
+    """readThermistor(): degC, NaN where the thermistor reads as open."""
+    mv = np.asarray(mv, np.float64)
+    v = mv + cal.offset_mv
+    with np.errstate(divide="ignore", invalid="ignore"):
+        resistance = v * cal.series_resistor / (cal.vcc_mv - v)
+        inv_t = (np.log(resistance / cal.nominal_resistance) / cal.beta
+                 + 1.0 / (cal.nominal_temperature + 273.15))
+        temp = 1.0 / inv_t - 273.15
+    temp[(mv < cal.open_low_mv) | (mv > cal.open_high_mv)] = np.nan
+    return temp
+
+
+def shunt_current_a(mv, shunt, cal=DEFAULT):
+    """Fan current through a `shunt` ohm resistor behind a GAIN amplifier."""
+    return np.asarray(mv, np.float64) / (cal.gain * shunt) / 1000.0
+
+
+def isns_current_a(mv, cal=DEFAULT):
+    """VBATISNS hall sensor: zero at isns_zero_mv, isns_mv_per_a slope."""
+    return (np.asarray(mv, np.float64) - cal.isns_zero_mv) / cal.isns_mv_per_a
+
+
+def divider_voltage_v(mv, cal=DEFAULT):
+    return np.asarray(mv, np.float64) * cal.divider_ratio / 1000.0
+
+
+def convert(counts, cal=DEFAULT):
+    """{channel: values} for an (n, 8) array of RAW counts."""
+    mv = counts_to_mv(counts, cal)
+    temps = thermistor_c(mv[:, TEMP_COLS], cal)
+    out = {ch: temps[:, i] for i, ch in enumerate(CHANNELS[:4])}
+    out["CSFAN"] = shunt_current_a(mv[:, CS_COL], cal.cs_shunt, cal)
+    out["HSFAN"] = shunt_current_a(mv[:, HS_COL], cal.hs_shunt, cal)
+    out["ISNS"] = isns_current_a(mv[:, ISNS_COL], cal)
+    out["Voltage"] = divider_voltage_v(mv[:, VOLTAGE_COL], cal)
+    return out
+
+
+# ============================================================
+# DECODER
+# ============================================================
+class RawDecoder:
+    """parse_lines() for a stream that may carry RAW lines.
+
+    Text lines go through the telemetry parser as before. RAW lines are
+    gathered and converted together, and come out as Readings in sample
+    order. Thermistors that read as open are skipped, like the firmware's
+    "Thermistor disconnected" lines. Calibration lines update `cal`.
+
+    Binary frames (telemetry_frames) go through frames() instead.
+    """
+
+    def __init__(self, cal=DEFAULT):
+        self.cal = cal
+
+    def feed(self, text):
+        if "RAW" not in text and "ADC-Voltage" not in text:
+            return parse_lines(text)
+
+        records = []
+        raw = []
+        for line in text.splitlines():
+            if line.startswith(RAW_PREFIX):
+                raw.append(line[len(RAW_PREFIX):])
+            elif not self._calibration(line):
+                records += parse_lines(line)
+
+        if raw:
+            records += self.readings(self.decode(raw))
+        return records
+
+    def _calibration(self, line):
+        m = _RAWCAL.match(line)
+        if m:
+            self.cal = self.cal._replace(coeff_a=int(m[1]), coeff_b=int(m[2]))
+            return True
+        m = _GRADIENT.search(line)
+        if m:
+            self.cal = self.cal._replace(coeff_a=int(m[1]))
+            return True
+        m = _OFFSET.search(line)
+        if m:
+            self.cal = self.cal._replace(coeff_b=int(m[1]))
+            return True
+        return False
+
+    def decode(self, raw_lines):
+        """{channel: values} for the payloads of RAW lines (prefix removed)."""
+        width = len(CHANNELS)
+        try:
+            counts = np.array(" ".join(raw_lines).split(), np.int64)
+        except ValueError:
+            counts = None
+        if counts is None or len(counts) != len(raw_lines) * width:
+            # a garbled or cut-off line: keep the well-formed ones
+            rows = [r.split() for r in raw_lines]
+            counts = np.array(
+                [r for r in rows if len(r) == width and all(x.isdigit() for x in r)], np.int64
+            )
+        return convert(counts.reshape(-1, width), self.cal)
+
+    def frames(self, frames):
+        """Records from FrameSplitter output (sequence gaps: ingest_metrics)."""
+        records = []
+        for ftype, arr in frames.items():
+            if ftype == TYPE_READINGS:
+                records += readings(arr["values"])
+            elif ftype == TYPE_RAW:
+                records += self.readings(convert(arr["counts"], self.cal))
+        return records
+
+    @staticmethod
+    def readings(values):
+        """Readings, sample by sample, from convert()'s output."""
+        names = list(values)
+        columns = [values[ch].tolist() for ch in names]
+        records = []
+        for row in zip(*columns):
+            records += [Reading(ch, v) for ch, v in zip(names, row) if v == v]
+        return records
@@ -0,0 +1,995 @@
+"""Benchmarks for the station tools, run against fake_board pseudo-terminals.
+
+    python benchmarks.py               # run everything
+    python benchmarks.py reader_cpu    # run one benchmark by name
+"""
+import os
+import sys
+import shlex
+import threading
+import time
+
+from fake_board import FakeBoard, telemetry_block
+from serial_io import LineBatcher, LineReader, open_port
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def script(name):
+    """Path of one of the repo's scripts, wherever the benchmarks run from."""
+    return os.path.join(HERE, name)
+
+
+def command(name):
+    """A PHLOTON_ESPTOOL value that runs script `name` with this interpreter."""
+    return f"{shlex.quote(sys.executable)} {shlex.quote(script(name))}"
+
+
+def report(name, **values):
+    cols = "   ".join(f"{k}={v}" for k, v in values.items())
+    print(f"  {name:<24} {cols}")
+
+
+# ============================================================
+# SERIAL READER CPU
+# ============================================================
+def spin_reader(ser, running, lines):
+    # the loop every SerialReader used before serial_io
+    while running.is_set():
+        if ser.in_waiting:
+            line = ser.readline().decode(errors="ignore").strip()
+            if line:
+                lines.append(line)
+
+
+def blocking_reader(ser, running, lines, reader):
+    while running.is_set():
+        lines.extend(reader.read_lines())
+
+
+def reader_cpu(seconds=5.0):
+    """CPU used by one monitor thread on a board printing 1 Hz telemetry."""
+    print(f"reader_cpu ({seconds:.0f} s per mode, 1 Hz telemetry)")
+
+    for mode in ("spin", "blocking"):
+        board = FakeBoard(period=1.0).start()
+        ser = open_port(board.port)
+        reader = LineReader(ser)
+        running = threading.Event()
+        running.set()
+        lines = []
+        cpu = {}
+
+        def run():
+            t0 = time.thread_time()
+            if mode == "spin":
+                spin_reader(ser, running, lines)
+            else:
+                blocking_reader(ser, running, lines, reader)
+            cpu["used"] = time.thread_time() - t0
+
+        t = threading.Thread(target=run)
+        t.start()
+        time.sleep(seconds)
+
+        stop_t0 = time.perf_counter()
+        running.clear()
+        reader.cancel()
+        t.join()
+        stop_ms = (time.perf_counter() - stop_t0) * 1000
+
+        ser.close()
+        board.close()
+
+        report(
+            mode,
+            cpu=f"{100 * cpu['used'] / seconds:.1f}%",
+            lines=len(lines),
+            stop=f"{stop_ms:.0f} ms",
+        )
+
+
+# ============================================================
+# LOG CONSOLE THROUGHPUT
+# ============================================================
+def ui_throughput(seconds=5.0, period=0.001):
+    """Lines/sec reaching a QPlainTextEdit, and how late a 10 ms UI timer runs."""
+    from PyQt6.QtCore import QElapsedTimer, QThread, QTimer, pyqtSignal
+    from PyQt6.QtWidgets import QApplication, QPlainTextEdit
+
+    class Reader(QThread):
+        data = pyqtSignal(str)
+
+        def __init__(self, port, batched):
+            super().__init__()
+            self.port = port
+            self.batched = batched
+            self.running = True
+            self.reader = None
+
+        def run(self):
+            with open_port(self.port) as ser:
+                self.reader = LineReader(ser)
+                batch = LineBatcher()
+                while self.running:
+                    if not self.batched:
+                        for line in self.reader.read_lines():
+                            self.data.emit(line)
+                        continue
+                    batch.extend(self.reader.read_lines(batch.wait_time()))
+                    if batch.due():
+                        self.data.emit(batch.take())
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"ui_throughput ({seconds:.0f} s per mode, board writes 8 lines / {period * 1000:.0f} ms)")
+
+    for mode in ("per-line", "batched"):
+        board = FakeBoard(period=period).start()
+        log = QPlainTextEdit()
+        log.setReadOnly(True)
+        log.resize(800, 400)
+        log.show()
+
+        delivered = [0]
+        signals = [0]
+
+        def on_data(text, log=log):
+            log.appendPlainText(text)
+            delivered[0] += text.count("\n") + 1
+            signals[0] += 1
+
+        reader = Reader(board.port, mode == "batched")
+        reader.data.connect(on_data)
+
+        lag = {"max": 0.0}
+        beat = QElapsedTimer()
+
+        def tick():
+            ms = beat.restart()
+            lag["max"] = max(lag["max"], ms - 10)
+
+        timer = QTimer()
+        timer.timeout.connect(tick)
+
+        beat.start()
+        timer.start(10)
+        reader.start()
+
+        t0 = time.perf_counter()
+        while time.perf_counter() - t0 < seconds:
+            app.processEvents()
+
+        timer.stop()
+        reader.running = False
+        reader.reader and reader.reader.cancel()
+        reader.wait()
+        app.processEvents()
+        log.close()
+        board.close()
+
+        report(
+            mode,
+            sent=f"{board.lines_sent / seconds:.0f}/s",
+            shown=f"{delivered[0] / seconds:.0f}/s",
+            signals=f"{signals[0] / seconds:.0f}/s",
+            worst_ui_lag=f"{lag['max']:.0f} ms",
+        )
+
+
+# ============================================================
+# LOG CONSOLE SOAK
+# ============================================================
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def console_soak(hours=12):
+    """Memory and append cost after `hours` of 1 Hz telemetry (8 lines/s)."""
+    import tempfile
+
+    import log_console
+    from PyQt6.QtWidgets import QApplication, QPlainTextEdit
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"console_soak ({hours} h of telemetry)")
+
+    block = "\n".join(telemetry_block())
+    seconds = hours * 3600
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        log_console.LOG_DIR = spill_dir
+
+        for mode in ("QPlainTextEdit", "LogConsole"):
+            log = QPlainTextEdit() if mode == "QPlainTextEdit" else log_console.LogConsole("soak")
+            log.resize(800, 400)
+            log.show()
+            app.processEvents()
+
+            rss0 = rss_mb()
+            t0 = time.perf_counter()
+            for i in range(seconds):
+                log.appendPlainText(block)
+                if i % 1000 == 0:
+                    app.processEvents()
+            total = time.perf_counter() - t0
+
+            t1 = time.perf_counter()
+            for _ in range(100):
+                log.appendPlainText(block)
+                app.processEvents()
+            last_us = (time.perf_counter() - t1) * 1e4
+
+            report(
+                mode,
+                rss=f"+{rss_mb() - rss0:.0f} MB",
+                total=f"{total:.1f} s",
+                append_and_paint=f"{last_us:.0f} us",
+            )
+            log.close()
+            log.deleteLater()
+            app.processEvents()
+
+
+# ============================================================
+# TELEMETRY PARSER
+# ============================================================
+def legacy_parse(line):
+    # AutomationTool.parse_serial before telemetry.py
+    import re
+
+    patterns = {
+        "CSFAN": r"Current CSFAN:\s*([\d\.]+)",
+        "HSFAN": r"Current HSFAN:\s*([\d\.]+)",
+        "ISNS": r"CurrentISNS:\s*([\d\.]+)",
+        "Voltage": r"Voltage:\s*([\d\.]+)",
+        "Ambient": r"Ambient\s*->\s*Temp:\s*([\d\.]+)",
+        "Cold Sink": r"Cold Sink\s*->\s*Temp:\s*([\d\.]+)",
+        "Heat Sink": r"Heat Sink\s*->\s*Temp:\s*([\d\.]+)",
+        "Flask Top": r"Flask Top\s*->\s*Temp:\s*([\d\.]+)",
+    }
+
+    found = {}
+    for key, rx in patterns.items():
+        m = re.search(rx, line)
+        if m:
+            found[key] = m.group(1)
+    return found
+
+
+def parser_speed(repeat=2000):
+    """Lines/sec through the old 8-regex loop and telemetry.parse_line."""
+    from telemetry import parse_line
+
+    lines = telemetry_block() + [
+        "LID OPEN",
+        "Heat Sink -> Thermistor disconnected!",
+        ">>> AT+CSQ",
+        "+CSQ: 24,99",
+    ]
+    corpus = lines * repeat
+    print(f"parser_speed ({len(corpus)} lines)")
+
+    for name, fn in (("regex loop", legacy_parse), ("telemetry.parse_line", parse_line)):
+        t0 = time.perf_counter()
+        for line in corpus:
+            fn(line)
+        dt = time.perf_counter() - t0
+        report(name, rate=f"{len(corpus) / dt:,.0f} lines/s")
+
+
+# ============================================================
+# BOARD AUTO-DETECTION
+# ============================================================
+def legacy_find_board(ports):
+    # PhlotonAutomatedFlashTool.auto_detect_com_port before find_board
+    import serial
+
+    for port in ports:
+        ser = serial.Serial(port, 115200, timeout=1)
+        ser.reset_input_buffer()
+        start = time.time()
+        while time.time() - start < 2.0:
+            if ser.in_waiting:
+                line = ser.readline().decode(errors="ignore")
+                if "Enter option number" in line or "Device MAC ID" in line:
+                    ser.close()
+                    return port
+        ser.close()
+    return None
+
+
+def port_detect(n=10, rounds=3):
+    """Time to find the one real board among `n` ports.
+
+    The board sits at a random position in the port list and prints its
+    banner every 0.2-1.8 s. Half of the other ports stream
+    telemetry without a banner, the rest stay silent.
+    """
+    import random
+
+    from serial_io import find_board
+
+    print(f"port_detect ({n} ports, {rounds} rounds)")
+
+    for name, fn in (("sequential", legacy_find_board), ("find_board", find_board)):
+        times = []
+        for _ in range(rounds):
+            target = random.randrange(n)
+            boards = [
+                FakeBoard(
+                    period=0.5 if i % 2 else 0,
+                    banner="Enter option number:" if i == target else None,
+                    banner_delay=random.uniform(0.2, 1.8),
+                    banner_repeat=True,
+                )
+                for i in range(n)
+            ]
+
+            for b in boards:
+                b.start()
+            t0 = time.perf_counter()
+            found = fn([b.port for b in boards])
+            times.append(time.perf_counter() - t0)
+
+            assert found == boards[target].port, (found, boards[target].port)
+            for b in boards:
+                b.close()
+
+        report(name, mean=f"{sum(times) / len(times):.2f} s", worst=f"{max(times):.2f} s")
+
+
+# ============================================================
+# HOTPLUG WATCHER
+# ============================================================
+def hotplug(seconds=5.0, node="/dev/ttyUSB99"):
+    """Idle CPU of port watching and delay from plug to event.
+
+    Plugging is simulated by creating `node` (needs write access to /dev;
+    pyserial lists any /dev/ttyUSB* path).
+    """
+    from device_watcher import DeviceWatcher, scan_ports
+
+    print(f"hotplug ({seconds:.0f} s idle per mode)")
+
+    # the old AutoReconnect loop: enumerate every second
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    while time.perf_counter() - t0 < seconds:
+        scan_ports()
+        time.sleep(1)
+    report("1 s comports() poll", cpu=f"{1000 * (time.process_time() - cpu0) / seconds:.1f} ms/s",
+           latency="up to 1000 ms")
+
+    w = DeviceWatcher().start()
+    cpu0 = time.process_time()
+    time.sleep(seconds)
+    idle = time.process_time() - cpu0
+
+    try:
+        t0 = time.perf_counter()
+        open(node, "w").close()
+        seen = w.wait_for(node, timeout=5)
+        latency = f"{(time.perf_counter() - t0) * 1000:.0f} ms" if seen else "missed"
+    except OSError as e:
+        latency = f"n/a ({e.strerror})"
+    finally:
+        if os.path.exists(node):
+            os.remove(node)
+        w.stop()
+
+    report(f"DeviceWatcher ({w.mode})", cpu=f"{1000 * idle / seconds:.1f} ms/s", latency=latency)
+
+
+# ============================================================
+# ESPTOOL ENGINE
+# ============================================================
+def esptool_overhead(boards=10, app_kb=64):
+    """End-to-end esptool time per board, fresh subprocess vs persistent engine.
+
+    A board is the station's two jobs, chip_id then write_flash -z of an
+    `app_kb` app, run through fake_esptool at its default ~800 kbit/s
+    (close to a 921600 baud flash) in both modes.
+    """
+    import tempfile
+
+    import esptool_engine
+    import flashing
+
+    os.environ["PHLOTON_ESPTOOL"] = command("fake_esptool.py")
+    os.environ["PHLOTON_ESPTOOL_MODULE"] = "fake_esptool"
+    os.environ.pop("FAKE_ESPTOOL_KBPS", None)
+
+    with tempfile.TemporaryDirectory() as d:
+        os.environ["FAKE_ESPTOOL_FLASH"] = d
+        app = os.path.join(d, "app.bin")
+        with open(app, "wb") as f:
+            f.write(b"\xe9" + os.urandom(app_kb * 1024 - 1))
+
+        jobs = [
+            ["--chip", "esp32s3", "--port", "fake", "chip_id"],
+            flashing.write_flash_args("fake", "esp32s3", [(flashing.APP_ADDR, app)]),
+        ]
+        print(f"esptool_overhead ({boards} boards, chip_id + {app_kb} KB write_flash)")
+
+        use_engine = flashing.USE_ENGINE
+        try:
+            for mode in ("subprocess", "engine"):
+                flashing.USE_ENGINE = mode == "engine"
+                if flashing.USE_ENGINE:
+                    esptool_engine.warm_up()
+
+                t0 = time.perf_counter()
+                for _ in range(boards):
+                    for args in jobs:
+                        assert flashing.run_esptool(args, lambda line: None) == 0
+                per_board = (time.perf_counter() - t0) / boards
+
+                report(mode, per_board=f"{per_board * 1000:.0f} ms")
+        finally:
+            # the engines hold this run's FAKE_ESPTOOL_FLASH; later benchmarks get fresh ones
+            flashing.USE_ENGINE = use_engine
+            esptool_engine.shutdown()
+
+
+def diff_flash(boards=3, app_kb=1024):
+    """Re-flashing already-programmed boards: full write_flash vs skip-unchanged.
+
+    Runs fake_esptool at its default ~800 kbit/s, so the write time is close
+    to a real 921600 baud flash; the digest check costs one connect.
+    """
+    import tempfile
+
+    import flashing
+
+    os.environ["PHLOTON_ESPTOOL"] = command("fake_esptool.py")
+
+    with tempfile.TemporaryDirectory() as d:
+        os.environ["FAKE_ESPTOOL_FLASH"] = d
+        images = []
+        for addr, name, magic, size in (
+            (flashing.BOOTLOADER_ADDR, "bootloader.bin", b"\xe9", 20 * 1024),
+            (flashing.PARTITIONS_ADDR, "partitions.bin", b"\xaa\x50", 3 * 1024),
+            (flashing.APP_ADDR, "app.bin", b"\xe9", app_kb * 1024),
+        ):
+            path = os.path.join(d, name)
+            with open(path, "wb") as f:
+                f.write(magic + os.urandom(size - len(magic)))
+            images.append((addr, path))
+
+        ports = [f"fake{i}" for i in range(boards)]
+        quiet = lambda line: None
+        print(f"diff_flash ({boards} boards, {app_kb} KB app, already programmed)")
+
+        for mode in ("full", "diff"):
+            t0 = time.perf_counter()
+            for port in ports:
+                todo = images
+                if mode == "diff":
+                    todo = flashing.changed_images(port, "esp32s3", images, quiet)
+                if todo:
+                    args = flashing.write_flash_args(port, "esp32s3", todo)
+                    assert flashing.run_esptool(args, quiet) == 0
+            per_board = (time.perf_counter() - t0) / boards
+
+            report(mode, per_board=f"{per_board:.2f} s")
+
+
+def image_cache_cpu(boards=10, app_kb=1024):
+    """Host CPU per board for write_flash -z, with and without image_cache.
+
+    Each board is a fresh one-shot esptool process (fake_esptool, which
+    deflates its images at level 9 like esptool does); the CPU time of the
+    children is what is compared.
+    """
+    import random
+    import resource
+    import tempfile
+
+    import flashing
+    import image_cache
+    from firmware_index import bundle_for
+
+    def child_cpu():
+        r = resource.getrusage(resource.RUSAGE_CHILDREN)
+        return r.ru_utime + r.ru_stime
+
+    os.environ["PHLOTON_ESPTOOL"] = command("esptool_engine.py")
+    os.environ["PHLOTON_ESPTOOL_MODULE"] = "fake_esptool"
+    os.environ["FAKE_ESPTOOL_KBPS"] = "1000000"
+
+    with tempfile.TemporaryDirectory() as d:
+        os.environ["FAKE_ESPTOOL_FLASH"] = d
+        image_cache.CACHE_DIR = os.environ["PHLOTON_IMAGE_CACHE_DIR"] = os.path.join(d, "cache")
+
+        # firmware-like: short skewed "instructions" that repeat; deflates to ~50%
+        rng = random.Random(1)
+        weights = [1 / (i + 1) ** 1.2 for i in range(256)]
+        words = [bytes(rng.choices(range(256), weights, k=rng.randint(2, 12)))
+                 for _ in range(4000)]
+        for name, magic, size in (
+            ("bootloader.bin", b"\xe9", 20 * 1024),
+            ("partitions.bin", b"\xaa\x50", 3 * 1024),
+            ("app.bin", b"\xe9", app_kb * 1024),
+        ):
+            body = b""
+            while len(body) < size:
+                body += b"".join(rng.choice(words) for _ in range(1000))
+            with open(os.path.join(d, name), "wb") as f:
+                f.write(magic + body[len(magic):size])
+
+        bundle = bundle_for(os.path.join(d, "app.bin"))
+        args = flashing.write_flash_args("fake", "esp32s3", bundle.images())
+        quiet = lambda line: None
+        print(f"image_cache_cpu ({boards} boards, {app_kb} KB app)")
+
+        for mode in ("off", "on"):
+            os.environ["PHLOTON_IMAGE_CACHE"] = "1" if mode == "on" else "0"
+            if mode == "on":
+                t0 = time.process_time()
+                image_cache.prebuild(bundle)
+                report("prebuild", cpu=f"{(time.process_time() - t0) * 1000:.0f} ms")
+
+            c0 = child_cpu()
+            for _ in range(boards):
+                assert flashing.run_esptool(args, quiet) == 0
+            per_board = (child_cpu() - c0) / boards
+
+            report(mode, cpu_per_board=f"{per_board * 1000:.0f} ms")
+
+
+def thread_per_port(port, running, counts):
+    # the QThread SerialReader loop, minus Qt
+    ser = open_port(port)
+    reader = LineReader(ser)
+    batch = LineBatcher()
+    while running.is_set():
+        batch.extend(reader.read_lines(batch.wait_time()))
+        if batch.due():
+            counts[port] += batch.take().count("\n") + 1
+    ser.close()
+
+
+def serial_scaling(seconds=5.0, period=0.01, sizes=(1, 8, 32)):
+    """Thread-per-port readers vs one asyncio loop, on 1/8/32 pty boards.
+
+    The boards run in a child process (fake_board.py) printing an 8-line
+    block every `period` s, so only the reading side is charged to this
+    process.
+    """
+    import subprocess
+
+    import serial_async
+
+    print(f"serial_scaling ({seconds:.0f} s per run, {8 / period:.0f} lines/s per board)")
+
+    for n in sizes:
+        boards = subprocess.Popen(
+            [sys.executable, script("fake_board.py"), str(n), str(period)],
+            stdout=subprocess.PIPE, text=True,
+        )
+        ports = [boards.stdout.readline().strip() for _ in range(n)]
+
+        for mode in ("threads", "asyncio"):
+            counts = dict.fromkeys(ports, 0)
+            running = threading.Event()
+            running.set()
+            base_threads = threading.active_count()
+
+            if mode == "threads":
+                workers = [
+                    threading.Thread(target=thread_per_port, args=(p, running, counts), daemon=True)
+                    for p in ports
+                ]
+                for t in workers:
+                    t.start()
+            else:
+                def count(text, port):
+                    counts[port] += text.count("\n") + 1
+                watches = [
+                    serial_async.transport().watch(p, lambda text, p=p: count(text, p))
+                    for p in ports
+                ]
+
+            time.sleep(0.5)
+            threads = threading.active_count() - base_threads
+            c0 = time.process_time()
+            l0 = sum(counts.values())
+            time.sleep(seconds)
+            cpu = (time.process_time() - c0) / seconds * 100
+            rate = (sum(counts.values()) - l0) / seconds
+
+            running.clear()
+            if mode == "threads":
+                for t in workers:
+                    t.join()
+            else:
+                for w in watches:
+                    w.stop()
+                for w in watches:
+                    w.wait(2)
+
+            report(f"{n:2d} boards {mode}", cpu=f"{cpu:.1f}%", threads=threads,
+                   lines_per_s=f"{rate:.0f}")
+
+        boards.kill()
+        boards.wait()
+
+
+# ============================================================
+# TREND PLOT FRAMES
+# ============================================================
+def plot_frame(hours=18, width=1200, height=600):
+    """Paint time of an 8-lane trend_plot over `hours` of 1 Hz telemetry.
+
+    Compares drawing every sample against min/max decimation to the plot
+    width (what trend_plot does).
+    """
+    import numpy as np
+    from PyQt6.QtWidgets import QApplication
+
+    import trend_plot
+    from telemetry import CHANNELS, Reading
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    samples = min(hours * 3600, trend_plot.HISTORY)
+    print(f"plot_frame ({samples} samples x {len(CHANNELS)} channels, {width}x{height})")
+
+    decimate = trend_plot.minmax_decimate
+
+    def every_sample(t, v, t0, t1, width):
+        lo, hi = np.searchsorted(t, (t0, t1))
+        return t[lo:hi], v[lo:hi]
+
+    plot = trend_plot.trend_plot(CHANNELS)
+    plot.resize(width, height)
+    plot.span = hours * 3600
+    now = time.monotonic()
+    for i in range(samples):
+        plot.add([Reading(ch, float(np.sin(i / 300) + k)) for k, ch in enumerate(CHANNELS)],
+                 now - samples + i)
+
+    for mode, fn in (("every sample", every_sample), ("min/max decimated", decimate)):
+        trend_plot.minmax_decimate = fn
+        costs = []
+        for _ in range(10):
+            plot.grab()
+            costs.append(plot.frame_cost)
+        frame = sorted(costs)[len(costs) // 2]
+        report(mode, frame=f"{frame * 1000:.1f} ms", max_fps=f"{1 / frame:.0f}")
+
+    trend_plot.minmax_decimate = decimate
+    plot.deleteLater()
+    app.processEvents()
+
+
+# ============================================================
+# RAW ADC CONVERSION
+# ============================================================
+def scalar_convert(row, cal):
+    # the firmware's per-sample math, one sample at a time in Python
+    import math
+
+    mv = [((cal.coeff_a * c + (1 << 15)) >> 16) + cal.coeff_b for c in row]
+    out = []
+    for m in mv[:4]:
+        v = m + cal.offset_mv
+        r = v * cal.series_resistor / (cal.vcc_mv - v)
+        out.append(1.0 / (math.log(r / cal.nominal_resistance) / cal.beta
+                          + 1.0 / (cal.nominal_temperature + 273.15)) - 273.15)
+    out.append(mv[4] / (cal.gain * cal.cs_shunt) / 1000.0)
+    out.append(mv[5] / (cal.gain * cal.hs_shunt) / 1000.0)
+    out.append((mv[6] - cal.isns_zero_mv) / cal.isns_mv_per_a)
+    out.append(mv[7] * cal.divider_ratio / 1000.0)
+    return out
+
+
+def raw_convert(samples=200000):
+    """Samples/sec from RAW counts to engineering units (8 channels each)."""
+    import numpy as np
+
+    import adc_convert
+    from fake_board import raw_block
+
+    print(f"raw_convert ({samples} samples x 8 channels)")
+    cal = adc_convert.DEFAULT
+    lines = [raw_block()[0] for _ in range(2000)] * (samples // 2000)
+    payloads = [line[len(adc_convert.RAW_PREFIX):] for line in lines]
+    counts = np.array(" ".join(payloads).split(), np.int64).reshape(-1, 8)
+    rows = counts.tolist()
+
+    t0 = time.perf_counter()
+    for row in rows:
+        scalar_convert(row, cal)
+    scalar = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    adc_convert.convert(counts, cal)
+    vector = time.perf_counter() - t0
+
+    decoder = adc_convert.RawDecoder(cal)
+    t0 = time.perf_counter()
+    decoder.decode(payloads)
+    decoded = time.perf_counter() - t0
+
+    report("scalar (per sample)", samples_per_s=f"{samples / scalar:,.0f}")
+    report("numpy convert()", samples_per_s=f"{samples / vector:,.0f}")
+    report("text lines -> arrays", samples_per_s=f"{samples / decoded:,.0f}")
+
+
+# ============================================================
+# BINARY FRAMES
+# ============================================================
+def binary_frames(samples=20000):
+    """Wire bytes and host decode cost per sample, text lines vs binary frames."""
+    import telemetry_frames
+    from fake_board import telemetry_values
+    from telemetry import parse_lines
+
+    print(f"binary_frames ({samples} samples x 8 channels)")
+    values = [telemetry_values() for _ in range(samples)]
+
+    text = "".join("\n".join(telemetry_block()) + "\n" for _ in range(samples)).encode()
+    frames = b"".join(
+        telemetry_frames.encode(telemetry_frames.TYPE_READINGS, i, v) for i, v in enumerate(values)
+    )
+
+    t0 = time.perf_counter()
+    for i in range(0, len(text), 4096):
+        parse_lines(text[i:i + 4096].decode(errors="ignore"))
+    text_s = time.perf_counter() - t0
+
+    splitter = telemetry_frames.FrameSplitter()
+    arrays = 0
+    t0 = time.perf_counter()
+    for i in range(0, len(frames), 4096):
+        _, found = splitter.feed(frames[i:i + 4096])
+        arrays += sum(len(a) for a in found.values())
+    frame_s = time.perf_counter() - t0
+    assert arrays == samples
+
+    splitter = telemetry_frames.FrameSplitter()
+    t0 = time.perf_counter()
+    for i in range(0, len(frames), 4096):
+        for arr in splitter.feed(frames[i:i + 4096])[1].values():
+            telemetry_frames.readings(arr["values"])
+    records_s = time.perf_counter() - t0
+
+    report("text lines", bytes_per_sample=len(text) // samples,
+           samples_per_s=f"{samples / text_s:,.0f}")
+    report("frames -> arrays", bytes_per_sample=len(frames) // samples,
+           samples_per_s=f"{samples / frame_s:,.0f}")
+    report("frames -> Readings", bytes_per_sample=len(frames) // samples,
+           samples_per_s=f"{samples / records_s:,.0f}")
+
+
+# ============================================================
+# INGEST CAPACITY
+# ============================================================
+def ingest_capacity(seconds=5.0, period=0.01, sizes=(1, 8, 32, 64), work_ms=0.0):
+    """Cadence, jitter, latency, backlog and drops with n boards on one loop.
+
+    Boards as in serial_scaling. Each batch is parsed and counted with
+    ingest_metrics on the loop thread, plus `work_ms` of simulated GUI work,
+    so the point where latency and backlog start to climb is the station's
+    limit for that per-batch cost.
+    """
+    import subprocess
+
+    import serial_async
+    from ingest_metrics import IngestMetrics
+    from telemetry import parse_lines
+
+    print(f"ingest_capacity ({seconds:.0f} s per run, a sample every {period * 1000:.0f} ms "
+          f"per board, {work_ms:g} ms work per batch)")
+
+    def consume(text, w):
+        w.metrics.add(parse_lines(text), w.arrived)
+        if work_ms:
+            end = time.perf_counter() + work_ms / 1000
+            while time.perf_counter() < end:
+                pass
+        w.metrics.latency(time.monotonic() - w.arrived)
+
+    for n in sizes:
+        boards = subprocess.Popen(
+            [sys.executable, script("fake_board.py"), str(n), str(period)],
+            stdout=subprocess.PIPE, text=True,
+        )
+        ports = [boards.stdout.readline().strip() for _ in range(n)]
+
+        watches = []
+        for p in ports:
+            holder = []
+            holder.append(serial_async.transport().watch(
+                p, lambda text, holder=holder: consume(text, holder[0]),
+                metrics=IngestMetrics(expected_period=period),
+            ))
+            watches.append(holder[0])
+
+        time.sleep(seconds)
+        for w in watches:
+            w.stop()
+        for w in watches:
+            w.wait(2)
+        boards.kill()
+        boards.wait()
+
+        metrics = [w.metrics for w in watches]
+        measured = [m for m in metrics if m.interval is not None] or [IngestMetrics()]
+        report(f"{n:2d} boards",
+               samples_per_s=f"{sum(m.samples for m in metrics) / seconds:.0f}",
+               period_ms=f"{max(m.interval or 0 for m in measured) * 1000:.1f}",
+               jitter_ms=f"{max(m.jitter for m in measured) * 1000:.1f}",
+               latency_ms=f"{max(m.latency_avg or 0 for m in measured) * 1000:.1f}",
+               latency_peak_ms=f"{max(m.latency_peak for m in measured) * 1000:.1f}",
+               backlog_peak=max(m.backlog_peak for m in metrics),
+               dropped=sum(m.dropped for m in metrics))
+
+
+# ============================================================
+# MULTI-BOARD MONITOR
+# ============================================================
+def monitor_scaling(seconds=5.0, period=0.01, sizes=(8, 32, 64)):
+    """One board_monitor window over n pty boards: UI lag, latency, drops, CPU.
+
+    Boards as in serial_scaling, each printing its 8-line block every
+    `period` s (100x the firmware's 1 Hz by default).
+    """
+    import subprocess
+    import tempfile
+
+    from PyQt6.QtCore import QElapsedTimer, QEventLoop, QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    from board_monitor import BoardMonitor
+    from monitor_pool import MonitorPool
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    print(f"monitor_scaling ({seconds:.0f} s per run, {8 / period:.0f} lines/s per board)")
+
+    for n in sizes:
+        boards = subprocess.Popen(
+            [sys.executable, script("fake_board.py"), str(n), str(period)],
+            stdout=subprocess.PIPE, text=True,
+        )
+        ports = [boards.stdout.readline().strip() for _ in range(n)]
+
+        with tempfile.TemporaryDirectory() as root:
+            win = BoardMonitor(ports, MonitorPool(root=root))
+            win.resize(1100, 700)
+            win.show()
+
+            lag = {"max": 0.0}
+            beat = QElapsedTimer()
+
+            def tick():
+                ms = beat.restart()
+                lag["max"] = max(lag["max"], ms - 10)
+
+            timer = QTimer()
+            timer.timeout.connect(tick)
+
+            def run(s):
+                # a real event loop, so the CPU figure is not a spinning poll
+                loop = QEventLoop()
+                QTimer.singleShot(int(s * 1000), loop.quit)
+                loop.exec()
+
+            run(0.5)
+            samples0 = sum(b.metrics.samples for b in win.pool.boards.values())
+            c0 = time.process_time()
+            beat.start()
+            timer.start(10)
+            run(seconds)
+            timer.stop()
+            cpu = (time.process_time() - c0) / seconds * 100
+            metrics = [b.metrics for b in win.pool.boards.values()]
+            rate = (sum(m.samples for m in metrics) - samples0) / seconds
+            win.close()
+
+        boards.kill()
+        boards.wait()
+
+        report(f"{n:2d} boards",
+               samples_per_s=f"{rate:.0f}/{n / period:.0f}",
+               worst_ui_lag=f"{lag['max']:.0f} ms",
+               latency_peak_ms=f"{max(m.latency_peak for m in metrics) * 1000:.0f}",
+               dropped=sum(m.dropped for m in metrics),
+               cpu=f"{cpu:.0f}%")
+
+
+# ============================================================
+# BURN-IN RULES
+# ============================================================
+def burn_in_eval(boards=500, samples=200):
+    """Rule-evaluation cost per sample, default fans-on step (7 rules)."""
+    from types import SimpleNamespace
+
+    import burn_in
+    from fake_board import telemetry_block
+    from telemetry import parse_lines
+
+    print(f"burn_in_eval ({boards} boards x {samples} samples)")
+
+    # one parsed block per board, reused: only the rules are timed
+    blocks = [parse_lines("\n".join(telemetry_block())) for _ in range(boards)]
+    ports = [SimpleNamespace(port=f"board{i}") for i in range(boards)]
+    # the fans-on step alone, judged from the first sample (no settle time)
+    step = dict(burn_in.DEFAULT_SCHEDULE["steps"][1], settle=0)
+    burn = burn_in.BurnIn({"name": "bench", "steps": [step]})
+
+    t0 = time.perf_counter()
+    for t in range(samples):
+        for port, records in zip(ports, blocks):
+            burn.feed(port, records, float(t))
+    elapsed = time.perf_counter() - t0
+
+    rate = boards * samples / elapsed
+    report("feed", samples_per_s=f"{rate:,.0f}", rules=len(burn_in.step_rules(step)),
+           us_per_sample=f"{elapsed / (boards * samples) * 1e6:.1f}",
+           verdicts=" ".join(sorted({run.verdict for run in burn.runs.values()})))
+
+
+# ============================================================
+# STREAMING STATS
+# ============================================================
+def stream_stats_cost(samples=20000):
+    """Per-sample cost and memory of stream_stats over all 8 channels."""
+    import tracemalloc
+
+    from fake_board import telemetry_block
+    from stream_stats import BoardStats
+    from telemetry import parse_lines
+
+    print(f"stream_stats_cost ({samples} samples x 8 channels)")
+    blocks = [parse_lines("\n".join(telemetry_block())) for _ in range(100)]
+
+    stats = BoardStats()
+    t0 = time.perf_counter()
+    for i in range(samples):
+        stats.add(blocks[i % len(blocks)], float(i))
+    elapsed = time.perf_counter() - t0
+
+    # memory once the slope window has filled: flat, whatever n is
+    sizes = {}
+    for n in (1000, samples):
+        tracemalloc.start()
+        stats = BoardStats()
+        for i in range(n):
+            stats.add(blocks[i % len(blocks)], float(i))
+        sizes[n] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+    report("BoardStats.add", us_per_sample=f"{elapsed / samples * 1e6:.1f}",
+           boards_at_1hz_per_core=f"{samples / elapsed:,.0f}",
+           kb_after_1000=f"{sizes[1000] / 1024:.1f}",
+           kb_after_all=f"{sizes[samples] / 1024:.1f}")
+
+
+BENCHMARKS = {
+    "reader_cpu": reader_cpu,
+    "ui_throughput": ui_throughput,
+    "console_soak": console_soak,
+    "parser_speed": parser_speed,
+    "port_detect": port_detect,
+    "hotplug": hotplug,
+    "esptool_overhead": esptool_overhead,
+    "diff_flash": diff_flash,
+    "image_cache_cpu": image_cache_cpu,
+    "serial_scaling": serial_scaling,
+    "plot_frame": plot_frame,
+    "raw_convert": raw_convert,
+    "binary_frames": binary_frames,
+    "ingest_capacity": ingest_capacity,
+    "monitor_scaling": monitor_scaling,
+    "burn_in_eval": burn_in_eval,
+    "stream_stats_cost": stream_stats_cost,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
@@ -0,0 +1,311 @@
+import sys
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import (
+    QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
+    QGroupBox, QTableView, QHeaderView, QFileDialog, QMessageBox
+)
+from serial.tools import list_ports
+
+from Automation_code import apply_light_theme
+from burn_in import BurnIn, load_schedule
+from device_watcher import port_events
+from monitor_pool import MonitorPool
+from telemetry import CHANNELS, REFRESH_INTERVAL_MS
+
+
+COLUMNS = ["Port", "Channel", "Value", "Stats", "Ingest", "Burn-in"]
+COL_PORT, COL_CHANNEL, COL_VALUE, COL_STATS, COL_INGEST, COL_BURN_IN = range(len(COLUMNS))
+
+
+# ============================================================
+# POOL -> GUI THREAD
+# ============================================================
+class PoolSignals(QObject):
+    """Queued hand-off of monitor_pool snapshots and errors to the GUI thread."""
+    snapshot = pyqtSignal(object)       # monitor_pool.BoardSnapshot
+    failed = pyqtSignal(str, str)       # port, message
+
+
+# ============================================================
+# TABLE MODEL (one row per board and channel)
+# ============================================================
+class BoardTableModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.burn_in = None     # burn_in.BurnIn, running or last finished
+        self.rows = []          # (port, channel)
+        self.row_of = {}        # (port, channel) -> row
+        self.snapshots = {}     # port -> latest BoardSnapshot
+        self.errors = {}        # port -> message
+        self._dirty = set()     # ports with a new snapshot since the last refresh
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        port, channel = self.rows[index.row()]
+        snap = self.snapshots.get(port)
+        col = index.column()
+        if role == Qt.ItemDataRole.ToolTipRole and col == COL_STATS and snap:
+            return snap.details.get(channel)
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if col == COL_PORT:
+            return port
+        if col == COL_CHANNEL:
+            return channel
+        if col == COL_VALUE:
+            return snap.values.get(channel, "--") if snap else "--"
+        if col == COL_STATS:
+            return snap.briefs.get(channel, "") if snap else ""
+        # per-board columns, on the board's first row only
+        if channel != CHANNELS[0]:
+            return ""
+        if col == COL_INGEST:
+            return self.errors.get(port) or (snap.ingest if snap else "waiting for data")
+        return self.burn_in.status(port) if self.burn_in else ""
+
+    def add_board(self, port):
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(CHANNELS) - 1)
+        for ch in CHANNELS:
+            self.row_of[(port, ch)] = len(self.rows)
+            self.rows.append((port, ch))
+        self.endInsertRows()
+
+    def remove_board(self, port):
+        first = self.row_of.get((port, CHANNELS[0]))
+        if first is None:
+            return
+        self.beginRemoveRows(QModelIndex(), first, first + len(CHANNELS) - 1)
+        del self.rows[first:first + len(CHANNELS)]
+        self.row_of = {key: i for i, key in enumerate(self.rows)}
+        self.snapshots.pop(port, None)
+        self.errors.pop(port, None)
+        self._dirty.discard(port)
+        self.endRemoveRows()
+
+    def update(self, snap):
+        """Keep `snap` for the next refresh; late ones for removed boards are dropped."""
+        if (snap.port, CHANNELS[0]) in self.row_of:
+            self.snapshots[snap.port] = snap
+            self._dirty.add(snap.port)
+
+    def set_error(self, port, msg):
+        if (port, CHANNELS[0]) in self.row_of:
+            self.errors[port] = msg
+
+    def refresh(self):
+        """One dataChanged for the boards with new snapshots since the last refresh."""
+        rows = [self.row_of[(port, CHANNELS[0])] for port in self._dirty]
+        self._dirty.clear()
+        if rows:
+            self.dataChanged.emit(
+                self.index(min(rows), COL_VALUE),
+                self.index(max(rows) + len(CHANNELS) - 1, COL_STATS),
+            )
+        # ingest and burn-in move every refresh; they are one row per board
+        if self.rows:
+            self.dataChanged.emit(
+                self.index(0, COL_INGEST), self.index(len(self.rows) - 1, COL_BURN_IN)
+            )
+
+
+# ============================================================
+# BOARD MONITOR
+# ============================================================
+class BoardMonitor(QWidget):
+    """Live telemetry of every board on the station, in one table."""
+
+    def __init__(self, ports=None, pool=None):
+        super().__init__()
+        self.setWindowTitle("Phloton Board Monitor")
+
+        self.pool = pool or MonitorPool()
+        self.model = BoardTableModel(self)
+
+        # pool threads only ever hand the GUI copies, through queued signals
+        self.signals = PoolSignals(self)
+        self.signals.snapshot.connect(self.model.update)
+        self.signals.failed.connect(self.model.set_error)
+        self.pool.listeners.append(self.on_batch)
+        self.pool.error_listeners.append(self.on_error)
+        self.fixed_ports = ports is not None
+        self.schedule_path = None
+        self.burning = False
+
+        self.build_ui()
+
+        # the model repaints on this timer, however many boards print
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(REFRESH_INTERVAL_MS)
+
+        if self.fixed_ports:
+            for port in ports:
+                self.add_port(port)
+        else:
+            self.scan_ports()
+            # boards plugged into the hubs later get rows of their own
+            self.port_events = port_events(self)
+            self.port_events.added.connect(self.add_port)
+            self.port_events.removed.connect(self.remove_port)
+
+    # ========================================================
+    # UI LAYOUT
+    # ========================================================
+    def build_ui(self):
+        main = QVBoxLayout(self)
+
+        header = QLabel("  Phloton Board Monitor")
+        header.setObjectName("Header")
+        header.setFixedHeight(32)
+        main.addWidget(header)
+
+        top = QHBoxLayout()
+        scan = QPushButton("Scan Ports")
+        scan.clicked.connect(self.scan_ports)
+        scan.setEnabled(not self.fixed_ports)
+        self.summary = QLabel("Boards: 0")
+
+        schedule = QPushButton("Schedule...")
+        schedule.clicked.connect(self.choose_schedule)
+        self.schedule_lbl = QLabel("Schedule: default")
+        self.burn_btn = QPushButton("Start Burn-in")
+        self.burn_btn.clicked.connect(self.toggle_burn_in)
+
+        top.addWidget(scan)
+        top.addWidget(self.summary, 1)
+        top.addWidget(self.schedule_lbl)
+        top.addWidget(schedule)
+        top.addWidget(self.burn_btn)
+        main.addLayout(top)
+
+        boards = QGroupBox("Boards")
+        bl = QVBoxLayout(boards)
+
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.verticalHeader().setVisible(False)
+        # fixed row height: no per-row size hints on thousands of rows
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.setColumnWidth(COL_PORT, 140)
+        self.table.setColumnWidth(COL_CHANNEL, 100)
+        self.table.setColumnWidth(COL_VALUE, 100)
+        self.table.setColumnWidth(COL_STATS, 260)
+        self.table.setColumnWidth(COL_INGEST, 480)
+        bl.addWidget(self.table)
+
+        main.addWidget(boards, 1)
+
+    # ========================================================
+    # PORTS
+    # ========================================================
+    def scan_ports(self):
+        for p in list_ports.comports():
+            self.add_port(p.device)
+
+    def add_port(self, port):
+        if port not in self.pool.boards:
+            self.pool.add(port)
+            self.model.add_board(port)
+            if self.burning:
+                self.model.burn_in.add(port)
+
+    def remove_port(self, port):
+        if self.pool.remove(port):
+            self.model.remove_board(port)
+
+    def on_batch(self, board, records, arrived):
+        """monitor_pool listener (pool thread)."""
+        self.signals.snapshot.emit(board.snapshot())
+
+    def on_error(self, board, msg):
+        """monitor_pool error listener (serial loop thread)."""
+        self.signals.failed.emit(board.port, msg)
+
+    # ========================================================
+    # BURN-IN
+    # ========================================================
+    def choose_schedule(self):
+        f, _ = QFileDialog.getOpenFileName(self, "Select burn-in schedule", "", "JSON Files (*.json)")
+        if f:
+            self.schedule_path = f
+            self.schedule_lbl.setText(f"Schedule: {f}")
+
+    def toggle_burn_in(self):
+        if self.burning:
+            self.finish_burn_in()
+            return
+        try:
+            schedule = load_schedule(self.schedule_path)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Error", f"Bad schedule: {e}")
+            return
+
+        # boards start their schedule at their next sample
+        self.model.burn_in = BurnIn(schedule)
+        for port in self.pool.boards:
+            self.model.burn_in.add(port)
+        self.pool.listeners.append(self.model.burn_in.feed)
+        self.burning = True
+        self.burn_btn.setText("Stop Burn-in")
+
+    def finish_burn_in(self):
+        burn = self.model.burn_in
+        self.pool.listeners.remove(burn.feed)
+        self.burning = False
+        burn.finish()
+        path = burn.write_report()
+        self.burn_btn.setText("Start Burn-in")
+        QMessageBox.information(self, "Burn-in finished", f"Report written to {path}")
+
+    # ========================================================
+    # REFRESH
+    # ========================================================
+    def refresh(self):
+        self.model.refresh()
+        if self.burning and self.model.burn_in.done:
+            self.finish_burn_in()
+
+        metrics = [snap.metrics for snap in self.model.snapshots.values()]
+        samples = sum(m["samples"] for m in metrics)
+        dropped = sum(m["dropped"] for m in metrics)
+        latency = max((m["latency_peak_ms"] for m in metrics), default=0.0)
+        self.summary.setText(
+            f"Boards: {len(self.pool.boards)}   Errors: {len(self.model.errors)}   "
+            f"Samples: {samples}   Dropped: {dropped}   Peak latency: {latency:.0f} ms"
+        )
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.pool.close()
+        if self.burning:
+            self.model.burn_in.finish()
+            self.model.burn_in.write_report()
+        super().closeEvent(event)
+
+
+# ============================================================
+# MAIN
+# ============================================================
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    apply_light_theme(app)
+
+    win = BoardMonitor(sys.argv[1:] or None)
+    win.resize(1100, 700)
+    win.show()
+
+    sys.exit(app.exec())
@@ -0,0 +1,478 @@
+"""Burn-in: a timed test schedule, judged live against each board's telemetry.
+
+A schedule is a list of steps run back to back, timed per board from its
+first sample. Each step declares the fan states the board should be in
+and the rules it must hold:
+
+    {"name": "rack burn-in", "steps": [
+        {"name": "fans off", "duration": "10m", "fans": {"CSFAN": "off", "HSFAN": "off"},
+         "rules": [{"expr": "Voltage", "stat": "mean", "min": 11.4, "max": 12.6}]},
+        {"name": "fans on", "duration": "2h", "settle": "2m", "fans": {"CSFAN": "on", "HSFAN": "on"},
+         "rules": [{"expr": "Heat Sink - Cold Sink", "stat": "mean", "min": 15, "window": "60s"}]}
+    ]}
+
+The firmware drives the fans itself (button and lid), so "fans" is what the
+operator has set up, checked through the fan currents: "on" adds a rule on
+the window mean (>= FAN_ON_MIN_A[fan]), "off" on the window max
+(<= FAN_OFF_MAX_A[fan]). Limits are in telemetry.UNITS (V and A), as both
+sketches print them.
+
+Each rule keeps a RollingWindow of `window` seconds of its expression and
+judges one statistic of it (mean/min/max) on every sample once the step has
+run for max(settle, window). That is O(1) amortized per sample and rule, so
+hundreds of boards are judged as the data arrives. At the end every
+board gets a verdict, and the report is written to REPORT_DIR:
+
+    burn = BurnIn(load_schedule(path))
+    pool.listeners.append(burn.feed)        # monitor_pool.MonitorPool
+    ...
+    burn.finish(); burn.write_report()
+
+    python burn_in.py [schedule.json] PORT...      # headless
+"""
+import os
+import re
+import sys
+import json
+import time
+import threading
+from collections import deque
+
+from telemetry import UNITS, Reading
+
+
+REPORT_DIR = os.environ.get(
+    "PHLOTON_BURN_IN_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "burn_in"),
+)
+
+# Each fan's shunt amplifier (GAIN 100) reaches the ADC's ~3.1 V full scale at
+# ~0.10 A for CSFAN (0.3 ohm) and ~0.62 A for HSFAN (0.05 ohm). "on" is at
+# least ~600 mV at the ADC; "off" at most ~150 mV, twice its zero offset.
+FAN_ON_MIN_A = {"CSFAN": 0.02, "HSFAN": 0.12}
+FAN_OFF_MAX_A = {"CSFAN": 0.005, "HSFAN": 0.03}
+DEFAULT_WINDOW = 30.0
+
+PASS, FAIL, RUNNING, INCOMPLETE = "PASS", "FAIL", "RUNNING", "INCOMPLETE"
+
+DEFAULT_SCHEDULE = {
+    "name": "default burn-in",
+    "steps": [
+        {
+            "name": "fans off", "duration": "10m", "settle": "30s",
+            "fans": {"CSFAN": "off", "HSFAN": "off"},
+            "rules": [{"expr": "Voltage", "stat": "mean", "min": 11.4, "max": 12.6}],
+        },
+        {
+            "name": "fans on", "duration": "4h", "settle": "2m",
+            "fans": {"CSFAN": "on", "HSFAN": "on"},
+            "rules": [
+                # ~2.8 V at the ADC: short of saturating the shunt amplifier
+                {"expr": "CSFAN", "stat": "max", "max": 0.09},
+                {"expr": "HSFAN", "stat": "max", "max": 0.56},
+                {"expr": "Voltage", "stat": "mean", "min": 11.4, "max": 12.6},
+                {"expr": "Heat Sink - Cold Sink", "stat": "mean", "min": 15.0, "window": "60s"},
+                {"expr": "Heat Sink", "stat": "max", "max": 60.0},
+            ],
+        },
+    ],
+}
+
+_DURATION = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$")
+_SCALE = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}
+
+
+def seconds(value):
+    """Seconds from a number or "90s" / "10m" / "2h"."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    m = _DURATION.match(value)
+    if not m:
+        raise ValueError(f"bad duration: {value!r}")
+    return float(m[1]) * _SCALE[m[2]]
+
+
+def load_schedule(path=None):
+    """A schedule from a JSON file, or DEFAULT_SCHEDULE."""
+    if not path:
+        return DEFAULT_SCHEDULE
+    with open(path) as f:
+        return json.load(f)
+
+
+# ============================================================
+# ROLLING WINDOW
+# ============================================================
+class RollingWindow:
+    """Mean, min and max of the last `span` seconds, O(1) amortized per push.
+
+    A running sum for the mean; monotonic deques for min and max.
+    """
+
+    def __init__(self, span):
+        self.span = span
+        self.items = deque()        # (t, v)
+        self.total = 0.0
+        self.lows = deque()         # (t, v), v increasing
+        self.highs = deque()        # (t, v), v decreasing
+
+    def push(self, t, v):
+        self.items.append((t, v))
+        self.total += v
+        while self.lows and self.lows[-1][1] >= v:
+            self.lows.pop()
+        self.lows.append((t, v))
+        while self.highs and self.highs[-1][1] <= v:
+            self.highs.pop()
+        self.highs.append((t, v))
+
+        cutoff = t - self.span
+        while self.items[0][0] < cutoff:
+            self.total -= self.items.popleft()[1]
+        while self.lows[0][0] < cutoff:
+            self.lows.popleft()
+        while self.highs[0][0] < cutoff:
+            self.highs.popleft()
+
+    def stat(self, name):
+        if name == "mean":
+            return self.total / len(self.items)
+        if name == "min":
+            return self.lows[0][1]
+        return self.highs[0][1]
+
+
+# ============================================================
+# RULES
+# ============================================================
+class Rule:
+    """One threshold on a channel or a "A - B" channel difference."""
+
+    def __init__(self, spec):
+        self.expr = spec["expr"]
+        self.stat = spec.get("stat", "mean")
+        self.low = spec.get("min")
+        self.high = spec.get("max")
+        self.window = RollingWindow(seconds(spec.get("window", DEFAULT_WINDOW)))
+
+        a, _, b = self.expr.partition(" - ")
+        self.channels = (a.strip(), b.strip()) if b else (a.strip(),)
+        self.unit = UNITS.get(self.channels[0], "")
+
+        # results for the current step
+        self.violations = 0
+        self.first_at = None
+        self.observed = None        # (lowest, highest) judged value
+        self.disconnected = 0       # thermistor faults on one of its channels
+
+    def value(self, latest):
+        if len(self.channels) == 1:
+            return latest.get(self.channels[0])
+        a, b = latest.get(self.channels[0]), latest.get(self.channels[1])
+        return None if a is None or b is None else a - b
+
+    def judge(self, elapsed):
+        v = self.window.stat(self.stat)
+        lo, hi = self.observed or (v, v)
+        self.observed = (min(lo, v), max(hi, v))
+        if (self.low is not None and v < self.low) or (self.high is not None and v > self.high):
+            self.violations += 1
+            if self.first_at is None:
+                self.first_at = elapsed
+
+    def fault(self, elapsed):
+        """A channel of the rule reported DISCONNECTED: a violation in itself."""
+        self.disconnected += 1
+        self.violations += 1
+        if self.first_at is None:
+            self.first_at = elapsed
+
+    def limit(self):
+        if self.low is not None and self.high is not None:
+            return f"{self.low:g}..{self.high:g}"
+        return f">= {self.low:g}" if self.low is not None else f"<= {self.high:g}"
+
+    def result(self):
+        return {
+            "rule": f"{self.expr} {self.stat}",
+            "limit": self.limit(),
+            "unit": self.unit,
+            "observed": self.observed and [round(x, 4) for x in self.observed],
+            "violations": self.violations,
+            "disconnected": self.disconnected,
+            "first_violation_s": self.first_at and round(self.first_at, 1),
+        }
+
+
+def step_rules(step):
+    specs = list(step.get("rules", []))
+    for fan, state in step.get("fans", {}).items():
+        if state == "on":
+            specs.append({"expr": fan, "stat": "mean", "min": FAN_ON_MIN_A[fan]})
+        else:
+            specs.append({"expr": fan, "stat": "max", "max": FAN_OFF_MAX_A[fan]})
+    return [Rule(spec) for spec in specs]
+
+
+# ============================================================
+# ONE BOARD'S RUN
+# ============================================================
+class BoardRun:
+    def __init__(self, port, schedule):
+        self.port = port
+        self.steps = schedule["steps"]
+        self.index = -1
+        self.start = None           # arrival time of the first sample
+        self.step_start = None
+        self.step_end = None
+        self.samples = 0
+        self.latest = {}            # channel -> value
+        self.rules = []
+        self.by_channel = {}        # channel -> [Rule]
+        self.results = []           # one dict per finished step
+
+    @property
+    def done(self):
+        return self.index >= len(self.steps)
+
+    @property
+    def step(self):
+        return None if self.start is None or self.done else self.steps[self.index]
+
+    def _next_step(self, t):
+        self.index += 1
+        self.step_start = t
+        self.samples = 0
+        self.latest.clear()
+        if self.done:
+            self.rules, self.by_channel = [], {}
+            return
+        step = self.steps[self.index]
+        self.step_end = t + seconds(step["duration"])
+        self.settle = seconds(step.get("settle", 0))
+        self.rules = step_rules(step)
+        self.by_channel = {}
+        for rule in self.rules:
+            for ch in rule.channels:
+                self.by_channel.setdefault(ch, []).append(rule)
+
+    def _close_step(self, t, complete=True):
+        step = self.steps[self.index]
+        rules = [r.result() for r in self.rules]
+        if any(r["violations"] for r in rules):
+            verdict = FAIL
+        elif any(r["observed"] is None for r in rules):
+            verdict = INCOMPLETE        # a rule never had the data to be judged
+        elif complete and self.samples:
+            verdict = PASS
+        else:
+            verdict = INCOMPLETE
+        self.results.append({
+            "step": step["name"],
+            "verdict": verdict,
+            "seconds": round(t - self.step_start, 1),
+            "samples": self.samples,
+            "rules": rules,
+        })
+
+    def feed(self, records, t):
+        if self.start is None:
+            self.start = t
+            self._next_step(t)
+        while not self.done and t >= self.step_end:
+            self._close_step(self.step_end)
+            self._next_step(self.step_end)
+        if self.done:
+            return
+
+        elapsed = t - self.step_start
+        judging = elapsed >= self.settle
+        for rec in records:
+            if not isinstance(rec, Reading):
+                if rec.state == "DISCONNECTED":
+                    # a missing sensor fails its rules rather than leaving them unjudged
+                    self.latest.pop(rec.name, None)
+                    for rule in self.by_channel.get(rec.name, ()):
+                        rule.fault(elapsed)
+                continue
+            rules = self.by_channel.get(rec.channel)
+            self.latest[rec.channel] = rec.value
+            if rec.channel == "Voltage":
+                self.samples += 1       # last line of each firmware block
+            if not rules:
+                continue
+            for rule in rules:
+                v = rule.value(self.latest)
+                if v is None:
+                    continue
+                rule.window.push(t, v)
+                if judging and elapsed >= rule.window.span:
+                    rule.judge(elapsed)
+
+    def finish(self, t):
+        """Close the run at `t`; unfinished steps are INCOMPLETE."""
+        if self.start is not None:
+            self.feed((), t)        # closes the steps that ended before t
+        if self.done:
+            return
+        first = 0
+        if self.start is not None:
+            self._close_step(t, complete=False)
+            first = self.index + 1
+        for step in self.steps[first:]:
+            self.results.append({"step": step["name"], "verdict": INCOMPLETE,
+                                 "seconds": 0, "samples": 0, "rules": []})
+        self.index = len(self.steps)
+        self.rules, self.by_channel = [], {}
+
+    @property
+    def verdict(self):
+        verdicts = [r["verdict"] for r in self.results]
+        live = any(r.violations for r in self.rules)
+        if FAIL in verdicts or live:
+            return FAIL
+        if not self.done:
+            return RUNNING
+        return INCOMPLETE if INCOMPLETE in verdicts else PASS
+
+    def status(self, now=None):
+        """Short live text, e.g. "fans on 1234/14400 s PASS"."""
+        step = self.step
+        if step is None:
+            return self.verdict if self.done else "waiting for data"
+        now = time.monotonic() if now is None else now
+        total = self.step_end - self.step_start
+        return f"{step['name']} {min(now - self.step_start, total):.0f}/{total:.0f} s {self.verdict}"
+
+
+# ============================================================
+# BURN-IN (every board)
+# ============================================================
+class BurnIn:
+    def __init__(self, schedule=DEFAULT_SCHEDULE):
+        self.schedule = schedule
+        self.runs = {}              # port -> BoardRun
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def add(self, port):
+        """Expect `port`: without data it ends INCOMPLETE rather than unlisted."""
+        with self._lock:
+            if port not in self.runs:
+                self.runs[port] = BoardRun(port, self.schedule)
+            return self.runs[port]
+
+    def feed(self, board, records, arrived):
+        """monitor_pool listener (pool threads)."""
+        with self._lock:
+            run = self.runs.get(board.port)
+            if run is None:
+                run = self.runs[board.port] = BoardRun(board.port, self.schedule)
+            run.feed(records, arrived)
+
+    @property
+    def done(self):
+        with self._lock:
+            return bool(self.runs) and all(run.done for run in self.runs.values())
+
+    def status(self, port):
+        """BoardRun.status() of `port`, "" if it is not in the run."""
+        with self._lock:
+            run = self.runs.get(port)
+            return run.status() if run else ""
+
+    def statuses(self):
+        """(port, status) of every board, sorted by port."""
+        with self._lock:
+            return [(port, run.status()) for port, run in sorted(self.runs.items())]
+
+    def finish(self):
+        now = time.monotonic()
+        with self._lock:
+            for run in self.runs.values():
+                run.finish(now)
+
+    def report(self):
+        with self._lock:
+            boards = {
+                port: {"verdict": run.verdict, "steps": list(run.results)}
+                for port, run in sorted(self.runs.items())
+            }
+        return {
+            "schedule": self.schedule.get("name", ""),
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)),
+            "boards": boards,
+        }
+
+    def write_report(self, root=REPORT_DIR):
+        """Write <stamp>.json and <stamp>.txt under `root`; the .txt path."""
+        os.makedirs(root, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        report = self.report()
+        with open(os.path.join(root, stamp + ".json"), "w") as f:
+            json.dump(report, f, indent=2)
+        path = os.path.join(root, stamp + ".txt")
+        with open(path, "w") as f:
+            f.write(format_report(report))
+        return path
+
+
+def format_report(report):
+    lines = [f"Burn-in report: {report['schedule']}, started {report['started']}", ""]
+    counts = {}
+    for port, board in report["boards"].items():
+        counts[board["verdict"]] = counts.get(board["verdict"], 0) + 1
+        lines.append(f"{port}: {board['verdict']}")
+        for step in board["steps"]:
+            lines.append(
+                f"  {step['step']:<16} {step['verdict']:<10} {step['seconds']:>8.0f} s "
+                f"{step['samples']:>7} samples"
+            )
+            for rule in step["rules"]:
+                observed = rule["observed"]
+                seen = "no data"
+                if observed is not None:
+                    seen = f"{observed[0]:g}..{observed[1]:g} {rule['unit']}"
+                if rule["violations"]:
+                    faults = f", {rule['disconnected']} disconnected" if rule["disconnected"] else ""
+                    lines.append(
+                        f"      {rule['rule']} {seen} (limit {rule['limit']}), "
+                        f"{rule['violations']} violations{faults}, "
+                        f"first at {rule['first_violation_s']} s"
+                    )
+                elif observed is None:
+                    lines.append(f"      {rule['rule']} never judged (limit {rule['limit']})")
+    lines.append("")
+    lines.append("   ".join(f"{v}: {n}" for v, n in sorted(counts.items())))
+    return "\n".join(lines) + "\n"
+
+
+# ============================================================
+# MAIN (headless)
+# ============================================================
+if __name__ == "__main__":
+    from monitor_pool import MonitorPool
+
+    args = sys.argv[1:]
+    schedule = load_schedule(args.pop(0) if args and args[0].endswith(".json") else None)
+    if not args:
+        sys.exit("usage: burn_in.py [schedule.json] PORT [PORT...]")
+
+    burn = BurnIn(schedule)
+    pool = MonitorPool()
+    pool.listeners.append(burn.feed)
+    for port in args:
+        burn.add(port)
+        pool.add(port)
+    try:
+        while not burn.done:
+            time.sleep(10)
+            for port, status in burn.statuses():
+                print(f"{port}: {status}")
+    except KeyboardInterrupt:
+        pass
+    pool.close()
+    burn.finish()
+    path = burn.write_report()
+    print(open(path).read(), end="")
+    print(f"report: {path}")
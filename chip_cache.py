@@ -0,0 +1,99 @@
+"""Chip identity cache, so a board that was already probed is not reset again.
+
+`esptool chip_id` resets the board and takes a second or two. The answer
+only changes when a different board is plugged in, so it is kept per USB
+device (VID:PID plus serial number, or the hub location for adapters
+without one) and dropped as soon as the device watcher sees that port go.
+
+    known = cache().get(port)       # ChipInfo(chip, mac) or None
+    cache().put(port, chip, mac)
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+from serial.tools import list_ports
+
+from device_watcher import watcher
+
+
+CAPACITY = 64
+
+ChipInfo = namedtuple("ChipInfo", "chip mac")
+
+
+def device_key(port):
+    """Stable identity of the USB device behind `port`, or the port name."""
+    for p in list_ports.comports():
+        if p.device != port:
+            continue
+        ident = p.serial_number or p.location
+        if p.vid is not None and ident:
+            return f"{p.vid:04x}:{p.pid:04x}:{ident}"
+        break
+    return port
+
+
+def adapter_key(port):
+    """Model of the USB serial adapter behind `port` (VID:PID), or the port name.
+
+    Unlike device_key it is the same for every board on the same kind of
+    adapter, so what one board taught about the link applies to the next.
+    """
+    for p in list_ports.comports():
+        if p.device != port:
+            continue
+        if p.vid is not None:
+            return f"{p.vid:04x}:{p.pid:04x}"
+        break
+    return port
+
+
+# ============================================================
+# CHIP CACHE
+# ============================================================
+class ChipCache:
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self._entries = OrderedDict()   # device key -> ChipInfo, oldest first
+        self._keys = {}                 # port -> device key it was cached under
+        self._lock = threading.Lock()
+
+    def get(self, port):
+        key = device_key(port)
+        with self._lock:
+            info = self._entries.get(key)
+            if info is not None:
+                self._entries.move_to_end(key)
+                self._keys[port] = key
+            return info
+
+    def put(self, port, chip, mac=""):
+        key = device_key(port)
+        with self._lock:
+            self._entries[key] = ChipInfo(chip, mac)
+            self._entries.move_to_end(key)
+            self._keys[port] = key
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def forget(self, port):
+        with self._lock:
+            key = self._keys.pop(port, None)
+            if key is not None:
+                self._entries.pop(key, None)
+
+    def _ports_changed(self, added, removed):
+        for port in removed:
+            self.forget(port)
+
+
+_cache = None
+
+
+def cache():
+    """The process-wide ChipCache, invalidated by the device watcher."""
+    global _cache
+    if _cache is None:
+        _cache = ChipCache()
+        watcher().subscribe(_cache._ports_changed)
+    return _cache
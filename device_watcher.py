@@ -0,0 +1,249 @@
+"""One shared watcher that pushes serial-port add/remove events to the tools.
+
+On Linux it sleeps on inotify over /dev and rescans only when a device node
+appears or disappears. Elsewhere (or if inotify is unavailable) it diffs
+list_ports.comports() every POLL_INTERVAL seconds, sleeping on a
+threading.Event: select() on Windows takes sockets only, so only the
+inotify fd (and a pipe to wake it) is ever selected on.
+
+Qt windows use port_events(), which re-emits the events as signals on the
+GUI thread:
+
+    self.port_events = port_events()
+    self.port_events.added.connect(...)
+    self.port_events.removed.connect(...)
+"""
+import os
+import sys
+import select
+import threading
+
+from serial.tools import list_ports
+
+
+POLL_INTERVAL = 2.0
+
+# inotify: rescan shortly after a /dev change so udev can finish the node,
+# plus a slow safety rescan in case an event is missed
+SETTLE_DELAY = 0.05
+SAFETY_RESCAN = 30.0
+
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+
+
+def scan_ports():
+    return {p.device for p in list_ports.comports()}
+
+
+def _libc():
+    import ctypes
+
+    return ctypes.CDLL(None, use_errno=True)
+
+
+def open_inotify(path="/dev", mask=IN_CREATE | IN_DELETE):
+    """Non-blocking inotify fd watching `path`, or None if not on Linux."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        fd = _libc().inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if not add_watch(fd, path, mask):
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+
+def add_watch(fd, path, mask=IN_CREATE | IN_DELETE):
+    """Also watch `path` on an open_inotify() fd; False if that failed."""
+    return _libc().inotify_add_watch(fd, os.fsencode(path), mask) >= 0
+
+
+# ============================================================
+# DEVICE WATCHER
+# ============================================================
+class DeviceWatcher:
+    def __init__(self, poll_interval=POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self.ports = set()
+        self.mode = None              # "inotify" or "poll", once started
+
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._wake_w = None           # pipe into the inotify select(), Linux only
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        if self._running:
+            return self
+        self._running = True
+        self._stop.clear()
+        self.ports = scan_ports()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._stop.set()
+        wake_w = self._wake_w           # None in poll mode
+        if wake_w is not None:
+            try:
+                os.write(wake_w, b"x")
+            except OSError:
+                pass                    # the loop has already closed it
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def subscribe(self, fn):
+        """fn(added, removed) is called from the watcher thread on every change."""
+        with self._lock:
+            self._subscribers.append(fn)
+
+    def unsubscribe(self, fn):
+        with self._lock:
+            if fn in self._subscribers:
+                self._subscribers.remove(fn)
+
+    def wait_for(self, port, timeout=None):
+        """Block until `port` is present; True if it showed up in time."""
+        with self._changed:
+            return self._changed.wait_for(lambda: port in self.ports, timeout)
+
+    # ========================================================
+    # WATCH LOOP
+    # ========================================================
+    def _run(self):
+        fd = open_inotify()
+        self.mode = "inotify" if fd is not None else "poll"
+        if fd is None:
+            self._poll()
+            return
+
+        wake_r, self._wake_w = os.pipe()
+        try:
+            while self._running:
+                ready, _, _ = select.select([wake_r, fd], [], [], SAFETY_RESCAN)
+                if not self._running:
+                    break
+                if fd in ready:
+                    self._drain(fd)
+                    # coalesce the burst of events one plug produces
+                    if not self._stop.wait(SETTLE_DELAY):
+                        self._drain(fd)
+                self._rescan()
+        finally:
+            wake_w, self._wake_w = self._wake_w, None
+            for f in (fd, wake_r, wake_w):
+                os.close(f)
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_interval):
+            self._rescan()
+
+    @staticmethod
+    def _drain(fd):
+        try:
+            while os.read(fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _rescan(self):
+        current = scan_ports()
+        with self._changed:
+            added = current - self.ports
+            removed = self.ports - current
+            if not (added or removed):
+                return
+            self.ports = current
+            self._changed.notify_all()
+            subscribers = list(self._subscribers)
+
+        for fn in subscribers:
+            try:
+                fn(added, removed)
+            except Exception:
+                # a subscriber going away must not stop the watcher
+                pass
+
+
+_watcher = None
+
+
+def watcher():
+    """The process-wide DeviceWatcher, started on first use."""
+    global _watcher
+    if _watcher is None:
+        _watcher = DeviceWatcher().start()
+    return _watcher
+
+
+# ============================================================
+# QT BRIDGE
+# ============================================================
+_event_classes = {}
+
+
+def port_events(parent=None):
+    """QObject with added(str)/removed(str) signals, delivered on the GUI thread.
+
+    Works with whichever of PyQt6/PyQt5 the calling tool has imported.
+    """
+    qt = sys.modules.get("PyQt6.QtCore") or sys.modules.get("PyQt5.QtCore")
+    if qt is None:
+        raise RuntimeError("port_events() needs PyQt6 or PyQt5 imported first")
+
+    cls = _event_classes.get(qt.__name__)
+    if cls is None:
+        cls = type("PortEvents", (qt.QObject,), {
+            "added": qt.pyqtSignal(str),
+            "removed": qt.pyqtSignal(str),
+        })
+        _event_classes[qt.__name__] = cls
+
+    events = cls(parent)
+    w = watcher()
+
+    def forward(added, removed):
+        for port in sorted(removed):
+            events.removed.emit(port)
+        for port in sorted(added):
+            events.added.emit(port)
+
+    w.subscribe(forward)
+    events.destroyed.connect(lambda *_: w.unsubscribe(forward))
+    return events
+
+
+def bind_combo(combo):
+    """Keep a port QComboBox in step with the watcher.
+
+    Items are added and removed one at a time, so the current selection
+    survives (no clear-and-refill flicker). Returns the PortEvents object,
+    parented to the combo, for callers that want the events too.
+    """
+    def add(port):
+        if combo.findText(port) < 0:
+            combo.addItem(port)
+
+    def remove(port):
+        combo.removeItem(combo.findText(port))
+
+    events = port_events(combo)
+    events.added.connect(add)
+    events.removed.connect(remove)
+
+    for port in sorted(watcher().ports):
+        add(port)
+    return events
@@ -0,0 +1,188 @@
+"""Persistent esptool worker processes.
+
+`python -m esptool` costs an interpreter start plus the esptool import for
+every chip_id and every write_flash. An engine pays that once: it is a
+long-lived child process that imports esptool and runs one job at a time
+by calling esptool.main(args) in-process, streaming its output back.
+
+Engines are pooled so the flash station gets one per parallel slot. The
+child process (rather than a thread in the GUI process) keeps esptool's
+global logger and stdout to one job at a time.
+
+Run with esptool arguments instead of --serve, the same file is a one-shot
+esptool: what the subprocess path starts, so both paths share the
+image_cache hook.
+
+    PHLOTON_ESPTOOL_MODULE=fake_esptool   run fake_esptool.main() instead
+"""
+import os
+import sys
+import json
+import time
+import threading
+import subprocess
+
+
+DONE = "@@esptool-engine-done@@"
+READY = "@@esptool-engine-ready@@"
+
+
+class EngineError(Exception):
+    pass
+
+
+def arm_watchdog(kill, timeout=None, cancel=None):
+    """Call kill() after `timeout` s or once `cancel` is set; returns a disarm function."""
+    done = threading.Event()
+    if timeout is None and cancel is None:
+        return done.set
+
+    def watch():
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not done.wait(0.05):
+            if (cancel and cancel.is_set()) or (deadline and time.monotonic() >= deadline):
+                kill()
+                return
+
+    threading.Thread(target=watch, daemon=True).start()
+    return done.set
+
+
+# ============================================================
+# ENGINE (parent side)
+# ============================================================
+class EsptoolEngine:
+    def __init__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            env=dict(os.environ, PYTHONUNBUFFERED="1"),
+        )
+        first = self.proc.stdout.readline().decode(errors="ignore").strip()
+        if first != READY:
+            self.close()
+            raise EngineError(first or "engine exited during startup")
+
+    def alive(self):
+        return self.proc.poll() is None
+
+    def run(self, args, on_chunk, timeout=None, cancel=None):
+        """Run one esptool job; on_chunk gets raw output bytes. Returns the exit code.
+
+        On timeout or cancel the engine is killed (and must not be reused).
+        """
+        self.proc.stdin.write((json.dumps(args) + "\n").encode())
+        self.proc.stdin.flush()
+
+        disarm = arm_watchdog(self.proc.kill, timeout, cancel)
+        marker = DONE.encode()
+        try:
+            while True:
+                line = self.proc.stdout.readline()
+                if not line:
+                    return -1
+                if line.startswith(marker):
+                    return int(line[len(marker):])
+                on_chunk(line)
+        finally:
+            disarm()
+
+    def close(self):
+        if self.alive():
+            self.proc.kill()
+        self.proc.wait()
+
+
+# ============================================================
+# POOL
+# ============================================================
+_idle = []
+_lock = threading.Lock()
+
+
+def acquire():
+    """An idle engine, or a freshly started one."""
+    with _lock:
+        while _idle:
+            engine = _idle.pop()
+            if engine.alive():
+                return engine
+    return EsptoolEngine()
+
+
+def release(engine):
+    if engine.alive():
+        with _lock:
+            _idle.append(engine)
+    else:
+        engine.close()
+
+
+def warm_up(n=1):
+    """Start `n` engines ahead of time so the first board does not wait."""
+    engines = [acquire() for _ in range(n)]
+    for engine in engines:
+        release(engine)
+
+
+def shutdown():
+    """Close the idle engines, e.g. before the environment they inherited changes."""
+    with _lock:
+        engines, _idle[:] = _idle[:], []
+    for engine in engines:
+        engine.close()
+
+
+# ============================================================
+# SERVER (child side)
+# ============================================================
+def load_esptool():
+    import importlib
+
+    return importlib.import_module(os.environ.get("PHLOTON_ESPTOOL_MODULE", "esptool"))
+
+
+def run_job(module, args):
+    """module.main(args), with image_cache's zlib.compress for that call only."""
+    import image_cache
+
+    with image_cache.installed():
+        module.main(args)
+
+
+def serve():
+    try:
+        module = load_esptool()
+    except ImportError as e:
+        print(f"cannot import esptool: {e}", flush=True)
+        return
+
+    print(READY, flush=True)
+
+    for job in sys.stdin:
+        code = 0
+        try:
+            run_job(module, json.loads(job))
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            print(f"A fatal error occurred: {e}")
+            code = 2
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        print(f"\n{DONE}{code}", flush=True)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--serve"]:
+        # stderr joins stdout in the pipe; keep both unbuffered and in order
+        sys.stderr = sys.stdout
+        serve()
+    else:
+        try:
+            run_job(load_esptool(), sys.argv[1:])
+        except Exception as e:
+            # same contract as `python -m esptool`: message, then exit 2
+            print(f"A fatal error occurred: {e}", flush=True)
+            sys.exit(2)
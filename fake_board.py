@@ -0,0 +1,141 @@
+"""Pseudo-terminal stand-ins for Phloton boards (POSIX only).
+
+Each FakeBoard opens a pty pair; tools connect to `board.port` exactly as
+they would to a USB serial port, and the board prints the same telemetry
+block as the firmware. Run directly to keep a few boards alive for manual
+GUI testing:
+
+    python fake_board.py 4          # 4 boards, one block a second
+    python fake_board.py 32 0.01    # 32 boards, one block every 10 ms
+"""
+import os
+import pty
+import random
+import sys
+import threading
+import time
+import tty
+
+
+def telemetry_values():
+    """One sample of every channel, in telemetry.CHANNELS order."""
+    return [
+        random.uniform(24, 27), random.uniform(4, 8),
+        random.uniform(35, 45), random.uniform(10, 14),
+        random.uniform(0.04, 0.06), random.uniform(0.20, 0.30),
+        random.uniform(1.0, 1.5), random.uniform(11.8, 12.2),
+    ]
+
+
+def telemetry_block():
+    """One second of output from Integraed_code__.ino."""
+    a, c, h, f, cs, hs, isns, v = telemetry_values()
+    return [
+        f"Ambient -> Temp: {a:.2f} °C",
+        f"Cold Sink -> Temp: {c:.2f} °C",
+        f"Heat Sink -> Temp: {h:.2f} °C",
+        f"Flask Top -> Temp: {f:.2f} °C",
+        f"Current CSFAN: {cs:.3f} A",
+        f"Current HSFAN: {hs:.3f} A",
+        f"CurrentISNS: {isns:.3f} A",
+        f"Voltage: {v:.3f} V",
+    ]
+
+
+def raw_counts():
+    counts = [random.randint(3000, 3900) for _ in range(4)]          # thermistors
+    counts += [random.randint(30, 60), random.randint(100, 160)]    # fan shunts
+    counts += [random.randint(3000, 3300), random.randint(3300, 3400)]  # ISNS, Voltage
+    return counts
+
+
+def raw_block():
+    """One RAW line, as printed with RAW_STREAM_HZ set (see adc_convert)."""
+    return ["RAW " + " ".join(map(str, raw_counts()))]
+
+
+# ============================================================
+# FAKE BOARD
+# ============================================================
+class FakeBoard:
+    def __init__(self, period=1.0, banner=None, banner_delay=0.0, banner_repeat=False,
+                 raw=False, binary=False):
+        self.period = period
+        self.raw = raw
+        # BINARY_FRAMES: one telemetry_frames frame per sample instead of text
+        self.binary = binary
+        self.banner = banner
+        self.banner_delay = banner_delay
+        # re-print the banner every banner_delay, like a menu prompt, so a
+        # probe that opens the port late still sees it
+        self.banner_repeat = banner_repeat
+
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+
+        self.lines_sent = 0
+        self.frames_sent = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def write_lines(self, lines):
+        os.write(self.master, ("\n".join(lines) + "\n").encode())
+        self.lines_sent += len(lines)
+
+    def write_block(self):
+        if not self.binary:
+            self.write_lines(raw_block() if self.raw else telemetry_block())
+            return
+
+        from telemetry_frames import TYPE_RAW, TYPE_READINGS, encode
+
+        if self.raw:
+            frame = encode(TYPE_RAW, self.frames_sent, raw_counts())
+        else:
+            frame = encode(TYPE_READINGS, self.frames_sent, telemetry_values())
+        os.write(self.master, frame)
+        self.frames_sent += 1
+
+    def _run(self):
+        try:
+            if self.banner:
+                while not self._stop.wait(self.banner_delay):
+                    self.write_lines([self.banner])
+                    if not self.banner_repeat:
+                        break
+                if self._stop.is_set():
+                    return
+
+            while self.period and not self._stop.wait(self.period):
+                self.write_block()
+        except OSError:
+            pass
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=2)
+        for fd in (self.master, self.slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    period = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+    boards = [FakeBoard(period, banner="Enter option number:").start() for _ in range(n)]
+    for b in boards:
+        print(b.port, flush=True)
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for b in boards:
+            b.close()
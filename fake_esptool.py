@@ -0,0 +1,158 @@
+"""Stand-in for `python -m esptool` that needs no board.
+
+Prints what esptool v4 prints for chip_id, write_flash and verify_flash,
+at roughly the speed of a 921600 baud flash, so the tools can be driven
+offline:
+
+    PHLOTON_ESPTOOL="python fake_esptool.py" python Automation_code.py
+
+Environment knobs:
+    FAKE_ESPTOOL_CHIP   chip to report (default ESP32-S3)
+    FAKE_ESPTOOL_KBPS   effective write speed in kbit/s (default 800)
+    FAKE_ESPTOOL_FAIL   "connect" or "write" to fail at that stage
+    FAKE_ESPTOOL_BAUD   highest --baud the fake adapter survives; a flash
+                        above it dies halfway through (default: any)
+    FAKE_ESPTOOL_FLASH  folder holding each fake board's flash digests, which
+                        write_flash records and verify_flash checks
+                        (default: the temp folder)
+"""
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import hashlib
+import tempfile
+
+
+BLOCK = 0x4000
+
+
+def arg(args, name, default=None):
+    if name in args:
+        return args[args.index(name) + 1]
+    return default
+
+
+def flash_file(args):
+    port = re.sub(r"\W", "_", arg(args, "--port", "fake"))
+    folder = os.environ.get("FAKE_ESPTOOL_FLASH", tempfile.gettempdir())
+    return os.path.join(folder, f"fake_esptool_{port}.json")
+
+
+def load_flash(args):
+    try:
+        with open(flash_file(args)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_flash(args, flash):
+    with open(flash_file(args), "w") as f:
+        json.dump(flash, f)
+
+
+def md5(path):
+    with open(path, "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def image_pairs(args, command):
+    pos = args.index(command) + 1
+    rest = [a for a in args[pos:] if not a.startswith("-")]
+    return list(zip(rest[::2], rest[1::2]))
+
+
+def connect(args):
+    chip = os.environ.get("FAKE_ESPTOOL_CHIP", "ESP32-S3")
+    print("esptool.py v4.7.0")
+    print(f"Serial port {arg(args, '--port', '?')}")
+    print("Connecting....")
+    if os.environ.get("FAKE_ESPTOOL_FAIL") == "connect":
+        print("A fatal error occurred: Failed to connect to Espressif device: "
+              "No serial data received.")
+        sys.exit(2)
+    print(f"Chip is {chip} (QFN56) (revision v0.2)")
+    print("Features: WiFi, BLE")
+    print("MAC: 7c:df:a1:00:00:01")
+    print("Uploading stub...")
+    print("Running stub...")
+    print("Stub running...")
+
+
+def write_flash(args):
+    kbps = float(os.environ.get("FAKE_ESPTOOL_KBPS", "800"))
+    baud = arg(args, "--baud")
+    if baud:
+        print(f"Changing baud rate to {baud}")
+        print("Changed.")
+    print("Configuring flash size...")
+
+    fail = os.environ.get("FAKE_ESPTOOL_FAIL") == "write"
+    if baud and int(baud) > int(os.environ.get("FAKE_ESPTOOL_BAUD", baud)):
+        fail = True     # the adapter cannot keep up at this rate
+
+    flash = load_flash(args)
+    for addr_s, path in image_pairs(args, "write_flash"):
+        addr = int(addr_s, 16)
+        with open(path, "rb") as f:
+            image = f.read()
+        size = len(image)
+        packed = len(zlib.compress(image, 9))
+        print(f"Flash will be erased from {addr:#010x} to {addr + size - 1:#010x}...")
+        print(f"Compressed {size} bytes to {packed}...")
+
+        for off in range(0, max(size, 1), BLOCK):
+            print(f"Writing at {addr + off:#010x}... ({off * 100 // max(size, 1)} %)")
+            time.sleep(min(BLOCK, size) * 8 / 1000 / kbps)
+            if fail and off >= size // 2:
+                print("A fatal error occurred: Packet content transfer stopped "
+                      "(received 8 bytes)")
+                sys.exit(2)
+        print(f"Writing at {addr + size:#010x}... (100 %)")
+        print(f"Wrote {size} bytes ({packed} compressed) at {addr:#010x} "
+              f"in {size * 8 / 1000 / kbps:.1f} seconds (effective {kbps:.1f} kbit/s)...")
+        print("Hash of data verified.")
+        flash[str(addr)] = md5(path)
+        save_flash(args, flash)
+
+    print()
+    print("Leaving...")
+    print("Hard resetting via RTS pin...")
+
+
+def verify_flash(args):
+    flash = load_flash(args)
+    failed = False
+    for addr_s, path in image_pairs(args, "verify_flash"):
+        addr = int(addr_s, 16)
+        size = os.path.getsize(path)
+        print(f"Verifying {size:#x} ({size}) bytes @ {addr:#010x} in flash against {path}...")
+        time.sleep(size / 20e6)
+        if flash.get(str(addr)) == md5(path):
+            print("-- verify OK (digest matched)")
+        else:
+            print("-- verify FAILED (digest mismatch)")
+            failed = True
+    print("Hard resetting via RTS pin...")
+    if failed:
+        print("A fatal error occurred: Verify failed.")
+        sys.exit(2)
+
+
+def main(args):
+    connect(args)
+    if "write_flash" in args:
+        write_flash(args)
+    elif "verify_flash" in args:
+        verify_flash(args)
+    elif "chip_id" in args:
+        print("Warning: ESP32-S3 has no Chip ID. Reading MAC instead.")
+        print("MAC: 7c:df:a1:00:00:01")
+        print("Hard resetting via RTS pin...")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
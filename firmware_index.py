@@ -0,0 +1,193 @@
+"""Index of the firmware build tree, so flashing a board does not walk it.
+
+The bootloader and partition table are looked up next to the selected app
+(`*bootloader*.bin`, `*partitions*.bin`, anywhere under the app's folder).
+The tree is walked once. After that it is re-walked only when a file
+appears, disappears or is rewritten: on Linux inotify says so, and
+elsewhere the tree is re-walked at most every RESCAN_INTERVAL seconds.
+
+Every artifact handed out carries its size, mtime and SHA-256. It is
+re-hashed only when its size or mtime changes, and its header is checked
+so a truncated or wrong file is refused before esptool resets the board.
+
+    bundle = bundle_for(app_path)      # Bundle(bootloader, partitions, app)
+    args = write_flash_args(port, chip, bundle.images())
+"""
+import os
+import time
+import fnmatch
+import hashlib
+import threading
+from collections import namedtuple
+
+import device_watcher
+from flashing import APP_ADDR, BOOTLOADER_ADDR, PARTITIONS_ADDR
+
+
+BOOTLOADER_GLOB = "*bootloader*.bin"
+PARTITIONS_GLOB = "*partitions*.bin"
+
+RESCAN_INTERVAL = 5.0
+
+WATCH_MASK = (device_watcher.IN_CREATE | device_watcher.IN_DELETE | device_watcher.IN_CLOSE_WRITE
+              | device_watcher.IN_MOVED_FROM | device_watcher.IN_MOVED_TO)
+
+ESP_IMAGE_MAGIC = b"\xe9"           # first byte of bootloader and app images
+PARTITION_MAGIC = b"\xaa\x50"       # first entry of a partition table
+
+Artifact = namedtuple("Artifact", "path size mtime sha256")
+
+
+class FirmwareError(Exception):
+    pass
+
+
+class Bundle(namedtuple("Bundle", "bootloader partitions app")):
+    def images(self):
+        """[(address, path), ...] for write_flash_args()."""
+        return [
+            (BOOTLOADER_ADDR, self.bootloader.path),
+            (PARTITIONS_ADDR, self.partitions.path),
+            (APP_ADDR, self.app.path),
+        ]
+
+
+def hash_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# ============================================================
+# FIRMWARE INDEX
+# ============================================================
+class FirmwareIndex:
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.bootloaders = []
+        self.partitions = []
+
+        self._artifacts = {}        # path -> Artifact, as last hashed
+        self._resolved = {}         # app path -> (bootloader, partitions)
+        self._scanned_at = None
+        self._lock = threading.Lock()
+
+        self._fd = device_watcher.open_inotify(self.root, WATCH_MASK)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def bundle(self, app):
+        """The verified Bundle for `app`; raises FirmwareError."""
+        app = os.path.abspath(app)
+        with self._lock:
+            if self._stale():
+                self._scan()
+
+            found = self._resolved.get(app)
+            if found is None:
+                found = self._resolved[app] = (
+                    self._nearest(self.bootloaders, app),
+                    self._nearest(self.partitions, app),
+                )
+            boot, part = found
+            if not boot or not part:
+                raise FirmwareError("bootloader or partition bin not found")
+
+            return Bundle(
+                self._artifact(boot, ESP_IMAGE_MAGIC),
+                self._artifact(part, PARTITION_MAGIC),
+                self._artifact(app, ESP_IMAGE_MAGIC),
+            )
+
+    # ========================================================
+    # SCANNING
+    # ========================================================
+    def _stale(self):
+        if self._scanned_at is None:
+            return True
+        if self._fd is None:
+            return time.monotonic() - self._scanned_at > RESCAN_INTERVAL
+
+        changed = False
+        try:
+            while os.read(self._fd, 4096):
+                changed = True
+        except BlockingIOError:
+            pass
+        return changed
+
+    def _scan(self):
+        self.bootloaders = []
+        self.partitions = []
+        for root, _, files in os.walk(self.root):
+            if self._fd is not None and root != self.root:
+                if not device_watcher.add_watch(self._fd, root, WATCH_MASK):
+                    # out of inotify watches: fall back to timed rescans
+                    self.close()
+            for name in files:
+                if fnmatch.fnmatch(name, BOOTLOADER_GLOB):
+                    self.bootloaders.append(os.path.join(root, name))
+                elif fnmatch.fnmatch(name, PARTITIONS_GLOB):
+                    self.partitions.append(os.path.join(root, name))
+
+        self._resolved.clear()
+        self._scanned_at = time.monotonic()
+
+    @staticmethod
+    def _nearest(paths, app):
+        """The candidate closest to the app's folder, newest first on a tie."""
+        base = os.path.dirname(app)
+
+        def rank(path):
+            rel = os.path.relpath(os.path.dirname(path), base)
+            depth = 0 if rel == os.curdir else rel.count(os.sep) + 1
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                mtime = 0
+            return depth, -mtime
+
+        return min(paths, key=rank, default=None)
+
+    # ========================================================
+    # ARTIFACTS
+    # ========================================================
+    def _artifact(self, path, magic):
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            # vanished since the last scan; look again next time
+            self._scanned_at = None
+            raise FirmwareError(f"{path}: {e.strerror}")
+
+        known = self._artifacts.get(path)
+        if known and (known.size, known.mtime) == (st.st_size, st.st_mtime_ns):
+            return known
+
+        with open(path, "rb") as f:
+            head = f.read(len(magic))
+        if head != magic:
+            raise FirmwareError(f"{os.path.basename(path)} is not a valid image")
+
+        art = Artifact(path, st.st_size, st.st_mtime_ns, hash_file(path))
+        self._artifacts[path] = art
+        return art
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def bundle_for(app):
+    """Bundle for the app at `app`, from the index of its folder."""
+    root = os.path.dirname(os.path.abspath(app))
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = _indexes[root] = FirmwareIndex(root)
+    return index.bundle(app)
@@ -0,0 +1,91 @@
+"""Headless flash-and-verify, for rack PCs and scripts. No Qt needed.
+
+    python flash_cli.py build/app.bin --port /dev/ttyUSB0
+    python flash_cli.py build/app.bin --all --parallel 8 > results.jsonl
+
+Each board runs chip detect -> flash -> reconnect -> MAC/telemetry verify
+(pipeline.run_board) and prints one JSON object per line as it finishes;
+a summary object comes last. esptool and firmware output goes to stderr
+with -v. The exit status is 0 only if every board passed.
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from serial.tools import list_ports
+
+from pipeline import VERIFY_SECONDS, run_board
+
+
+PARALLEL = 4
+
+
+def parse_args(argv):
+    ap = argparse.ArgumentParser(description="Flash and verify Phloton boards without the GUI.")
+    ap.add_argument("firmware", help="application .bin (bootloader/partitions are found next to it)")
+    ap.add_argument("--port", action="append", default=[], help="port to flash (repeatable)")
+    ap.add_argument("--all", action="store_true", help="flash every serial port present")
+    ap.add_argument("--parallel", type=int, default=PARALLEL, help="boards in flight at once")
+    ap.add_argument("--full", action="store_true", help="rewrite every region, even if unchanged")
+    ap.add_argument("--no-verify", action="store_true", help="skip the post-flash serial check")
+    ap.add_argument("--verify-seconds", type=float, default=VERIFY_SECONDS,
+                    help="how long to listen to the firmware after reset")
+    ap.add_argument("-v", "--verbose", action="store_true", help="esptool/firmware output on stderr")
+    return ap.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    ports = list(args.port)
+    if args.all:
+        ports += [p.device for p in list_ports.comports() if p.device not in ports]
+    if not ports:
+        print("no ports given (use --port or --all)", file=sys.stderr)
+        return 2
+
+    out_lock = threading.Lock()
+
+    def emit(obj):
+        with out_lock:
+            print(json.dumps(obj), flush=True)
+
+    def logger(port):
+        if not args.verbose:
+            return lambda line: None
+
+        def log(line):
+            with out_lock:
+                print(f"[{port}] {line}", file=sys.stderr, flush=True)
+        return log
+
+    start = time.monotonic()
+    passed = failed = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, args.parallel)) as pool:
+        futures = [
+            pool.submit(
+                run_board, port, args.firmware,
+                diff=not args.full, verify=not args.no_verify,
+                verify_seconds=args.verify_seconds, on_line=logger(port),
+            )
+            for port in ports
+        ]
+        for fut in as_completed(futures):
+            result = fut.result()
+            if result["ok"]:
+                passed += 1
+            else:
+                failed += 1
+            emit(result)
+
+    emit({"summary": True, "boards": len(ports), "passed": passed, "failed": failed,
+          "seconds": round(time.monotonic() - start, 2)})
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
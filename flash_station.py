@@ -0,0 +1,273 @@
+import sys
+import time
+from collections import deque
+
+from PyQt6.QtWidgets import (
+    QApplication, QWidget, QLabel, QLineEdit, QPushButton,
+    QFileDialog, QVBoxLayout, QHBoxLayout,
+    QGroupBox, QSpinBox, QTableWidget, QTableWidgetItem, QTabWidget,
+    QHeaderView, QMessageBox, QCheckBox
+)
+from serial.tools import list_ports
+
+from Automation_code import ChipDetectWorker, FlashWorker, apply_light_theme
+from chip_cache import cache
+from device_watcher import port_events
+from firmware_index import FirmwareError, bundle_for
+from image_cache import prebuild
+from log_console import LogConsole
+
+
+MAX_PARALLEL = 4
+
+COL_PORT, COL_CHIP, COL_STATUS, COL_TIME = range(4)
+
+
+# ============================================================
+# FLASH STATION
+# ============================================================
+class FlashStation(QWidget):
+    """Flash every selected port at once, at most `parallel` boards in flight."""
+
+    def __init__(self, firmware=""):
+        super().__init__()
+        self.setWindowTitle("Phloton Flash Station")
+
+        self.pending = deque()
+        self.active = {}      # port -> running worker (detect or flash)
+        self.rows = {}        # port -> table row
+        self.logs = {}        # port -> LogConsole
+        self.started = {}     # port -> start time of its job
+        self.passed = 0
+        self.failed = 0
+        self.batch_start = None
+
+        self.build_ui()
+        self.bin_edit.setText(firmware)
+        self.scan_ports()
+
+        # boards plugged into the hubs later get a row of their own
+        self.port_events = port_events(self)
+        self.port_events.added.connect(self.port_added)
+
+    # ========================================================
+    # UI LAYOUT
+    # ========================================================
+    def build_ui(self):
+        main = QVBoxLayout(self)
+
+        header = QLabel("  Phloton Flash Station")
+        header.setObjectName("Header")
+        header.setFixedHeight(32)
+        main.addWidget(header)
+
+        # --------------------------------------------------------------------
+        # FIRMWARE + POOL SETTINGS
+        # --------------------------------------------------------------------
+        setup = QGroupBox("Station")
+        sl = QHBoxLayout(setup)
+
+        self.bin_edit = QLineEdit()
+        browse = QPushButton("Browse")
+        browse.clicked.connect(self.browse)
+
+        self.parallel_sb = QSpinBox()
+        self.parallel_sb.setRange(1, 32)
+        self.parallel_sb.setValue(MAX_PARALLEL)
+
+        scan = QPushButton("Scan Ports")
+        scan.clicked.connect(self.scan_ports)
+
+        self.diff_cb = QCheckBox("Skip unchanged regions")
+        self.diff_cb.setChecked(True)
+
+        self.flash_btn = QPushButton("Flash All")
+        self.flash_btn.clicked.connect(self.flash_all)
+
+        sl.addWidget(QLabel("Application (.bin):"))
+        sl.addWidget(self.bin_edit, 1)
+        sl.addWidget(browse)
+        sl.addSpacing(12)
+        sl.addWidget(QLabel("Parallel:"))
+        sl.addWidget(self.parallel_sb)
+        sl.addWidget(scan)
+        sl.addWidget(self.diff_cb)
+        sl.addWidget(self.flash_btn)
+
+        main.addWidget(setup)
+
+        # --------------------------------------------------------------------
+        # PER-PORT STATUS ROWS + LOGS
+        # --------------------------------------------------------------------
+        boards = QGroupBox("Boards")
+        bl = QHBoxLayout(boards)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Port", "Chip", "Status", "Time (s)"])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.cellClicked.connect(lambda row, _: self.log_tabs.setCurrentIndex(row))
+
+        self.log_tabs = QTabWidget()
+
+        bl.addWidget(self.table, 1)
+        bl.addWidget(self.log_tabs, 1)
+
+        main.addWidget(boards, 1)
+
+        self.summary = QLabel("Passed: 0   Failed: 0   Boards/hour: --")
+        main.addWidget(self.summary)
+
+    # ========================================================
+    # HELPERS
+    # ========================================================
+    def browse(self):
+        f, _ = QFileDialog.getOpenFileName(self, "Select firmware", "", "Binary Files (*.bin)")
+        if f:
+            self.bin_edit.setText(f)
+
+    def scan_ports(self):
+        if self.active:
+            return
+
+        self.table.setRowCount(0)
+        self.log_tabs.clear()
+        self.rows.clear()
+        self.logs.clear()
+
+        for p in list_ports.comports():
+            self.add_port(p.device)
+
+    def port_added(self, port):
+        if port not in self.rows:
+            self.add_port(port)
+
+    def add_port(self, port):
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.rows[port] = row
+
+        for col, text in ((COL_PORT, port), (COL_CHIP, "--"), (COL_STATUS, "Idle"), (COL_TIME, "")):
+            self.table.setItem(row, col, QTableWidgetItem(text))
+
+        log = LogConsole(f"station_{port}")
+        log.setReadOnly(True)
+        self.logs[port] = log
+        self.log_tabs.addTab(log, port)
+
+    def set_cell(self, port, col, text):
+        self.table.item(self.rows[port], col).setText(text)
+
+    def update_summary(self):
+        done = self.passed + self.failed
+        rate = "--"
+        if done and self.batch_start:
+            hours = (time.time() - self.batch_start) / 3600
+            rate = f"{done / hours:.0f}"
+        self.summary.setText(
+            f"Passed: {self.passed}   Failed: {self.failed}   Boards/hour: {rate}"
+        )
+
+    # ========================================================
+    # WORKER POOL
+    # ========================================================
+    def flash_all(self):
+        if not self.bin_edit.text().endswith(".bin"):
+            QMessageBox.warning(self, "Error", "Please select a .bin file")
+            return
+        if not self.rows:
+            QMessageBox.warning(self, "Error", "No ports detected")
+            return
+        try:
+            # resolve, hash and deflate the bundle once, not per board
+            prebuild(bundle_for(self.bin_edit.text()))
+        except (FirmwareError, OSError) as e:
+            QMessageBox.warning(self, "Error", str(e))
+            return
+
+        self.flash_btn.setEnabled(False)
+        self.passed = self.failed = 0
+        self.batch_start = time.time()
+        self.update_summary()
+
+        for port in self.rows:
+            self.logs[port].clear()
+            self.set_cell(port, COL_CHIP, "--")
+            self.set_cell(port, COL_STATUS, "Queued")
+            self.set_cell(port, COL_TIME, "")
+            self.pending.append(port)
+
+        self.pump()
+
+    def pump(self):
+        while self.pending and len(self.active) < self.parallel_sb.value():
+            self.start_job(self.pending.popleft())
+
+        if not self.pending and not self.active:
+            self.flash_btn.setEnabled(True)
+
+    def start_job(self, port):
+        self.started[port] = time.time()
+
+        known = cache().get(port)
+        if known:
+            self.chip_ok(port, known.chip)
+            return
+
+        self.set_cell(port, COL_STATUS, "Detecting Chip")
+
+        worker = ChipDetectWorker(port)
+        worker.detected.connect(lambda chip, _, port=port: self.chip_ok(port, chip))
+        worker.failed.connect(lambda port=port: self.job_done(port, False, "Chip Detect Failed"))
+        self.active[port] = worker
+        worker.start()
+
+    def chip_ok(self, port, chip):
+        detector = self.active.get(port)
+        if detector:
+            detector.wait()
+
+        self.set_cell(port, COL_CHIP, chip)
+        self.set_cell(port, COL_STATUS, "Flashing")
+
+        worker = FlashWorker(port, chip, self.bin_edit.text(), self.diff_cb.isChecked())
+        worker.log.connect(self.logs[port].appendPlainText)
+        worker.progress.connect(
+            lambda pct, port=port: self.set_cell(port, COL_STATUS, f"Flashing {pct}%")
+        )
+        worker.finished.connect(
+            lambda ok, port=port: self.job_done(port, ok, "Done" if ok else "Flash Failed")
+        )
+        self.active[port] = worker
+        worker.start()
+
+    def job_done(self, port, ok, status):
+        worker = self.active.pop(port, None)
+        if worker:
+            worker.wait()
+
+        self.set_cell(port, COL_STATUS, status)
+        self.set_cell(port, COL_TIME, f"{time.time() - self.started.pop(port):.1f}")
+
+        if ok:
+            self.passed += 1
+        else:
+            self.failed += 1
+        self.update_summary()
+
+        self.pump()
+
+
+# ============================================================
+# MAIN
+# ============================================================
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    apply_light_theme(app)
+
+    win = FlashStation(sys.argv[1] if len(sys.argv) > 1 else "")
+    win.resize(1100, 700)
+    win.show()
+
+    sys.exit(app.exec())
@@ -0,0 +1,308 @@
+"""esptool plumbing shared by the flash workers.
+
+esptool runs either as a fresh process per job (default) or in a
+persistent esptool_engine worker (PHLOTON_ESPTOOL_ENGINE=1), which skips
+the interpreter start and import; if an engine cannot start, jobs fall back
+to the subprocess. Both go through esptool_engine so compressed images
+come from image_cache (PHLOTON_IMAGE_CACHE=0 runs plain `python -m
+esptool`). The esptool command can be swapped for a stub (fake_esptool.py)
+to drive the tools offline:
+
+    PHLOTON_ESPTOOL="python fake_esptool.py" python Automation_code.py
+    PHLOTON_ESPTOOL_MODULE=fake_esptool python ...      (with image_cache)
+    PHLOTON_ESPTOOL_ENGINE=1 PHLOTON_ESPTOOL_MODULE=fake_esptool python ...
+"""
+import os
+import re
+import sys
+import shlex
+import subprocess
+
+import esptool_engine
+import image_cache
+from chip_cache import adapter_key
+
+
+BOOTLOADER_ADDR = 0x0000
+PARTITIONS_ADDR = 0x8000
+APP_ADDR = 0x10000
+
+FLASH_BAUD = 921600
+
+# write_flash starts an unknown adapter at FLASH_BAUD, steps down when a flash
+# dies after the baud switch, and after a clean flash tries one rate faster
+# next time, up to the slowest rate that adapter has failed at. A failure is
+# forgotten after BAUD_RETRY_AFTER clean flashes, so one bad cable or a noisy
+# moment does not cap that adapter type for the rest of the session
+BAUD_RATES = (2000000, 1500000, 921600, 460800, 230400, 115200)
+MAX_BAUD_ATTEMPTS = 3
+BAUD_RETRY_AFTER = 5
+
+# per attempt: fixed connect/erase allowance plus 3x the raw transfer time
+FLASH_TIMEOUT_BASE = 30.0
+
+USE_ENGINE = os.environ.get("PHLOTON_ESPTOOL_ENGINE") == "1"
+
+# v4: "Writing at 0x00010000... (12 %)"   v5: "Writing at 0x00010000 [==>  ]  12.3%"
+_PROGRESS = re.compile(r"Writing at (0x[0-9a-fA-F]+)[^%\n]*?(\d+(?:\.\d+)?)\s*%")
+
+# verify_flash prints, per region:
+#   v4: "Verifying 0x5140 (20800) bytes @ 0x00010000 in flash against app.bin..."
+#       "-- verify OK (digest matched)"
+#   v5: "Verifying 0x5140 (20800) bytes at 0x00010000 in flash against app.bin..."
+#       "Verification successful (digest matched)."
+_VERIFYING = re.compile(r"Verifying .*?(?:@|at) (0x[0-9a-fA-F]+) in flash")
+
+
+def esptool_cmd():
+    override = os.environ.get("PHLOTON_ESPTOOL")
+    if override:
+        return shlex.split(override)
+    if image_cache.ENABLED:
+        return [sys.executable, os.path.abspath(esptool_engine.__file__)]
+    return [sys.executable, "-m", "esptool"]
+
+
+def _image_args(port, chip, images, baud, command):
+    cmd = [
+        "--chip", chip,
+        "--port", port,
+        "--baud", str(baud),
+        "--before", "default_reset",
+        "--after", "hard_reset",
+    ] + command
+    for addr, path in images:
+        cmd += [f"0x{addr:04x}", path]
+    return cmd
+
+
+def write_flash_args(port, chip, images, baud=FLASH_BAUD):
+    """esptool write_flash arguments for [(address, path), ...]."""
+    return _image_args(port, chip, images, baud, ["write_flash", "-z"])
+
+
+def verify_flash_args(port, chip, images, baud=FLASH_BAUD):
+    """esptool verify_flash arguments for [(address, path), ...]."""
+    return _image_args(port, chip, images, baud, ["verify_flash"])
+
+
+# ============================================================
+# PROGRESS
+# ============================================================
+class FlashProgress:
+    """Turns esptool's per-region "Writing at" lines into one 0-100 figure.
+
+    Each image counts in proportion to its size, so the bar does not jump
+    back to 0 when esptool moves from the bootloader to the app.
+    """
+
+    def __init__(self, images):
+        regions = sorted((addr, os.path.getsize(path)) for addr, path in images)
+        self.total = sum(size for _, size in regions) or 1
+        self.regions = []
+        done = 0
+        for addr, size in regions:
+            self.regions.append((addr, done, size))
+            done += size
+
+    def update(self, line):
+        """Overall percent if `line` is a progress line, else None."""
+        m = _PROGRESS.search(line)
+        if not m:
+            return None
+
+        addr = int(m.group(1), 16)
+        pct = float(m.group(2))
+
+        before, size = 0, 0
+        for start, done, length in self.regions:
+            if start <= addr:
+                before, size = done, length
+
+        return min(100, int((before + size * pct / 100) * 100 / self.total))
+
+
+# ============================================================
+# STREAMING RUN
+# ============================================================
+class OutputSink:
+    """Splits raw esptool output into lines for on_line, and progress for on_progress.
+
+    esptool rewrites progress lines with "\\r" when it thinks it has a
+    terminal, so both "\\r" and "\\n" end a line.
+    """
+
+    def __init__(self, on_line, progress=None, on_progress=None):
+        self.on_line = on_line
+        self.progress = progress
+        self.on_progress = on_progress
+        self.last_pct = None
+        self.buf = b""
+
+    def feed(self, chunk):
+        self.buf += chunk.replace(b"\r", b"\n")
+        *lines, self.buf = self.buf.split(b"\n")
+        for raw in lines:
+            self.line(raw)
+
+    def flush(self):
+        if self.buf.strip():
+            self.line(self.buf)
+        self.buf = b""
+
+    def line(self, raw):
+        line = raw.decode(errors="ignore").rstrip()
+        if not line:
+            return
+        self.on_line(line)
+
+        pct = self.progress.update(line) if self.progress else None
+        if pct is not None and pct != self.last_pct and self.on_progress:
+            self.on_progress(pct)
+            self.last_pct = pct
+
+
+def run_subprocess(args, sink, timeout=None, cancel=None):
+    p = subprocess.Popen(
+        esptool_cmd() + args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        env=dict(os.environ, PYTHONUNBUFFERED="1"),
+    )
+
+    disarm = esptool_engine.arm_watchdog(p.kill, timeout, cancel)
+    try:
+        for chunk in iter(lambda: p.stdout.read1(4096), b""):
+            sink.feed(chunk)
+        return p.wait()
+    finally:
+        disarm()
+
+
+def run_engine(args, sink, timeout=None, cancel=None):
+    engine = esptool_engine.acquire()
+    try:
+        return engine.run(args, sink.feed, timeout, cancel)
+    finally:
+        esptool_engine.release(engine)
+
+
+def run_esptool(args, on_line, progress=None, on_progress=None, timeout=None, cancel=None):
+    """Run esptool with `args`, streaming its output line by line.
+
+    stderr is merged into stdout so errors show up in order. A job that
+    outlives `timeout`, or whose `cancel` event is set, is killed and
+    returns non-zero. Returns the exit code.
+    """
+    sink = OutputSink(on_line, progress, on_progress)
+    try:
+        if USE_ENGINE:
+            try:
+                return run_engine(args, sink, timeout, cancel)
+            except esptool_engine.EngineError as e:
+                on_line(f"esptool engine unavailable ({e}), using subprocess")
+        return run_subprocess(args, sink, timeout, cancel)
+    finally:
+        sink.flush()
+
+
+# ============================================================
+# DIFFERENTIAL FLASH
+# ============================================================
+def matched_regions(lines):
+    """Addresses verify_flash reported as matching, from its output lines."""
+    matched = set()
+    addr = None
+    for line in lines:
+        m = _VERIFYING.search(line)
+        if m:
+            addr = int(m.group(1), 16)
+        elif addr is not None and "digest matched" in line:
+            matched.add(addr)
+            addr = None
+    return matched
+
+
+def changed_images(port, chip, images, on_line, timeout=None, cancel=None):
+    """The images whose flash contents differ from the file.
+
+    verify_flash has the stub MD5 each region on the device and compares it
+    with the local file, without reading the flash back. A region that was
+    not confirmed to match (including when esptool fails) counts as changed.
+    """
+    lines = []
+
+    def collect(line):
+        lines.append(line)
+        on_line(line)
+
+    # digests are small; stay at a rate this adapter is known to manage
+    baud = min(FLASH_BAUD, _best_baud.get(adapter_key(port), FLASH_BAUD))
+    args = verify_flash_args(port, chip, images, baud)
+    run_esptool(args, collect, timeout=timeout, cancel=cancel)
+    matched = matched_regions(lines)
+    return [(addr, path) for addr, path in images if addr not in matched]
+
+
+# ============================================================
+# ADAPTIVE BAUD
+# ============================================================
+_best_baud = {}     # adapter key -> fastest rate that flashed cleanly
+_failed_baud = {}   # adapter key -> slowest rate a flash died at
+_clean_flashes = {} # adapter key -> clean flashes since its last failure
+
+
+def flash_timeout(images, baud):
+    size = sum(os.path.getsize(path) for _, path in images)
+    return FLASH_TIMEOUT_BASE + 3 * size * 10 / baud
+
+
+def start_baud(key):
+    """FLASH_BAUD for a new adapter; else one step above its best, if untried."""
+    best = _best_baud.get(key)
+    if best is None:
+        return FLASH_BAUD
+    faster = [r for r in BAUD_RATES if best < r < _failed_baud.get(key, float("inf"))]
+    return faster[-1] if faster else best
+
+
+def write_flash_adaptive(port, chip, images, on_line, on_progress=None, cancel=None):
+    """write_flash at the best known rate for this adapter type, stepping down on failure.
+
+    Only failures after esptool switched baud are retried; a board that does
+    not connect fails at once. Returns the exit code of the last attempt.
+    """
+    key = adapter_key(port)
+    start = start_baud(key)
+    rates = [r for r in BAUD_RATES if r <= start][:MAX_BAUD_ATTEMPTS]
+
+    for i, baud in enumerate(rates):
+        switched = []
+
+        def watch(line):
+            if line.startswith("Changing baud rate"):
+                switched.append(line)
+            on_line(line)
+
+        code = run_esptool(
+            write_flash_args(port, chip, images, baud), watch,
+            FlashProgress(images), on_progress,
+            timeout=flash_timeout(images, baud), cancel=cancel,
+        )
+        if code == 0:
+            _best_baud[key] = baud
+            _clean_flashes[key] = _clean_flashes.get(key, 0) + 1
+            if _clean_flashes[key] >= BAUD_RETRY_AFTER:
+                _failed_baud.pop(key, None)
+                _clean_flashes[key] = 0
+            return code
+        if not switched or (cancel and cancel.is_set()):
+            return code
+
+        _failed_baud[key] = min(baud, _failed_baud.get(key, baud))
+        _clean_flashes[key] = 0
+        slower = [r for r in BAUD_RATES if r < baud]
+        if slower:
+            _best_baud[key] = slower[0]
+        if i + 1 == len(rates):
+            return code
+        on_line(f"Flash failed at {baud} baud, retrying at {rates[i + 1]}")
+    return code
@@ -0,0 +1,117 @@
+"""Compressed firmware images, deflated once and shared by every flash.
+
+`write_flash -z` has esptool deflate each image at level 9 before sending
+it, which is the same CPU work for every board of a batch. esptool_engine
+(both the persistent engines and the one-shot runner) runs each esptool
+job inside installed(). For the length of that call zlib.compress keeps
+the deflated bytes on disk, keyed by the SHA-256 of the data, so every job
+and every parallel worker after the first reads them back instead.
+Everything else in the process gets the real zlib.compress.
+
+prebuild(bundle) fills the cache for a firmware bundle ahead of the first
+board. Without padding the key is the artifact hash firmware_index has
+already computed.
+
+    PHLOTON_IMAGE_CACHE=0          leave zlib alone
+    PHLOTON_IMAGE_CACHE_DIR=...    where the images go (~/.cache/phloton/images)
+"""
+import os
+import zlib
+import hashlib
+import tempfile
+from contextlib import contextmanager
+
+
+ENABLED = os.environ.get("PHLOTON_IMAGE_CACHE", "1") != "0"
+CACHE_DIR = os.environ.get(
+    "PHLOTON_IMAGE_CACHE_DIR", os.path.expanduser("~/.cache/phloton/images")
+)
+
+LEVEL = 9               # what esptool passes for write_flash -z
+MIN_SIZE = 4096         # smaller blobs are cheaper to deflate than to look up
+MAX_ENTRIES = 64        # oldest files beyond this are removed
+
+_compress = zlib.compress
+
+
+def cache_path(digest, level):
+    return os.path.join(CACHE_DIR, f"{digest}.z{level}")
+
+
+def compressed(data, level=LEVEL, digest=None):
+    """zlib.compress(data, level), from the cache when it was done before."""
+    digest = digest or hashlib.sha256(data).hexdigest()
+    path = cache_path(digest, level)
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        pass
+
+    packed = _compress(data, level)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # write-then-rename: parallel workers may race to build the same image
+        fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(packed)
+        os.replace(tmp, path)
+        prune()
+    except OSError:
+        pass
+    return packed
+
+
+def prune():
+    try:
+        names = [n for n in os.listdir(CACHE_DIR) if not n.endswith(".tmp")]
+    except OSError:
+        return
+    if len(names) <= MAX_ENTRIES:
+        return
+
+    paths = sorted((os.path.join(CACHE_DIR, n) for n in names), key=os.path.getmtime)
+    for path in paths[:-MAX_ENTRIES]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def prebuild(bundle):
+    """Deflate every image of a firmware_index Bundle that is not cached yet."""
+    if not ENABLED:
+        return
+    for art in bundle:
+        with open(art.path, "rb") as f:
+            data = f.read()
+        digest = art.sha256
+        if len(data) % 4:
+            # esptool pads images to 4 bytes before compressing
+            data += b"\xff" * (4 - len(data) % 4)
+            digest = hashlib.sha256(data).hexdigest()
+        if len(data) >= MIN_SIZE:
+            compressed(data, LEVEL, digest)
+
+
+def _cached_compress(data, level=-1, wbits=zlib.MAX_WBITS):
+    if wbits != zlib.MAX_WBITS:
+        return _compress(data, level, wbits=wbits)
+    if len(data) < MIN_SIZE:
+        return _compress(data, level)
+    return compressed(bytes(data), level)
+
+
+@contextmanager
+def installed():
+    """Route zlib.compress through the cache for the body of the with-block only."""
+    if not ENABLED:
+        yield
+        return
+
+    previous = zlib.compress
+    zlib.compress = _cached_compress
+    try:
+        yield
+    finally:
+        zlib.compress = previous
@@ -0,0 +1,144 @@
+"""Live ingestion metrics for one monitored board.
+
+serial_async stamps every chunk it reads with its arrival time. The metrics
+are then kept per board from where each number is known:
+
+    samples, cadence    one sample per firmware block: a reading of the
+                        board's first channel, or its "Thermistor
+                        disconnected" line in its place, at the arrival
+                        time of the batch it came in
+    jitter              smoothed |interval - cadence|, as in RFC 3550
+    dropped             sequence gaps for binary frames; for text, intervals
+                        over 1.5x expected_period, in whole periods
+    backlog             lines/frame reads still queued in serial_async after
+                        a batch is taken: grows while the consumer lags
+    latency             arrival -> the tool's slot has returned (Qt bridge)
+
+The firmware sends a block every second (expected_period). Text batches
+arrive BATCH_INTERVAL apart at best, so faster streams are measured per
+batch: k samples in one batch count as k even intervals.
+
+    metrics = reader.metrics            # from serial_async.serial_reader
+    reader.track(records)               # in the tool's data slot
+    label.setText(metrics.format())
+"""
+import time
+
+from telemetry import CHANNELS, Reading, Status
+from telemetry_frames import SequenceCounter
+
+
+EXPECTED_PERIOD = 1.0       # the firmware's `now - prevMillis >= 1000` block
+SMOOTHING = 1 / 16          # RFC 3550 jitter gain, used for every average
+LATE_FACTOR = 1.5
+
+
+def _slot(rec):
+    """Channel whose place in the block `rec` fills, or None (LID, CHARGER)."""
+    if isinstance(rec, Reading):
+        return rec.channel
+    if isinstance(rec, Status) and rec.name in CHANNELS:
+        return rec.name
+    return None
+
+
+class IngestMetrics:
+    def __init__(self, expected_period=EXPECTED_PERIOD):
+        self.expected_period = expected_period
+        self.reference = None           # channel slot that marks one block
+        self.sequence = SequenceCounter()
+
+        self.samples = 0
+        self.interval = None            # smoothed seconds between samples
+        self.jitter = 0.0
+        self.late_dropped = 0           # text only: inferred from long gaps
+        self.last_arrival = None
+
+        self.backlog_now = 0
+        self.backlog_peak = 0
+        self.latency_avg = None
+        self.latency_peak = 0.0
+
+    # ========================================================
+    # FEED
+    # ========================================================
+    def add(self, records, arrived=None):
+        """Count the samples among `records`, which arrived at `arrived`."""
+        arrived = time.monotonic() if arrived is None else arrived
+        k = 0
+        for rec in records:
+            slot = _slot(rec)
+            if slot is None:
+                continue
+            if self.reference is None:
+                self.reference = slot
+            if slot == self.reference:
+                k += 1
+        if not k:
+            return
+
+        if self.last_arrival is not None:
+            per = (arrived - self.last_arrival) / k
+            keep = (1 - SMOOTHING) ** k
+            if self.interval is None:
+                self.interval = per
+            self.jitter = abs(per - self.interval) + (self.jitter - abs(per - self.interval)) * keep
+            self.interval = per + (self.interval - per) * keep
+
+            if k == 1 and not self.sequence.received and self.expected_period:
+                if per > LATE_FACTOR * self.expected_period:
+                    self.late_dropped += round(per / self.expected_period) - 1
+
+        self.samples += k
+        self.last_arrival = arrived
+
+    def frames(self, frames):
+        """Sequence numbers of a {type: record array} from FrameSplitter."""
+        for arr in frames.values():
+            self.sequence.update(arr["seq"])
+
+    def backlog(self, depth):
+        self.backlog_now = depth
+        self.backlog_peak = max(self.backlog_peak, depth)
+
+    def latency(self, seconds):
+        self.latency_peak = max(self.latency_peak, seconds)
+        if self.latency_avg is None:
+            self.latency_avg = seconds
+        else:
+            self.latency_avg += (seconds - self.latency_avg) * SMOOTHING
+
+    # ========================================================
+    # READ
+    # ========================================================
+    @property
+    def dropped(self):
+        return self.sequence.dropped + self.late_dropped
+
+    def snapshot(self):
+        """Plain dict of the current values (JSON-ready)."""
+        def ms(v):
+            return None if v is None else round(v * 1000, 1)
+
+        return {
+            "samples": self.samples,
+            "expected_period": self.expected_period,
+            "period": None if self.interval is None else round(self.interval, 4),
+            "jitter_ms": ms(self.jitter),
+            "dropped": self.dropped,
+            "backlog": self.backlog_now,
+            "backlog_peak": self.backlog_peak,
+            "latency_ms": ms(self.latency_avg),
+            "latency_peak_ms": ms(self.latency_peak),
+        }
+
+    def format(self):
+        if self.interval is None:
+            return f"{self.samples} samples, waiting for cadence"
+        lat = "--" if self.latency_avg is None else f"{self.latency_avg * 1000:.0f}"
+        return (
+            f"{self.interval:.3f} s/sample (expected {self.expected_period:g}), "
+            f"jitter {self.jitter * 1000:.0f} ms, latency {lat} ms "
+            f"(peak {self.latency_peak * 1000:.0f}), backlog {self.backlog_now} "
+            f"(peak {self.backlog_peak}), dropped {self.dropped}"
+        )
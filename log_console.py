@@ -0,0 +1,184 @@
+import os
+import logging
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+from PyQt6.QtGui import QFont, QKeySequence, QPainter
+from PyQt6.QtWidgets import QAbstractScrollArea, QApplication
+
+
+# Lines kept in memory per console; anything older goes to disk.
+CONSOLE_LINES = 5000
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+SPILL_BYTES = 10 * 1024 * 1024
+SPILL_BACKUPS = 5
+
+
+def spill_logger(name):
+    """Rotating file logger that receives lines pushed out of a console.
+
+    One file per name, rotated by whichever process writes it, so every tool
+    needs a name of its own: two processes sharing one file lose lines.
+    """
+    safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+    logger = logging.getLogger(f"phloton.console.{safe}")
+
+    if not logger.handlers:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        handler = RotatingFileHandler(
+            os.path.join(LOG_DIR, f"{safe}.log"),
+            maxBytes=SPILL_BYTES, backupCount=SPILL_BACKUPS, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+    return logger
+
+
+# ============================================================
+# LOG CONSOLE
+# ============================================================
+class LogConsole(QAbstractScrollArea):
+    """Drop-in for the read-only QPlainTextEdit log consoles.
+
+    Keeps the last `capacity` lines in a ring buffer and writes older ones
+    to logs/<name>.log (rotated). Only the rows on screen are painted, so
+    memory and append cost stay flat over multi-day sessions.
+    """
+
+    def __init__(self, name="console", capacity=CONSOLE_LINES):
+        super().__init__()
+        self.lines = deque()
+        self.capacity = capacity
+        self.spill = spill_logger(name)
+
+        # selected rows, as indexes into self.lines
+        self.anchor = self.cursor = None
+
+        self.setFont(QFont("Consolas", 9))
+
+    # ========================================================
+    # QPlainTextEdit API
+    # ========================================================
+    def appendPlainText(self, text):
+        lines = text.splitlines()
+        if not lines:
+            return
+
+        bar = self.verticalScrollBar()
+        at_bottom = bar.value() == bar.maximum()
+
+        self.lines.extend(lines)
+        overflow = len(self.lines) - self.capacity
+        if overflow > 0:
+            self.spill.info("\n".join(self.lines.popleft() for _ in range(overflow)))
+            self.shift_selection(overflow)
+
+        self.update_scrollbar()
+        if at_bottom:
+            bar.setValue(bar.maximum())
+        else:
+            # keep the rows the operator is reading in place
+            bar.setValue(bar.value() - max(overflow, 0))
+        self.viewport().update()
+
+    def clear(self):
+        if self.lines:
+            self.spill.info("\n".join(self.lines))
+        self.lines.clear()
+        self.anchor = self.cursor = None
+        self.update_scrollbar()
+        self.viewport().update()
+
+    def setReadOnly(self, _):
+        # always read-only; kept so it can replace QPlainTextEdit as-is
+        pass
+
+    # ========================================================
+    # VIEW
+    # ========================================================
+    def row_height(self):
+        return self.fontMetrics().lineSpacing()
+
+    def visible_rows(self):
+        return max(1, self.viewport().height() // self.row_height())
+
+    def update_scrollbar(self):
+        bar = self.verticalScrollBar()
+        rows = self.visible_rows()
+        bar.setPageStep(rows)
+        bar.setRange(0, max(0, len(self.lines) - rows))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scrollbar()
+
+    def paintEvent(self, _):
+        painter = QPainter(self.viewport())
+        h = self.row_height()
+        ascent = self.fontMetrics().ascent()
+        first = self.verticalScrollBar().value()
+        last = min(len(self.lines), first + self.visible_rows() + 1)
+        sel = self.selection()
+        palette = self.palette()
+
+        for y, row in enumerate(range(first, last)):
+            top = y * h
+            if sel and sel[0] <= row <= sel[1]:
+                painter.fillRect(0, top, self.viewport().width(), h, palette.highlight())
+                painter.setPen(palette.highlightedText().color())
+            else:
+                painter.setPen(palette.text().color())
+            painter.drawText(4, top + ascent, self.lines[row])
+
+    # ========================================================
+    # SELECTION + COPY
+    # ========================================================
+    def selection(self):
+        if self.anchor is None:
+            return None
+        return min(self.anchor, self.cursor), max(self.anchor, self.cursor)
+
+    def shift_selection(self, n):
+        if self.anchor is None:
+            return
+        self.anchor -= n
+        self.cursor -= n
+        if max(self.anchor, self.cursor) < 0:
+            self.anchor = self.cursor = None
+        else:
+            self.anchor = max(self.anchor, 0)
+            self.cursor = max(self.cursor, 0)
+
+    def row_at(self, y):
+        row = self.verticalScrollBar().value() + int(y) // self.row_height()
+        return min(row, len(self.lines) - 1)
+
+    def mousePressEvent(self, event):
+        if not self.lines:
+            return
+        row = self.row_at(event.position().y())
+        if self.anchor is None or not event.modifiers() & event.modifiers().ShiftModifier:
+            self.anchor = row
+        self.cursor = row
+        self.viewport().update()
+
+    def mouseMoveEvent(self, event):
+        if self.anchor is not None:
+            self.cursor = self.row_at(max(0, event.position().y()))
+            self.viewport().update()
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.SelectAll) and self.lines:
+            self.anchor, self.cursor = 0, len(self.lines) - 1
+            self.viewport().update()
+        elif event.matches(QKeySequence.StandardKey.Copy) and self.anchor is not None:
+            lo, hi = self.selection()
+            QApplication.clipboard().setText(
+                "\n".join(self.lines[r] for r in range(lo, hi + 1))
+            )
+        else:
+            super().keyPressEvent(event)
@@ -0,0 +1,190 @@
+"""Monitor many boards at once, without a window or thread per board.
+
+serial_async reads every port on its one loop thread. Each batch is handed
+to a small shared thread pool for decoding, storing and bookkeeping, so a
+slow board or a heavy RAW batch never holds up the reads. A board has at
+most one batch in the pool (credits=1): its batches stay in order, and
+while the pool is busy its lines pile up and arrive later as one batch.
+
+    pool = MonitorPool()
+    pool.listeners.append(lambda board, records, arrived: show(board.snapshot()))
+    pool.error_listeners.append(lambda board, msg: ...)
+    pool.add(port)
+
+Board state belongs to the pool thread working on its batch. Displays get
+a BoardSnapshot of it from a listener (board_monitor hands it to the GUI
+thread through a signal) or print the boards (python monitor_pool.py PORT...).
+"""
+import os
+import sys
+import time
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from adc_convert import RawDecoder, calibration_for
+from ingest_metrics import IngestMetrics
+from serial_async import transport
+from stream_stats import BoardStats
+from telemetry import CHANNELS, Reading, format_reading
+from telemetry_store import STORE_DIR, store_for
+
+
+WORKERS = min(4, os.cpu_count() or 1)
+REMOVE_TIMEOUT = 2.0            # seconds remove() waits for the port to close
+
+# what a display shows of a board: plain copies, safe on any thread
+BoardSnapshot = namedtuple("BoardSnapshot", "port values briefs details ingest metrics")
+
+
+# ============================================================
+# ONE BOARD
+# ============================================================
+class Board:
+    def __init__(self, port, root=STORE_DIR):
+        self.port = port
+        self.store = store_for(port, root)
+        self.decoder = RawDecoder(calibration_for(self.store.board))
+        self.metrics = IngestMetrics()
+        self.stats = BoardStats()
+        self.values = {}            # channel -> Reading or Status
+        self.error = None
+        self.watch = None
+        self.removed = False
+        self.lock = threading.RLock()   # held by the pool thread working on a batch
+
+    def update(self, records):
+        """Keep the latest record per channel; the channels it touched."""
+        changed = set()
+        for rec in records:
+            ch = rec.channel if isinstance(rec, Reading) else rec.name
+            self.values[ch] = rec
+            changed.add(ch)
+        return changed
+
+    def value_text(self, channel):
+        rec = self.values.get(channel)
+        if rec is None:
+            return "--"
+        if isinstance(rec, Reading):
+            return format_reading(rec)
+        return rec.state.title()
+
+    def snapshot(self):
+        """BoardSnapshot of the current values, stats and ingest metrics."""
+        with self.lock:
+            stats = self.stats
+            return BoardSnapshot(
+                self.port,
+                {ch: self.value_text(ch) for ch in self.values},
+                {ch: stats.brief(ch) for ch in stats.channels},
+                {ch: stats.describe(ch) for ch in stats.channels},
+                self.metrics.format(),
+                self.metrics.snapshot(),
+            )
+
+
+# ============================================================
+# POOL
+# ============================================================
+class MonitorPool:
+    def __init__(self, workers=WORKERS, root=STORE_DIR):
+        self.root = root
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="monitor")
+        self.boards = {}            # port -> Board
+        self.listeners = []         # fn(board, records, arrived), on a pool thread
+        self.error_listeners = []   # fn(board, msg), on the serial loop thread
+
+    def add(self, port):
+        if port in self.boards:
+            return self.boards[port]
+
+        board = Board(port, self.root)
+        self.boards[port] = board
+        board.watch = transport().watch(
+            port,
+            lambda text: self._submit(board, board.decoder.feed, text),
+            lambda msg: self._failed(board, msg),
+            credits=1,
+            on_frames=lambda frames: self._submit(board, board.decoder.frames, frames),
+            metrics=board.metrics,
+        )
+        return board
+
+    def remove(self, port, timeout=REMOVE_TIMEOUT):
+        """Stop watching `port`; its batches still queued in the pool are dropped.
+
+        Waits at most `timeout` for the port to close, so a wedged port does
+        not hang the caller (a GUI thread); the loop closes it later.
+        """
+        board = self.boards.pop(port, None)
+        if board:
+            with board.lock:        # lets a batch being worked on finish first
+                board.removed = True
+            board.watch.stop()
+            board.watch.wait(timeout)
+            board.store.close()
+        return board
+
+    def close(self):
+        for port in list(self.boards):
+            self.remove(port)
+        self.executor.shutdown(wait=True)
+
+    # ========================================================
+    # WORK (loop thread -> pool thread)
+    # ========================================================
+    def _submit(self, board, decode, payload):
+        if board.removed:
+            return
+        # the loop thread is inside the watch callback: arrived is this batch's
+        arrived = board.watch.arrived if board.watch else time.monotonic()
+        self.executor.submit(self._work, board, decode, payload, arrived)
+
+    def _work(self, board, decode, payload, arrived):
+        try:
+            with board.lock:
+                if board.removed:
+                    return
+                records = decode(payload)
+                board.metrics.add(records, arrived)
+                board.stats.add(records, arrived)
+                board.store.add(records, arrived)
+                board.update(records)
+                for listener in self.listeners:
+                    listener(board, records, arrived)
+                board.metrics.latency(time.monotonic() - arrived)
+        finally:
+            board.watch.ack()
+
+    def _failed(self, board, msg):
+        board.error = msg
+        for listener in self.error_listeners:
+            listener(board, msg)
+
+
+# ============================================================
+# MAIN (headless)
+# ============================================================
+def print_boards(pool, out=sys.stdout):
+    for board in list(pool.boards.values()):
+        snap = board.snapshot()
+        print(f"{board.port}: {board.error or snap.ingest}", file=out)
+        for ch in CHANNELS:
+            value = snap.values.get(ch, "--")
+            print(f"    {ch:<10} {value:>12}   {snap.briefs.get(ch, '')}", file=out)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("usage: monitor_pool.py PORT [PORT...]")
+
+    pool = MonitorPool()
+    for port in sys.argv[1:]:
+        pool.add(port)
+    try:
+        while True:
+            time.sleep(1)
+            print_boards(pool)
+    except KeyboardInterrupt:
+        pool.close()
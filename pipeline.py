@@ -0,0 +1,220 @@
+"""The flash-and-verify pipeline, with no GUI attached.
+
+    chip detect -> flash -> reconnect -> MAC / telemetry verify
+
+The Qt workers in Automation_code run the first two steps for the windows;
+flash_cli.py runs all four for one port or a rack of them. Nothing here
+imports PyQt. Output goes to an `on_line(str)` callback, progress to
+`on_progress(int)`.
+"""
+import os
+import re
+import time
+
+import serial
+
+from chip_cache import ChipInfo, cache
+from firmware_index import FirmwareError, bundle_for
+from flashing import changed_images, run_esptool, write_flash_adaptive
+from image_cache import prebuild
+from serial_io import LineReader, open_port
+from stream_stats import BoardStats
+from telemetry import Reading, parse_line
+
+
+DETECT_TIMEOUT = 5.0
+
+# after the post-flash hard reset: how long the board gets to come back,
+# and how long it is then listened to
+RECONNECT_TIMEOUT = 10.0
+RECONNECT_POLL = 0.2
+VERIFY_SECONDS = 5.0
+
+MAC_MARKER = "Device MAC ID"
+
+_MAC = re.compile(r"([0-9a-fA-F]{2}(?::[0-9a-fA-F]{2}){5})")
+
+
+def _quiet(*_):
+    pass
+
+
+# ============================================================
+# CHIP DETECT
+# ============================================================
+def detect_chip(port, on_line=_quiet, cancel=None):
+    """ChipInfo(chip, mac) from esptool chip_id, or None. Fills the chip cache."""
+    lines = []
+
+    def collect(line):
+        lines.append(line)
+        on_line(line)
+
+    run_esptool(["--port", port, "chip_id"], collect, timeout=DETECT_TIMEOUT, cancel=cancel)
+    if cancel and cancel.is_set():
+        return None
+
+    out = "\n".join(lines).lower()
+    if "esp32-s3" in out:
+        chip = "esp32s3"
+    elif "esp32-s2" in out:
+        chip = "esp32s2"
+    elif "esp32" in out:
+        chip = "esp32"
+    else:
+        return None
+
+    m = re.search(r"mac:\s*" + _MAC.pattern, out)
+    mac = m.group(1) if m else ""
+    cache().put(port, chip, mac)
+    return ChipInfo(chip, mac)
+
+
+# ============================================================
+# FLASH
+# ============================================================
+def flash_firmware(port, chip, firmware, on_line=_quiet, on_progress=None, diff=False,
+                   cancel=None):
+    """Flash the bundle around `firmware` to `port`; True on success.
+
+    With `diff`, regions whose on-device digest already matches are skipped.
+    """
+    # bootloader + partition files, from the index of the firmware folder
+    try:
+        bundle = bundle_for(firmware)
+        prebuild(bundle)
+    except (FirmwareError, OSError) as e:
+        on_line(f"ERROR: {e}")
+        return False
+
+    for art in bundle:
+        on_line(f"{os.path.basename(art.path)}  sha256 {art.sha256[:16]}")
+
+    images = bundle.images()
+
+    try:
+        if diff:
+            images = changed_images(port, chip, images, on_line, cancel=cancel)
+            if not images:
+                on_line("Flash already matches the firmware, nothing to write")
+                if on_progress:
+                    on_progress(100)
+                return True
+
+        code = write_flash_adaptive(port, chip, images, on_line, on_progress, cancel)
+    except OSError as e:
+        on_line(f"ERROR: could not run esptool: {e}")
+        code = -1
+    return code == 0
+
+
+# ============================================================
+# RECONNECT + VERIFY
+# ============================================================
+def reconnect(port, timeout=RECONNECT_TIMEOUT):
+    """The port reopened once the board is back from its reset, or None."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return open_port(port)
+        except serial.SerialException:
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(RECONNECT_POLL)
+
+
+def verify_board(port, mac="", seconds=VERIFY_SECONDS, on_line=_quiet):
+    """Listen to the freshly flashed firmware for `seconds`.
+
+    Returns {"reconnected", "device_mac", "mac_match", "telemetry", "stats"},
+    where telemetry holds the last reading of every channel seen and stats
+    their stream_stats summaries. mac_match is None when either side did
+    not report a MAC.
+    """
+    result = {"reconnected": False, "device_mac": None, "mac_match": None, "telemetry": {},
+              "stats": {}}
+    stats = BoardStats()
+
+    deadline = time.monotonic() + RECONNECT_TIMEOUT + seconds
+    ser = reconnect(port, RECONNECT_TIMEOUT)
+    if ser is None:
+        return result
+    result["reconnected"] = True
+
+    listen_until = time.monotonic() + seconds
+    reader = LineReader(ser)
+    try:
+        while time.monotonic() < listen_until:
+            try:
+                lines = reader.read_lines(min(0.5, max(0.0, listen_until - time.monotonic())))
+            except serial.SerialException:
+                # native USB boards drop off once more while the app boots
+                ser.close()
+                ser = reconnect(port, max(0.0, deadline - time.monotonic()))
+                if ser is None:
+                    break
+                reader = LineReader(ser)
+                continue
+
+            for line in lines:
+                on_line(line)
+                if line.startswith(MAC_MARKER):
+                    m = _MAC.search(line)
+                    result["device_mac"] = m.group(1).lower() if m else ""
+                records = parse_line(line)
+                stats.add(records)
+                for r in records:
+                    if isinstance(r, Reading):
+                        result["telemetry"][r.channel] = r.value
+    finally:
+        if ser is not None:
+            ser.close()
+
+    result["stats"] = stats.summary()
+    if mac and result["device_mac"]:
+        result["mac_match"] = result["device_mac"] == mac.lower()
+    return result
+
+
+# ============================================================
+# WHOLE PIPELINE
+# ============================================================
+def run_board(port, firmware, diff=True, verify=True, verify_seconds=VERIFY_SECONDS,
+              on_line=_quiet):
+    """Detect, flash and verify one board; a JSON-ready result dict."""
+    start = time.monotonic()
+    result = {"port": port, "chip": None, "mac": None, "flashed": False, "ok": False,
+              "error": None}
+
+    try:
+        known = cache().get(port) or detect_chip(port, on_line)
+        if known is None:
+            result["error"] = "chip detect failed"
+            return result
+        result["chip"], result["mac"] = known.chip, known.mac or None
+
+        result["flashed"] = flash_firmware(port, known.chip, firmware, on_line, diff=diff)
+        if not result["flashed"]:
+            result["error"] = "flash failed"
+            return result
+
+        if verify:
+            result.update(verify_board(port, known.mac, verify_seconds, on_line))
+            if not result["reconnected"]:
+                result["error"] = "board did not come back after reset"
+            elif result["mac_match"] is False:
+                result["error"] = "MAC mismatch"
+            elif result["device_mac"] is None and not result["telemetry"]:
+                result["error"] = "no MAC or telemetry from firmware"
+
+        result["ok"] = result["error"] is None
+        return result
+    except OSError as e:
+        result["error"] = str(e)
+        return result
+    except Exception as e:
+        # anything else is still this board's failure, not the whole run's
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+    finally:
+        result["seconds"] = round(time.monotonic() - start, 2)
@@ -0,0 +1,492 @@
+"""One asyncio event loop that services every open serial port.
+
+The QThread readers (one thread per port, each blocked in read()) are
+replaced by a single loop thread. Each port's fd is registered with the
+loop. Bytes are framed into lines as they arrive and handed out in
+batches, on the same BATCH_INTERVAL/BATCH_LINES schedule as LineBatcher.
+
+Back-pressure: a port buffers at most MAX_PENDING lines and frame reads.
+Past that, its fd is taken off the loop until the consumer catches up, so a
+stalled consumer makes the kernel/USB buffers fill rather than this
+process's memory.
+Qt consumers hold at most MAX_IN_FLIGHT undelivered batches; while the GUI
+is behind, lines pile up in the port buffer and go out as bigger batches.
+
+    # asyncio code
+    stream = await transport().open(port)
+    line = await stream.readline(timeout=2.0)
+
+    # Qt windows: same shape as the old SerialReader threads
+    self.reader = serial_reader(port)
+    self.reader.data.connect(self.log.appendPlainText)
+    self.reader.start()
+    ...
+    self.reader.stop(); self.reader.wait()
+
+Boards sending binary frames (telemetry_frames) are detected per read:
+the frames are split off before line framing and handed out as record
+arrays next to the text batches (on_frames / the `frames` signal).
+
+Every read is stamped with its arrival time (time.monotonic()), and each
+watch keeps an ingest_metrics.IngestMetrics: backlog and frame sequence
+gaps are counted here, latency when the Qt bridge's consumer is done.
+
+On Windows a serial handle cannot join a selector, so each port there is
+read by a blocking read() on a reader thread of its own, one thread per
+port as before, behind the same API.
+"""
+import os
+import sys
+import asyncio
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ingest_metrics import IngestMetrics
+from serial_io import BATCH_INTERVAL, BATCH_LINES, READ_TIMEOUT, open_port
+from telemetry_frames import SYNC, FrameSplitter, merge
+
+
+MAX_PENDING = 20000
+RESUME_PENDING = MAX_PENDING // 2
+MAX_IN_FLIGHT = 4
+READ_CHUNK = 4096
+
+USE_FD = os.name == "posix"
+
+
+# ============================================================
+# LINE STREAM (one port, lives on the loop)
+# ============================================================
+class LineStream:
+    def __init__(self, loop, ser):
+        self.loop = loop
+        self.ser = ser
+        self.port = ser.port
+        self.error = None           # why the stream closed, if not close()
+
+        self._buf = bytearray()
+        self._lines = deque()
+        self._stamps = deque()      # [lines, arrival time] per read, for _lines
+        self._frames = deque()      # (FrameSplitter output, arrival time)
+        self._splitter = None       # made on the first sync byte seen
+        self._waiter = None
+        self._paused = False
+        self._closed = False
+        self._fd = None
+        self._reader_task = None
+        self._reader = None         # Windows: this port's own read thread
+        self.batch_arrived = None   # arrival of the first line read_batch() returned
+        self.frames_arrived = None  # arrival of the first frame take_frames() returned
+
+        if USE_FD:
+            self._fd = ser.fileno()
+            loop.add_reader(self._fd, self._on_readable)
+        else:
+            # not the loop's default executor: that is shared with open(), and
+            # ports would queue behind each other's READ_TIMEOUT reads
+            self._reader = ThreadPoolExecutor(1, thread_name_prefix=f"serial-read {self.port}")
+            self._reader_task = loop.create_task(self._read_blocking())
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def pending(self):
+        return len(self._lines) + len(self._frames)
+
+    # ========================================================
+    # INPUT
+    # ========================================================
+    def _on_readable(self):
+        try:
+            data = os.read(self._fd, READ_CHUNK)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._fail(e)
+            return
+        if not data:
+            self._fail(EOFError("port closed"))
+            return
+        self._feed(data)
+
+    async def _read_blocking(self):
+        while not self._closed:
+            try:
+                data = await self.loop.run_in_executor(self._reader, self._blocking_read)
+            except Exception as e:
+                self._fail(e)
+                return
+            if data:
+                self._feed(data)
+            while self._paused and not self._closed:
+                await asyncio.sleep(BATCH_INTERVAL)
+
+    def _blocking_read(self):
+        self.ser.timeout = READ_TIMEOUT
+        return self.ser.read(self.ser.in_waiting or 1)
+
+    def _feed(self, data):
+        now = time.monotonic()
+        if self._splitter is None and SYNC[0] in data:
+            self._splitter = FrameSplitter()
+        if self._splitter is not None:
+            data, frames = self._splitter.feed(data)
+            if frames:
+                self._frames.append((frames, now))
+                self._wake()
+
+        self._buf += data
+        if b"\n" in data:
+            *raw_lines, rest = self._buf.split(b"\n")
+            self._buf = bytearray(rest)
+            count = len(self._lines)
+            for raw in raw_lines:
+                line = raw.decode(errors="ignore").strip()
+                if line:
+                    self._lines.append(line)
+            if len(self._lines) > count:
+                self._stamps.append([len(self._lines) - count, now])
+                self._wake()
+
+        # frames count too: a binary-only board must pause like a text one
+        if self.pending() >= MAX_PENDING:
+            self._pause()
+
+    def _pause(self):
+        if not self._paused:
+            self._paused = True
+            if self._fd is not None:
+                self.loop.remove_reader(self._fd)
+
+    def _resume(self):
+        if self._paused and not self._closed and self.pending() <= RESUME_PENDING:
+            self._paused = False
+            if self._fd is not None:
+                self.loop.add_reader(self._fd, self._on_readable)
+
+    def _wake(self):
+        if self._waiter and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _fail(self, exc):
+        if not self._closed:
+            self.error = exc
+            self.close()
+
+    # ========================================================
+    # CONSUMER SIDE
+    # ========================================================
+    def _take_lines(self, n):
+        """Pop `n` lines; sets batch_arrived to the first one's arrival."""
+        self.batch_arrived = self._stamps[0][1] if n else None
+        batch = [self._lines.popleft() for _ in range(n)]
+        while n:
+            stamp = self._stamps[0]
+            used = min(n, stamp[0])
+            stamp[0] -= used
+            n -= used
+            if not stamp[0]:
+                self._stamps.popleft()
+        return batch
+
+    async def _wait(self, timeout):
+        if self._closed:
+            return
+        self._waiter = self.loop.create_future()
+        try:
+            await asyncio.wait_for(self._waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._waiter = None
+
+    async def readline(self, timeout=None):
+        """Next line, or None on timeout or once the stream has closed."""
+        deadline = None if timeout is None else self.loop.time() + timeout
+        while not self._lines and not self._closed:
+            left = None if deadline is None else deadline - self.loop.time()
+            if left is not None and left <= 0:
+                break
+            await self._wait(left)      # frames arriving wake this too
+        if not self._lines:
+            return None
+        line, = self._take_lines(1)
+        self._resume()
+        return line
+
+    async def read_batch(self, interval=BATCH_INTERVAL, max_lines=BATCH_LINES):
+        """Lines arriving within `interval` of the first, at most `max_lines`.
+
+        Waits for the first line or frame; returns [] once the stream has
+        closed, or when only frames arrived (see take_frames()).
+        """
+        while not self._lines and not self._frames:
+            if self._closed:
+                return []
+            await self._wait(None)
+
+        deadline = self.loop.time() + interval
+        while len(self._lines) < max_lines and not self._closed:
+            left = deadline - self.loop.time()
+            if left <= 0:
+                break
+            await self._wait(left)
+
+        n = min(max_lines, len(self._lines))
+        batch = self._take_lines(n)
+        self._resume()
+        return batch
+
+    def take_frames(self):
+        """{type: record array} of every frame received so far, or None."""
+        if not self._frames:
+            return None
+        self.frames_arrived = self._frames[0][1]
+        batches = [frames for frames, _ in self._frames]
+        self._frames.clear()
+        self._resume()
+        return merge(batches)
+
+    def write(self, data):
+        self.ser.write(data)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._fd is not None and not self._paused:
+            self.loop.remove_reader(self._fd)
+        if self._reader_task:
+            try:
+                self.ser.cancel_read()
+            except Exception:
+                pass
+        try:
+            self.ser.close()
+        except Exception:
+            pass
+        if self._reader:
+            self._reader.shutdown(wait=False)
+        self._wake()
+
+
+# ============================================================
+# TRANSPORT (the loop thread)
+# ============================================================
+class Watch:
+    """A port being pumped into a callback; see SerialTransport.watch()."""
+
+    def __init__(self, transport, port, metrics=None):
+        self.transport = transport
+        self.port = port
+        self.metrics = metrics or IngestMetrics()
+        self.arrived = None             # arrival time of the batch being delivered
+        self.stream = None
+        self.done = None                # concurrent Future, set by watch()
+        self._in_flight = 0
+        self._credit = None             # asyncio.Event, made on the loop
+        self._stopping = False
+
+    def ack(self):
+        """The consumer finished a batch (thread-safe)."""
+        self.transport.loop.call_soon_threadsafe(self._acked)
+
+    def _acked(self):
+        self._in_flight = max(0, self._in_flight - 1)
+        self._credit.set()
+
+    def stop(self):
+        """Close the port; returns at once, wait() for it to be closed."""
+        self._stopping = True
+
+        def close():
+            if self.stream:
+                self.stream.close()
+            if self._credit:
+                self._credit.set()
+
+        self.transport.loop.call_soon_threadsafe(close)
+
+    def wait(self, timeout=None):
+        try:
+            self.done.result(timeout)
+        except Exception:
+            pass
+        return self.done.done()
+
+
+class SerialTransport:
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="serial-loop")
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        """Run `coro` on the loop from any thread; a concurrent Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def open(self, port, baud=115200):
+        ser = await self.loop.run_in_executor(None, open_port, port, baud)
+        return LineStream(self.loop, ser)
+
+    def watch(self, port, on_batch, on_error=None, baud=115200, credits=None, on_frames=None,
+              metrics=None):
+        """Open `port` and call on_batch(text) with each newline-joined batch.
+
+        Binary frames go to on_frames({type: record array}), or are dropped
+        without it. Callbacks run on the loop thread, with Watch.arrived set
+        to the batch's arrival time. With `credits`, at most that many
+        callbacks are made before Watch.ack() is called for one.
+        """
+        w = Watch(self, port, metrics)
+        self.pump(w, on_batch, on_error, baud, credits, on_frames)
+        return w
+
+    def pump(self, w, on_batch, on_error=None, baud=115200, credits=None, on_frames=None):
+        """watch() for a Watch the caller made, so callbacks that use it can
+        run before this returns."""
+        w.done = self.submit(self._pump(w, on_batch, on_error, baud, credits, on_frames))
+
+    async def _pump(self, w, on_batch, on_error, baud, credits, on_frames):
+        w._credit = asyncio.Event()
+        try:
+            w.stream = await self.open(port=w.port, baud=baud)
+        except Exception as e:
+            if on_error:
+                on_error(f"Could not open {w.port}: {e}")
+            return
+
+        stream = w.stream
+        if w._stopping:
+            stream.close()
+        try:
+            while True:
+                if credits is not None:
+                    while w._in_flight >= credits and not stream.closed:
+                        w._credit.clear()
+                        await w._credit.wait()
+
+                batch = await stream.read_batch()
+                frames = stream.take_frames()
+                if (not batch and not frames) or w._stopping:
+                    break
+                w.metrics.backlog(stream.pending())
+                if batch:
+                    w._in_flight += 1
+                    w.arrived = stream.batch_arrived
+                    on_batch("\n".join(batch))
+                if frames:
+                    w.metrics.frames(frames)
+                    if on_frames:
+                        w._in_flight += 1
+                        w.arrived = stream.frames_arrived
+                        on_frames(frames)
+        finally:
+            stream.close()
+            if stream.error and on_error and not w._stopping:
+                on_error(f"{w.port}: {stream.error}")
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def transport():
+    """The process-wide SerialTransport, started on first use."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = SerialTransport()
+        return _transport
+
+
+# ============================================================
+# QT BRIDGE
+# ============================================================
+_reader_classes = {}
+
+
+def serial_reader(port, parent=None, baud=115200):
+    """QObject with data(str)/frames(object)/error(str) signals for one port, delivered on the GUI thread.
+
+    start()/stop()/wait() mirror the QThread readers it replaces. Works with
+    whichever of PyQt6/PyQt5 the calling tool has imported.
+
+    `metrics` is the port's IngestMetrics. Call track(records) from a data or
+    frames slot to count the samples at the batch's arrival time.
+    """
+    qt = sys.modules.get("PyQt6.QtCore") or sys.modules.get("PyQt5.QtCore")
+    if qt is None:
+        raise RuntimeError("serial_reader() needs PyQt6 or PyQt5 imported first")
+
+    cls = _reader_classes.get(qt.__name__)
+    if cls is None:
+        cls = type("SerialLines", (qt.QObject,), {
+            "data": qt.pyqtSignal(str),
+            "frames": qt.pyqtSignal(object),
+            "error": qt.pyqtSignal(str),
+            "start": _reader_start,
+            "stop": _reader_stop,
+            "wait": _reader_wait,
+            "arrived": _reader_arrived,
+            "track": _reader_track,
+        })
+        _reader_classes[qt.__name__] = cls
+
+    reader = cls(parent)
+    reader.port = port
+    reader.baud = baud
+    reader.watch = None
+    reader.metrics = IngestMetrics()
+    reader._arrivals = deque()      # arrival times of emitted, unhandled batches
+    return reader
+
+
+def _reader_start(self):
+    def deliver(signal):
+        def emit(payload):
+            # loop thread; appended before the emit so the slot can see it
+            self._arrivals.append(self.watch.arrived)
+            signal.emit(payload)
+        return emit
+
+    def done(_):
+        # runs on the GUI thread after the tool's own slots: frees a credit
+        arrived = self._arrivals.popleft()
+        self.metrics.latency(time.monotonic() - arrived)
+        self.watch.ack()
+
+    # slot and watch first: a batch can be delivered before pump() returns,
+    # and one emitted with `done` unconnected would never give back its credit
+    self.data.connect(done)
+    self.frames.connect(done)
+    self.watch = Watch(transport(), self.port, self.metrics)
+    transport().pump(
+        self.watch, deliver(self.data), self.error.emit, self.baud, credits=MAX_IN_FLIGHT,
+        on_frames=deliver(self.frames),
+    )
+
+
+def _reader_stop(self):
+    if self.watch:
+        self.watch.stop()
+
+
+def _reader_wait(self, timeout=2.0):
+    return self.watch.wait(timeout) if self.watch else True
+
+
+def _reader_arrived(self):
+    """Arrival time of the batch being handled (inside a data/frames slot)."""
+    return self._arrivals[0] if self._arrivals else time.monotonic()
+
+
+def _reader_track(self, records):
+    self.metrics.add(records, self.arrived())
@@ -0,0 +1,166 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import serial
+
+
+# Upper bound on a single blocking read. stop() wakes the reader through
+# cancel_read(), so this only matters on drivers that cannot cancel.
+READ_TIMEOUT = 0.5
+
+# A batch is handed to the UI once it is this old or this long, whichever
+# comes first. One signal + one appendPlainText per batch instead of per line.
+BATCH_INTERVAL = 0.05
+BATCH_LINES = 500
+
+# What the firmware prints at boot, and how long a port gets to print it.
+BOARD_MARKERS = ("Enter option number", "Device MAC ID")
+PROBE_TIMEOUT = 2.0
+PROBE_POLL = 0.1
+
+
+def open_port(port, baud=115200):
+    return serial.Serial(port, baud, timeout=READ_TIMEOUT)
+
+
+# ============================================================
+# LINE READER
+# ============================================================
+class LineReader:
+    """Blocks in the OS until bytes arrive, then returns every complete line.
+
+    Replaces the `if ser.in_waiting: ser.readline()` loops, which spin a
+    core at 100% while the board is quiet.
+    """
+
+    def __init__(self, ser):
+        self.ser = ser
+        self.buf = bytearray()
+
+    def read_lines(self, timeout=READ_TIMEOUT):
+        if self.ser.timeout != timeout:
+            self.ser.timeout = timeout
+
+        # read(1) sleeps until the first byte (or the timeout), then we
+        # take whatever else the driver already buffered in the same call
+        chunk = self.ser.read(self.ser.in_waiting or 1)
+        if not chunk:
+            return []
+
+        self.buf += chunk
+        if b"\n" not in chunk:
+            return []
+
+        *raw_lines, rest = self.buf.split(b"\n")
+        self.buf = bytearray(rest)
+
+        lines = []
+        for raw in raw_lines:
+            line = raw.decode(errors="ignore").strip()
+            if line:
+                lines.append(line)
+        return lines
+
+    def cancel(self):
+        """Wake a read_lines() blocked in another thread."""
+        try:
+            self.ser.cancel_read()
+        except Exception:
+            pass
+
+
+# ============================================================
+# LINE BATCHER
+# ============================================================
+class LineBatcher:
+    """Collects lines until the batch is BATCH_INTERVAL old or BATCH_LINES long.
+
+    Reader loop:
+
+        lines = reader.read_lines(batcher.wait_time())
+        batcher.extend(lines)
+        if batcher.due():
+            self.data.emit(batcher.take())
+    """
+
+    def __init__(self, interval=BATCH_INTERVAL, max_lines=BATCH_LINES):
+        self.interval = interval
+        self.max_lines = max_lines
+        self.lines = []
+        self.first_at = None
+
+    def extend(self, lines):
+        if lines and not self.lines:
+            self.first_at = time.monotonic()
+        self.lines.extend(lines)
+
+    def wait_time(self):
+        """How long the next read may block without delaying this batch."""
+        if not self.lines:
+            return READ_TIMEOUT
+        return max(0.0, self.interval - (time.monotonic() - self.first_at))
+
+    def due(self):
+        return bool(self.lines) and (
+            len(self.lines) >= self.max_lines or self.wait_time() == 0.0
+        )
+
+    def take(self):
+        """The batch as one newline-joined string, ready for appendPlainText."""
+        text = "\n".join(self.lines)
+        self.lines = []
+        return text
+
+
+# ============================================================
+# BOARD AUTO-DETECTION
+# ============================================================
+def probe_port(port, markers=BOARD_MARKERS, timeout=PROBE_TIMEOUT, stop=None):
+    """True if `port` prints a line containing one of `markers` in time.
+
+    Opening the port resets an ESP32 through DTR/RTS, so the boot banner
+    follows. Gives up early once `stop` is set.
+    """
+    with open_port(port) as ser:
+        ser.reset_input_buffer()
+        reader = LineReader(ser)
+        deadline = time.monotonic() + timeout
+
+        while not (stop and stop.is_set()):
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return False
+            for line in reader.read_lines(min(left, PROBE_POLL)):
+                if any(m in line for m in markers):
+                    return True
+    return False
+
+
+def find_board(ports, markers=BOARD_MARKERS, timeout=PROBE_TIMEOUT, on_skip=None):
+    """Probe every port at once; return the first one that answers, or None.
+
+    The other probes are told to stop as soon as one port matches and
+    close their ports in the background. `on_skip(port, exc)` is called
+    for ports that could not be opened.
+    """
+    if not ports:
+        return None
+
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=len(ports))
+    futures = {pool.submit(probe_port, p, markers, timeout, stop): p for p in ports}
+
+    try:
+        for fut in as_completed(futures):
+            port = futures[fut]
+            try:
+                if fut.result():
+                    return port
+            except Exception as e:
+                if on_skip:
+                    on_skip(port, e)
+        return None
+    finally:
+        stop.set()
+        pool.shutdown(wait=False)
@@ -7,6 +7,14 @@ from PyQt5.QtWidgets import (
     QVBoxLayout, QLabel, QPushButton, QComboBox, QMessageBox
 )
 
+from adc_convert import RawDecoder, calibration_for
+from device_watcher import bind_combo
+from serial_async import serial_reader
+from stream_stats import BoardStats
+from telemetry import REFRESH_INTERVAL_MS, LatestReadings, format_reading
+from telemetry_store import store_for
+from trend_plot import trend_plot
+
 
 class BoardTester(QMainWindow):
     def __init__(self):
@@ -14,8 +22,6 @@ class BoardTester(QMainWindow):
         self.setWindowTitle("Phloton Control Board - Temperature Monitor")
         self.resize(1000, 500)
 
-        self.ser = None
-
         # Main layout
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -55,19 +61,38 @@ class BoardTester(QMainWindow):
 
         central_widget.setLayout(layout)
 
-        # Timer
+        # telemetry channel -> label
+        self.readings = {
+            "Ambient": self.ambient_label,
+            "Cold Sink": self.coldsink_label,
+            "Heat Sink": self.heatsink_label,
+            "Flask Top": self.flashtop_label,
+        }
+
+        # rolling chart of the same channels
+        self.plot = trend_plot(self.readings)
+        layout.addWidget(self.plot, 1)
+
+        # cadence, jitter, latency, backlog and drops of the serial stream
+        self.ingest_label = QLabel("Ingest: ---")
+        layout.addWidget(self.ingest_label)
+
+        # Readings are drained in the background (serial_async) as fast as
+        # the board prints; the labels repaint at most every REFRESH_INTERVAL_MS
+        self.reader = None
+        self.store = None
+        self.latest = LatestReadings()
+        self.stats = BoardStats()
         self.timer = QTimer()
-        self.timer.timeout.connect(self.read_serial_data)
+        self.timer.timeout.connect(self.refresh_readings)
 
         # Button actions
         self.connect_button.clicked.connect(self.connect_serial)
         self.start_button.clicked.connect(self.start_reading)
         self.stop_button.clicked.connect(self.stop_reading)
 
-        # Auto-refresh ports every few seconds
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.refresh_ports)
-        self.refresh_timer.start(3000)
+        # Follow ports as they are plugged and unplugged
+        self.port_events = bind_combo(self.port_combo)
 
     def refresh_ports(self):
         """List available COM ports."""
@@ -83,15 +108,40 @@ class BoardTester(QMainWindow):
 
     def connect_serial(self):
         port_name = self.port_combo.currentText()
-        try:
-            self.ser = serial.Serial(port_name, 115200, timeout=1)
-            self.status_label.setText(f"Status: Connected to {port_name}")
-        except Exception as e:
-            QMessageBox.critical(self, "Connection Error", str(e))
+        if self.reader:
+            self.reader.stop()
+            self.reader.wait()
+            self.reader.deleteLater()
+
+        if self.store:
+            self.store.close()
+
+        self.reader = serial_reader(port_name, self)
+        self.store = store_for(port_name)
+        self.decoder = RawDecoder(calibration_for(self.store.board))
+        self.stats = BoardStats()
+        self.reader.data.connect(self.handle_data)
+        self.reader.frames.connect(self.handle_frames)
+        self.reader.error.connect(self.serial_error)
+        self.reader.start()
+        self.status_label.setText(f"Status: Connected to {port_name}")
+
+    def from_current_reader(self):
+        """False in a slot for a reader that a reconnect or error has replaced."""
+        return self.reader is not None and self.sender() is self.reader
+
+    def serial_error(self, msg):
+        if not self.from_current_reader():
+            return
+        self.timer.stop()
+        self.reader.deleteLater()
+        self.reader = None
+        self.status_label.setText("Status: Serial Error")
+        QMessageBox.critical(self, "Connection Error", msg)
 
     def start_reading(self):
-        if self.ser and self.ser.is_open:
-            self.timer.start(1000)
+        if self.reader:
+            self.timer.start(REFRESH_INTERVAL_MS)
             self.status_label.setText("Status: Reading Data...")
         else:
             QMessageBox.warning(self, "Warning", "Please connect to a COM port first.")
@@ -100,26 +150,31 @@ class BoardTester(QMainWindow):
         self.timer.stop()
         self.status_label.setText("Status: Stopped")
 
-    def read_serial_data(self):
-        if not self.ser or not self.ser.is_open:
-            return
-        try:
-            line = self.ser.readline().decode("utf-8", errors="ignore").strip()
-            if not line:
-                return
-            print(line)  # debug output
-            # Parse example: "25.32°C | 23.98°C | 26.45°C | 25.12°C"
-            if "°C" in line:
-                parts = [p.strip().replace("°C", "") for p in line.split("|")]
-                if len(parts) == 4:
-                    self.ambient_label.setText(f"Ambient: {parts[0]} °C")
-                    self.coldsink_label.setText(f"Cold Sink: {parts[1]} °C")
-                    self.heatsink_label.setText(f"Heat Sink: {parts[2]} °C")
-                    self.flashtop_label.setText(f"Flask Top: {parts[3]} °C")
-        except Exception as e:
-            print("Serial Read Error:", e)
-            self.status_label.setText("Status: Serial Error")
-            self.timer.stop()
+    def handle_data(self, text):
+        if self.from_current_reader():
+            self.handle_records(self.decoder.feed(text))
+
+    def handle_frames(self, frames):
+        if self.from_current_reader():
+            self.handle_records(self.decoder.frames(frames))
+
+    def handle_records(self, records):
+        self.reader.track(records)
+        self.stats.add(records, self.reader.arrived())
+        self.latest.add(records)
+        self.store.add(records, self.reader.arrived())
+        self.plot.add(records)
+
+    def refresh_readings(self):
+        for rec in self.latest.take_changed():
+            if rec.channel in self.readings:
+                label = self.readings[rec.channel]
+                label.setText(
+                    f"{rec.channel}: {format_reading(rec)}   ({self.stats.brief(rec.channel)})"
+                )
+                label.setToolTip(self.stats.describe(rec.channel))
+        if self.reader:
+            self.ingest_label.setText(f"Ingest: {self.reader.metrics.format()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,253 @@
+"""Constant-memory running statistics for each telemetry channel.
+
+Every statistic updates in O(1) per sample and no raw series is kept, so a
+station can follow dozens of boards for days at a fixed cost:
+
+    mean, std       Welford's online algorithm
+    min, max
+    ewma            exponentially weighted mean, EWMA_ALPHA per sample
+    slope           least-squares slope over the last SLOPE_WINDOW seconds of
+                    data, from SLOPE_BUCKETS time buckets of running sums
+    p5, p50, p95    P-square quantile estimators (Jain & Chlamtac), 5 markers each
+
+    stats = BoardStats()
+    stats.add(records, arrived)             # Readings from parse_lines() & co
+    stats["Heat Sink"].mean, stats["Heat Sink"].slope()
+    label.setText(stats.brief("Heat Sink"))
+"""
+import math
+import time
+
+from telemetry import DECIMALS, UNITS, Reading
+
+
+EWMA_ALPHA = 0.1            # ~10 samples: 10 s at the firmware's 1 Hz
+SLOPE_WINDOW = 300.0        # seconds
+SLOPE_BUCKETS = 30
+QUANTILES = (0.05, 0.5, 0.95)
+
+
+# ============================================================
+# P-SQUARE QUANTILE
+# ============================================================
+class P2Quantile:
+    """Streaming estimate of the p-quantile from five markers."""
+
+    def __init__(self, p):
+        self.p = p
+        self.q = []                             # marker heights
+        self.n = [1, 2, 3, 4, 5]                # marker positions
+        self.want = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+        self.step = [0, p / 2, p, (1 + p) / 2, 1]
+
+    def add(self, x):
+        q, n = self.q, self.n
+        if len(q) < 5:
+            q.append(x)
+            if len(q) == 5:
+                q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.want[i] += self.step[i]
+
+        for i in (1, 2, 3):
+            d = self.want[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                h = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < h < q[i + 1]:
+                    h = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = h
+                n[i] += d
+
+    def value(self):
+        if len(self.q) == 5:
+            return self.q[2]
+        if not self.q:
+            return math.nan
+        s = sorted(self.q)
+        return s[round(self.p * (len(s) - 1))]
+
+
+# ============================================================
+# SLIDING SLOPE
+# ============================================================
+class SlopeWindow:
+    """Least-squares slope of the last `span` seconds, in value units per second.
+
+    Samples go into `buckets` time buckets of running sums (n, t, v, t*t,
+    t*v, with t from the bucket start), so memory is fixed and adding a
+    sample is O(1). Reading shifts the live buckets to one origin and
+    combines them.
+    """
+
+    def __init__(self, span=SLOPE_WINDOW, buckets=SLOPE_BUCKETS):
+        self.width = span / buckets
+        self.ids = [None] * buckets             # absolute bucket number held
+        self.sums = [[0, 0.0, 0.0, 0.0, 0.0] for _ in range(buckets)]
+        self.latest = None
+
+    def add(self, t, v):
+        k = int(t // self.width)
+        i = k % len(self.ids)
+        s = self.sums[i]
+        if self.ids[i] != k:
+            self.ids[i] = k
+            s[:] = [0, 0.0, 0.0, 0.0, 0.0]
+        dt = t - k * self.width
+        s[0] += 1
+        s[1] += dt
+        s[2] += v
+        s[3] += dt * dt
+        s[4] += dt * v
+        if self.latest is None or k > self.latest:
+            self.latest = k
+
+    def slope(self):
+        if self.latest is None:
+            return math.nan
+        n = st = sv = stt = stv = 0.0
+        oldest = self.latest - len(self.ids)
+        for k, (c, t, v, tt, tv) in zip(self.ids, self.sums):
+            if k is None or k <= oldest:
+                continue
+            d = (k - self.latest) * self.width  # bucket start, from the newest one's
+            n += c
+            st += t + c * d
+            sv += v
+            stt += tt + 2 * d * t + c * d * d
+            stv += tv + d * v
+        den = n * stt - st * st
+        if n < 2 or den <= 1e-12 * n * n:
+            return math.nan
+        return (n * stv - st * sv) / den
+
+
+# ============================================================
+# ONE CHANNEL
+# ============================================================
+class ChannelStats:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.ewma = math.nan
+        self.trend = SlopeWindow()
+        self.quantiles = {p: P2Quantile(p) for p in QUANTILES}
+
+    def add(self, t, v):
+        if v != v:
+            return
+        self.count += 1
+        d = v - self.mean
+        self.mean += d / self.count
+        self._m2 += d * (v - self.mean)
+        if v < self.min:
+            self.min = v
+        if v > self.max:
+            self.max = v
+        self.ewma = v if self.count == 1 else self.ewma + EWMA_ALPHA * (v - self.ewma)
+        self.trend.add(t, v)
+        for est in self.quantiles.values():
+            est.add(v)
+
+    @property
+    def std(self):
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def slope(self):
+        """Units per second over the last SLOPE_WINDOW seconds."""
+        return self.trend.slope()
+
+    def quantile(self, p):
+        return self.quantiles[p].value()
+
+    def summary(self, decimals=4):
+        """Plain dict of the current values (JSON-ready; None for NaN)."""
+        def r(x):
+            return None if x != x or math.isinf(x) else round(x, decimals)
+
+        out = {
+            "count": self.count, "mean": r(self.mean), "std": r(self.std),
+            "min": r(self.min), "max": r(self.max), "ewma": r(self.ewma),
+            "slope_per_min": r(self.slope() * 60),
+        }
+        for p in QUANTILES:
+            out[f"p{p * 100:g}"] = r(self.quantile(p))
+        return out
+
+
+# ============================================================
+# ONE BOARD
+# ============================================================
+class BoardStats:
+    """ChannelStats per channel, made as channels first appear."""
+
+    def __init__(self):
+        self.channels = {}
+
+    def __getitem__(self, channel):
+        return self.channels[channel]
+
+    def __contains__(self, channel):
+        return channel in self.channels
+
+    def add(self, records, t=None):
+        t = time.monotonic() if t is None else t
+        for rec in records:
+            if isinstance(rec, Reading):
+                stats = self.channels.get(rec.channel)
+                if stats is None:
+                    stats = self.channels[rec.channel] = ChannelStats()
+                stats.add(t, rec.value)
+
+    def summary(self):
+        return {ch: stats.summary() for ch, stats in self.channels.items()}
+
+    def brief(self, channel):
+        """One-line mean/std/slope, e.g. "mean 25.10 sd 0.21, +0.02 °C/min"."""
+        s = self.channels.get(channel)
+        if s is None:
+            return ""
+        dec = DECIMALS.get(channel, 3)
+        slope = s.slope() * 60
+        trend = "--" if slope != slope else f"{slope:+.{dec}f}"
+        return f"mean {s.mean:.{dec}f} sd {s.std:.{dec}f}, {trend} {UNITS.get(channel, '')}/min"
+
+    def describe(self, channel):
+        """Every statistic of `channel`, one per line (for tooltips)."""
+        s = self.channels.get(channel)
+        if s is None:
+            return ""
+        dec = DECIMALS.get(channel, 3)
+        unit = UNITS.get(channel, "")
+        slope = s.slope() * 60
+        lines = [
+            f"samples  {s.count}",
+            f"mean     {s.mean:.{dec}f} {unit}",
+            f"std      {s.std:.{dec}f} {unit}",
+            f"min/max  {s.min:.{dec}f} / {s.max:.{dec}f} {unit}",
+            f"ewma     {s.ewma:.{dec}f} {unit}",
+            f"slope    {'--' if slope != slope else f'{slope:+.{dec}f}'} {unit}/min "
+            f"(last {SLOPE_WINDOW:g} s)",
+        ]
+        lines += [f"p{p * 100:<7g}{s.quantile(p):.{dec}f} {unit}" for p in QUANTILES]
+        return "\n".join(lines)
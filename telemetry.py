@@ -0,0 +1,117 @@
+"""Telemetry line parser shared by the flash tools and the board monitors.
+
+Every format the firmware prints is folded into one precompiled regex, so a
+line costs one scan whatever it contains:
+
+    Ambient: 25.10°C                      Integrated_code (old loop)
+    Ambient -> Temp: 25.10 °C             printTemperature()
+    Ambient -> Thermistor disconnected!   printTemperature()
+    25.10°C | 6.20°C | 40.00°C | 12.00°C  Thermistor
+    Current CSFAN: 0.120 A                also HSFAN and CurrentISNS
+    Voltage: 12.000 V
+    LID OPEN / LID CLOSED
+    CHARGER:CONNECTED / CHARGER:DISCONNECTED
+"""
+import re
+from collections import namedtuple
+
+
+TEMPS = ("Ambient", "Cold Sink", "Heat Sink", "Flask Top")
+CURRENTS = ("CSFAN", "HSFAN", "ISNS")
+CHANNELS = TEMPS + CURRENTS + ("Voltage",)
+
+UNITS = dict.fromkeys(TEMPS, "°C")
+UNITS.update(dict.fromkeys(CURRENTS, "A"), Voltage="V")
+
+# decimals the firmware prints each channel with
+DECIMALS = dict.fromkeys(TEMPS, 2)
+DECIMALS.update(dict.fromkeys(CURRENTS, 3), Voltage=3)
+
+# channel -> float, unit is UNITS[channel]
+Reading = namedtuple("Reading", "channel value")
+
+# LID -> OPEN/CLOSED, CHARGER -> CONNECTED/..., <thermistor> -> DISCONNECTED
+Status = namedtuple("Status", "name state")
+
+
+_NUM = r"-?\d+(?:\.\d+)?"
+_DEG = r"[^|\d]*"       # "°C", " °C", or whatever survived errors="ignore"
+_TEMP_NAMES = "|".join(TEMPS)
+
+_LINE = re.compile("|".join([
+    rf"(?P<temp>(?P<t_name>{_TEMP_NAMES})(?:\s*->\s*Temp)?:\s*(?P<t_val>{_NUM}))",
+    rf"(?P<temp_fault>(?P<f_name>{_TEMP_NAMES})\s*->\s*Thermistor disconnected)",
+    rf"(?P<current>Current\s*(?P<c_name>CSFAN|HSFAN|ISNS):\s*(?P<c_val>{_NUM}))",
+    rf"(?P<voltage>Voltage:\s*(?P<v_val>{_NUM}))",
+    rf"(?P<pipe>(?P<p0>{_NUM}){_DEG}\|\s*(?P<p1>{_NUM}){_DEG}\|"
+    rf"\s*(?P<p2>{_NUM}){_DEG}\|\s*(?P<p3>{_NUM}))",
+    r"(?P<lid>LID (?P<lid_state>OPEN|CLOSED))",
+    r"(?P<charger>CHARGER:(?P<charger_state>\w+))",
+]))
+
+
+def parse_line(line):
+    """Records found in one line of firmware output (usually 0 or 1)."""
+    m = _LINE.search(line)
+    if not m:
+        return []
+
+    kind = m.lastgroup
+    if kind == "temp":
+        return [Reading(m["t_name"], float(m["t_val"]))]
+    if kind == "current":
+        return [Reading(m["c_name"], float(m["c_val"]))]
+    if kind == "voltage":
+        return [Reading("Voltage", float(m["v_val"]))]
+    if kind == "pipe":
+        return [Reading(name, float(m[f"p{i}"])) for i, name in enumerate(TEMPS)]
+    if kind == "temp_fault":
+        return [Status(m["f_name"], "DISCONNECTED")]
+    if kind == "lid":
+        return [Status("LID", m["lid_state"])]
+    return [Status("CHARGER", m["charger_state"])]
+
+
+def parse_lines(text):
+    """parse_line over every line of a (batched) chunk of text."""
+    records = []
+    for line in text.splitlines():
+        records += parse_line(line)
+    return records
+
+
+def format_reading(r):
+    return f"{r.value:.{DECIMALS[r.channel]}f} {UNITS[r.channel]}"
+
+
+# ============================================================
+# LATEST READINGS
+# ============================================================
+# how often a monitor window repaints its readings, however fast lines arrive
+REFRESH_INTERVAL_MS = 100
+
+
+class LatestReadings:
+    """Latest value per channel, fed whole batches of lines.
+
+    Every batch the board prints is fed in as it arrives; the UI takes
+    only the channels that changed since its last refresh, so the repaint
+    cost is fixed by REFRESH_INTERVAL_MS rather than by the line rate.
+    """
+
+    def __init__(self):
+        self.values = {}        # channel -> Reading
+        self._changed = set()
+
+    def add(self, records):
+        for rec in records:
+            if isinstance(rec, Reading):
+                self.values[rec.channel] = rec
+                self._changed.add(rec.channel)
+
+    def feed(self, text):
+        self.add(parse_lines(text))
+
+    def take_changed(self):
+        changed, self._changed = self._changed, set()
+        return [self.values[ch] for ch in changed]
@@ -0,0 +1,188 @@
+"""Binary telemetry frames, and pulling them out of a mixed text/binary stream.
+
+With BINARY_FRAMES set, the firmware sends each telemetry sample as one
+frame instead of text lines (status lines such as "LID OPEN" stay text):
+
+    offset  size
+    0       2     sync  A5 5A
+    2       1     type  TYPE_READINGS / TYPE_RAW
+    3       2     seq   uint16 LE, +1 per frame, wraps
+    5       1     len   payload bytes
+    6       len   payload: float32 x 8 (readings) or uint16 x 8 (raw counts),
+                  little-endian, in telemetry.CHANNELS order; NaN = no reading
+    6+len   2     CRC-16/CCITT-FALSE of type..payload (binascii.crc_hqx, 0xFFFF)
+
+A readings frame is 40 bytes against ~215 for the text block, and
+decoding is a CRC check plus np.frombuffer over the receive buffer, with no
+parsing.
+
+FrameSplitter takes bytes as they arrive from the port. It returns the text
+between frames (to be split into lines as before) and the frames as NumPy
+record arrays that view the received bytes. A stream that never contains
+the sync byte costs one `in` test per read.
+"""
+import struct
+import binascii
+
+import numpy as np
+
+from telemetry import CHANNELS, TEMPS, Reading, Status
+
+
+SYNC = b"\xa5\x5a"
+HEADER = struct.Struct("<2sBHB")        # sync, type, seq, len
+CRC = struct.Struct("<H")
+
+TYPE_READINGS = 0x01
+TYPE_RAW = 0x02
+
+_N = len(CHANNELS)
+
+DTYPES = {
+    TYPE_READINGS: np.dtype([
+        ("sync", "V2"), ("type", "u1"), ("seq", "<u2"), ("len", "u1"),
+        ("values", "<f4", (_N,)), ("crc", "<u2"),
+    ]),
+    TYPE_RAW: np.dtype([
+        ("sync", "V2"), ("type", "u1"), ("seq", "<u2"), ("len", "u1"),
+        ("counts", "<u2", (_N,)), ("crc", "<u2"),
+    ]),
+}
+PAYLOAD_SIZE = {t: dt.itemsize - HEADER.size - CRC.size for t, dt in DTYPES.items()}
+MAX_FRAME = max(dt.itemsize for dt in DTYPES.values())
+
+
+def crc16(data):
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+def encode(ftype, seq, values):
+    """One frame, as the firmware sends it (for fake boards and tests)."""
+    fmt = "<%df" % _N if ftype == TYPE_READINGS else "<%dH" % _N
+    payload = struct.pack(fmt, *values)
+    body = HEADER.pack(SYNC, ftype, seq & 0xFFFF, len(payload))[2:] + payload
+    return SYNC + body + CRC.pack(crc16(body))
+
+
+# ============================================================
+# SPLITTER
+# ============================================================
+class FrameSplitter:
+    """Separates binary frames from text in a byte stream."""
+
+    def __init__(self):
+        self.buf = b""
+        self.bad_frames = 0         # sync + header seen, CRC or length wrong
+
+    def feed(self, data):
+        """(text bytes, {type: record array}) for the bytes read so far.
+
+        Incomplete frames are held back until the rest arrives.
+        """
+        raw = self.buf + data if self.buf else bytes(data)
+        if SYNC[0] not in raw:
+            self.buf = b""
+            return raw, {}
+
+        view = memoryview(raw)
+        n = len(raw)
+        text = []
+        runs = []                   # [type, first offset, count]
+        i = 0
+        while True:
+            j = raw.find(SYNC, i)
+            if j < 0:
+                # a trailing A5 may be the first half of the next sync
+                keep = n - 1 if raw[-1] == SYNC[0] else n
+                text.append(view[i:keep])
+                i = keep
+                break
+            if j > i:
+                text.append(view[i:j])
+            if j + HEADER.size > n:
+                i = j
+                break
+
+            _, ftype, _, length = HEADER.unpack_from(raw, j)
+            if PAYLOAD_SIZE.get(ftype) != length:
+                self.bad_frames += 1
+                text.append(view[j:j + 1])
+                i = j + 1
+                continue
+
+            end = j + HEADER.size + length + CRC.size
+            if end > n:
+                i = j
+                break
+            if crc16(view[j + 2:end - 2]) != CRC.unpack_from(raw, end - 2)[0]:
+                self.bad_frames += 1
+                text.append(view[j:j + 1])
+                i = j + 1
+                continue
+
+            last = runs[-1] if runs else None
+            if last and last[0] == ftype and last[1] + last[2] * (end - j) == j:
+                last[2] += 1
+            else:
+                runs.append([ftype, j, 1])
+            i = end
+
+        self.buf = raw[i:]
+        return b"".join(text), self._arrays(raw, runs)
+
+    @staticmethod
+    def _arrays(raw, runs):
+        parts = {}
+        for ftype, offset, count in runs:
+            parts.setdefault(ftype, []).append(
+                np.frombuffer(raw, DTYPES[ftype], count, offset)
+            )
+        return {t: p[0] if len(p) == 1 else np.concatenate(p) for t, p in parts.items()}
+
+
+def merge(batches):
+    """One {type: record array} from several feed() results."""
+    if len(batches) == 1:
+        return batches[0]
+    parts = {}
+    for frames in batches:
+        for ftype, arr in frames.items():
+            parts.setdefault(ftype, []).append(arr)
+    return {t: p[0] if len(p) == 1 else np.concatenate(p) for t, p in parts.items()}
+
+
+# ============================================================
+# DECODING
+# ============================================================
+class SequenceCounter:
+    """Dropped frames, from the gaps in their sequence numbers."""
+
+    def __init__(self):
+        self.last = None
+        self.received = 0
+        self.dropped = 0
+
+    def update(self, seq):
+        seq = np.asarray(seq, np.int64)
+        if not len(seq):
+            return 0
+        prev = np.concatenate(([seq[0] - 1 if self.last is None else self.last], seq[:-1]))
+        gaps = (seq - prev - 1) & 0xFFFF
+        gaps[seq == 0] = 0          # the board restarted
+        lost = int(gaps.sum())
+        self.last = int(seq[-1])
+        self.received += len(seq)
+        self.dropped += lost
+        return lost
+
+
+def readings(values):
+    """Readings (and thermistor Statuses for NaN) from an (n, 8) float array."""
+    records = []
+    for row in values.tolist():
+        for ch, v in zip(CHANNELS, row):
+            if v == v:
+                records.append(Reading(ch, v))
+            elif ch in TEMPS:
+                records.append(Status(ch, "DISCONNECTED"))
+    return records
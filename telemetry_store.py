@@ -0,0 +1,271 @@
+"""Append-only columnar store for every telemetry reading the monitors see.
+
+Each board gets a folder under logs/telemetry/, keyed by its USB identity
+(chip_cache.device_key), and each monitor session adds a segment:
+
+    logs/telemetry/<board>/<start_ms>/meta.json       t0, port
+    logs/telemetry/<board>/<start_ms>/<channel>.f32   float32 values
+    logs/telemetry/<board>/<start_ms>/<channel>.dt    uint32 ms since the previous sample
+
+Both columns are raw little-endian arrays, appended about once a second,
+so a week at 1 Hz on all eight channels is ~39 MB and loads with two
+np.memmap calls per channel. Timestamps are the arrival time of the batch
+a line came in (serial_io.BATCH_INTERVAL resolution), on a monotonic clock
+anchored at t0. A channel read k times in one batch (fast or RAW streams)
+gets k even steps from its previous sample up to that arrival, as in
+ingest_metrics.
+
+    store = store_for(port)          # writer, one per monitored port
+    store.add(records, reader.arrived())    # in the reader's data slot
+
+    series = load(board, "Heat Sink")   # Series(t, values), needs numpy
+
+Writing needs only the standard library; numpy is imported for loading.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import weakref
+from array import array
+from collections import namedtuple
+
+from telemetry import CHANNELS, Reading, parse_lines
+
+
+# next to log_console's logs/ (not imported from there: it pulls in PyQt6)
+STORE_DIR = os.environ.get(
+    "PHLOTON_TELEMETRY_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs", "telemetry"),
+)
+
+FLUSH_INTERVAL = 1.0
+MAX_DELTA_MS = 0xFFFFFFFF       # a longer gap starts a new segment
+
+VALUE_EXT = ".f32"
+DELTA_EXT = ".dt"
+
+Series = namedtuple("Series", "t values")
+
+
+def safe_name(name):
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+
+
+def _column(values, typecode):
+    col = array(typecode, values)
+    if sys.byteorder == "big":
+        col.byteswap()
+    return col.tobytes()
+
+
+# ============================================================
+# WRITER
+# ============================================================
+class TelemetryStore:
+    """Writer for one board. Not thread-safe: feed it from one thread."""
+
+    def __init__(self, board, port=None, root=STORE_DIR):
+        self.board = board
+        self.port = port
+        self.dir = os.path.join(root, safe_name(board))
+        self.segment = None
+
+        self._pending = {}          # channel -> ([delta_ms], [value])
+        self._last_ms = {}          # channel -> ms of its last sample
+        self._flushed_at = time.monotonic()
+        self._new_segment()
+        _open_stores.add(self)
+
+    def _new_segment(self):
+        self.flush()
+        self.t0 = time.time()
+        self._mono0 = time.monotonic()
+        start_ms = int(self.t0 * 1000)
+
+        os.makedirs(self.dir, exist_ok=True)
+        while True:
+            path = os.path.join(self.dir, str(start_ms))
+            try:
+                os.mkdir(path)
+                break
+            except FileExistsError:
+                start_ms += 1
+
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"board": self.board, "port": self.port, "t0": start_ms / 1000}, f)
+        self.segment = path
+        self._t0_ms = start_ms
+        self._last_ms = {}
+
+    def _now_ms(self, mono=None):
+        mono = time.monotonic() if mono is None else mono
+        return self._t0_ms + int((mono - self._mono0) * 1000)
+
+    def append(self, channel, value, now_ms=None):
+        now_ms = self._now_ms() if now_ms is None else now_ms
+        delta = max(0, now_ms - self._last_ms.get(channel, self._t0_ms))
+        if delta > MAX_DELTA_MS:
+            self._new_segment()
+            now_ms = self._now_ms()
+            delta = now_ms - self._t0_ms
+
+        self._last_ms[channel] = now_ms
+        deltas, values = self._pending.setdefault(channel, ([], []))
+        deltas.append(delta)
+        values.append(value)
+
+    def add(self, records, arrived=None):
+        """Store the Readings among parsed telemetry records.
+
+        `arrived` is the batch's arrival time (time.monotonic(), e.g.
+        reader.arrived() or Watch.arrived); now if not given.
+        """
+        now_ms = self._now_ms(arrived)
+        by_channel = {}
+        for rec in records:
+            if isinstance(rec, Reading):
+                by_channel.setdefault(rec.channel, []).append(rec.value)
+
+        for channel, values in by_channel.items():
+            last = self._last_ms.get(channel)
+            if len(values) == 1 or last is None or last >= now_ms:
+                for v in values:
+                    self.append(channel, v, now_ms)
+                continue
+            step = (now_ms - last) / len(values)
+            for i, v in enumerate(values, 1):
+                self.append(channel, v, last + round(step * i))
+        if time.monotonic() - self._flushed_at >= FLUSH_INTERVAL:
+            self.flush()
+
+    def feed(self, text, arrived=None):
+        """Parse a batch of lines and store its readings."""
+        self.add(parse_lines(text), arrived)
+
+    def flush(self):
+        self._flushed_at = time.monotonic()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        for channel, (deltas, values) in pending.items():
+            base = os.path.join(self.segment, safe_name(channel))
+            # values first: a torn write leaves extra values, which load() trims
+            with open(base + VALUE_EXT, "ab") as f:
+                f.write(_column(values, "f"))
+            with open(base + DELTA_EXT, "ab") as f:
+                f.write(_column(deltas, "I"))
+
+    def close(self):
+        self.flush()
+        _open_stores.discard(self)
+
+
+_open_stores = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    for store in list(_open_stores):
+        try:
+            store.flush()
+        except OSError:
+            pass
+
+
+def store_for(port, root=STORE_DIR):
+    """A TelemetryStore for the board currently on `port`."""
+    from chip_cache import device_key
+
+    return TelemetryStore(device_key(port), port, root)
+
+
+# ============================================================
+# READING
+# ============================================================
+def boards(root=STORE_DIR):
+    try:
+        return sorted(os.listdir(root))
+    except OSError:
+        return []
+
+
+def segments(board, root=STORE_DIR):
+    """Segment folders of `board`, oldest first."""
+    path = os.path.join(root, safe_name(board))
+    try:
+        names = [n for n in os.listdir(path) if n.isdigit()]
+    except OSError:
+        return []
+    return [os.path.join(path, n) for n in sorted(names, key=int)]
+
+
+def _count(path):
+    try:
+        return os.path.getsize(path) // 4
+    except OSError:
+        return 0
+
+
+def _map(path, dtype, n):
+    import numpy as np
+
+    if n == 0:
+        return np.empty(0, dtype)
+    return np.memmap(path, dtype, "r", shape=(n,))
+
+
+def load_segment(segment, channel):
+    """Series for one channel of one segment; values are memory-mapped."""
+    import numpy as np
+
+    with open(os.path.join(segment, "meta.json")) as f:
+        t0 = json.load(f)["t0"]
+
+    base = os.path.join(segment, safe_name(channel))
+    n = min(_count(base + VALUE_EXT), _count(base + DELTA_EXT))
+    values = _map(base + VALUE_EXT, "<f4", n)
+    deltas = _map(base + DELTA_EXT, "<u4", n)
+    t = t0 + np.cumsum(deltas, dtype=np.int64) / 1000.0
+    return Series(t, values)
+
+
+def load(board, channel, root=STORE_DIR):
+    """Series(t, values) for one channel over all of a board's segments.
+
+    `t` is float64 epoch seconds, `values` float32. With a single segment
+    the values are a read-only memmap.
+    """
+    import numpy as np
+
+    parts = [load_segment(seg, channel) for seg in segments(board, root)]
+    parts = [p for p in parts if len(p.values)]
+    if not parts:
+        return Series(np.empty(0), np.empty(0, "<f4"))
+    if len(parts) == 1:
+        return parts[0]
+    return Series(
+        np.concatenate([p.t for p in parts]),
+        np.concatenate([p.values for p in parts]),
+    )
+
+
+def load_board(board, root=STORE_DIR):
+    """{channel: Series} for every channel the board has samples of."""
+    found = {}
+    for channel in CHANNELS:
+        series = load(board, channel, root)
+        if len(series.values):
+            found[channel] = series
+    return found
+
+
+if __name__ == "__main__":
+    # summary of what is on disk: python telemetry_store.py [board ...]
+    for board in sys.argv[1:] or boards():
+        print(board)
+        for channel, s in load_board(board).items():
+            span = (s.t[-1] - s.t[0]) / 3600 if len(s.t) > 1 else 0.0
+            print(f"  {channel:10} {len(s.values):>10} samples  {span:8.2f} h  "
+                  f"min {s.values.min():.3f}  max {s.values.max():.3f}")
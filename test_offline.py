@@ -0,0 +1,201 @@
+"""Offline checks for the flash and telemetry helpers; no board needed.
+
+    python -m pytest -q test_offline.py
+
+esptool is replaced by fake_esptool.py (see its docstring).
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+import flashing
+from burn_in import RollingWindow
+from telemetry import Reading, Status, parse_line, parse_lines
+from telemetry_frames import TYPE_RAW, TYPE_READINGS, FrameSplitter, encode
+
+
+FAKE_ESPTOOL = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_esptool.py")
+
+
+# ============================================================
+# ESPTOOL
+# ============================================================
+@pytest.fixture
+def fake_esptool(tmp_path, monkeypatch):
+    monkeypatch.setattr(flashing, "USE_ENGINE", False)
+    monkeypatch.setenv("PHLOTON_ESPTOOL", f'"{sys.executable}" "{FAKE_ESPTOOL}"')
+    monkeypatch.setenv("FAKE_ESPTOOL_FLASH", str(tmp_path))
+    monkeypatch.setenv("FAKE_ESPTOOL_KBPS", "100000")
+    for name in ("FAKE_ESPTOOL_FAIL", "FAKE_ESPTOOL_BAUD", "FAKE_ESPTOOL_CHIP"):
+        monkeypatch.delenv(name, raising=False)
+
+    images = []
+    for addr, size in ((flashing.BOOTLOADER_ADDR, 0x5000), (flashing.APP_ADDR, 0x20000)):
+        path = tmp_path / f"{addr:#x}.bin"
+        path.write_bytes(os.urandom(size))
+        images.append((addr, str(path)))
+    return images
+
+
+def flash(images, baud=flashing.FLASH_BAUD):
+    lines, percents = [], []
+    code = flashing.run_esptool(
+        flashing.write_flash_args("/dev/fake0", "esp32s3", images, baud),
+        lines.append, flashing.FlashProgress(images), percents.append,
+    )
+    return code, lines, percents
+
+
+def test_write_flash_progress(fake_esptool):
+    code, lines, percents = flash(fake_esptool)
+
+    assert code == 0
+    assert "Hash of data verified." in lines
+    assert percents == sorted(percents)
+    assert percents[-1] == 100
+    # the bootloader is 0x5000 of 0x25000 bytes: the bar does not restart at the app
+    assert 0 < percents[len(percents) // 2] < 100
+
+
+def test_write_flash_failure(fake_esptool, monkeypatch):
+    monkeypatch.setenv("FAKE_ESPTOOL_FAIL", "write")
+    code, lines, percents = flash(fake_esptool)
+
+    assert code == 2
+    assert lines[-1].startswith("A fatal error occurred:")
+    assert percents[-1] < 100
+
+
+def test_changed_images(fake_esptool):
+    assert flashing.changed_images("/dev/fake0", "esp32s3", fake_esptool, lambda _: None) \
+        == fake_esptool
+    assert flash(fake_esptool)[0] == 0
+    assert flashing.changed_images("/dev/fake0", "esp32s3", fake_esptool, lambda _: None) == []
+
+
+def test_output_sink_splits_carriage_returns():
+    lines, percents = [], []
+    progress = type("Progress", (), {"update": staticmethod(
+        lambda line: 50 if "Writing" in line else None)})()
+    sink = flashing.OutputSink(lines.append, progress, percents.append)
+
+    sink.feed(b"Connecting...\nWriting at 0x00010000... (5")
+    sink.feed(b"0 %)\rWriting at 0x00010000... (50 %)\r")
+    sink.feed(b"Leaving...")
+    sink.flush()
+
+    assert lines == ["Connecting...", "Writing at 0x00010000... (50 %)",
+                     "Writing at 0x00010000... (50 %)", "Leaving..."]
+    assert percents == [50]
+
+
+def test_flash_progress_v5_format(tmp_path):
+    boot, app = tmp_path / "boot.bin", tmp_path / "app.bin"
+    boot.write_bytes(bytes(1000))
+    app.write_bytes(bytes(3000))
+    progress = flashing.FlashProgress([(0x0, str(boot)), (0x10000, str(app))])
+
+    assert progress.update("Writing at 0x00000000 [=====>      ]  50.0%") == 12
+    assert progress.update("Writing at 0x00010000... (50 %)") == 62
+    assert progress.update("Hash of data verified.") is None
+
+
+# ============================================================
+# TELEMETRY TEXT
+# ============================================================
+@pytest.mark.parametrize("line, records", [
+    ("Ambient: 25.10°C", [Reading("Ambient", 25.1)]),
+    ("Heat Sink -> Temp: 40.00 °C", [Reading("Heat Sink", 40.0)]),
+    ("Cold Sink -> Thermistor disconnected!", [Status("Cold Sink", "DISCONNECTED")]),
+    ("Current HSFAN: 0.250 A", [Reading("HSFAN", 0.25)]),
+    ("Current CSFAN: -0.001 A", [Reading("CSFAN", -0.001)]),
+    ("Voltage: 12.000 V", [Reading("Voltage", 12.0)]),
+    ("25.10°C | 6.20°C | 40.00°C | 12.00°C", [
+        Reading("Ambient", 25.1), Reading("Cold Sink", 6.2),
+        Reading("Heat Sink", 40.0), Reading("Flask Top", 12.0),
+    ]),
+    ("LID OPEN", [Status("LID", "OPEN")]),
+    ("CHARGER:DISCONNECTED", [Status("CHARGER", "DISCONNECTED")]),
+    ("ets Jun  8 2016 00:22:57", []),
+    ("", []),
+])
+def test_parse_line(line, records):
+    assert parse_line(line) == records
+
+
+def test_parse_lines_batch():
+    text = "Ambient: 25.10°C\r\nboot noise\nVoltage: 11.5 V"
+    assert parse_lines(text) == [Reading("Ambient", 25.1), Reading("Voltage", 11.5)]
+
+
+# ============================================================
+# BINARY FRAMES
+# ============================================================
+def test_frame_splitter_round_trip():
+    values = [[25.0 + i, 6.0, 40.0, 12.0, 0.1, 0.2, 0.3, 12.0] for i in range(3)]
+    counts = list(range(100, 108))
+    stream = (b"boot\n" + encode(TYPE_READINGS, 1, values[0])
+              + encode(TYPE_READINGS, 2, values[1]) + b"Voltage: 12.000 V\n"
+              + encode(TYPE_READINGS, 3, values[2]) + encode(TYPE_RAW, 4, counts))
+
+    splitter = FrameSplitter()
+    text, frames = b"", []
+    for i in range(0, len(stream), 7):          # arbitrary read boundaries
+        t, f = splitter.feed(stream[i:i + 7])
+        text += t
+        frames.append(f)
+
+    assert text == b"boot\nVoltage: 12.000 V\n"
+    assert splitter.buf == b""
+    assert splitter.bad_frames == 0
+    readings = np.concatenate([f[TYPE_READINGS] for f in frames if TYPE_READINGS in f])
+    assert readings["seq"].tolist() == [1, 2, 3]
+    assert np.allclose(readings["values"], values)
+    raw = [f[TYPE_RAW] for f in frames if TYPE_RAW in f]
+    assert raw[0]["counts"].tolist() == [counts]
+
+
+def test_frame_splitter_rejects_bad_crc():
+    frame = bytearray(encode(TYPE_READINGS, 7, [1.0] * 8))
+    frame[-1] ^= 0xFF
+    splitter = FrameSplitter()
+
+    text, frames = splitter.feed(bytes(frame) + b"LID OPEN\n")
+
+    assert frames == {}
+    assert splitter.bad_frames == 1
+    assert text.endswith(b"LID OPEN\n")
+
+
+# ============================================================
+# ROLLING WINDOW
+# ============================================================
+def test_rolling_window_stats():
+    w = RollingWindow(span=10)
+    for t, v in enumerate([5.0, 1.0, 9.0, 3.0]):
+        w.push(t, v)
+
+    assert w.stat("mean") == 4.5
+    assert w.stat("min") == 1.0
+    assert w.stat("max") == 9.0
+
+
+def test_rolling_window_expires_old_samples():
+    w = RollingWindow(span=2)
+    for t, v in enumerate([1.0, 100.0, 4.0, 6.0, 5.0]):
+        w.push(t, v)
+
+    # t=2..4 remain: 4, 6, 5
+    assert w.stat("mean") == 5.0
+    assert w.stat("min") == 4.0
+    assert w.stat("max") == 6.0
+
+
+def test_rolling_window_single_sample_after_gap():
+    w = RollingWindow(span=5)
+    w.push(0, 10.0)
+    w.push(100, 2.0)
+
+    assert (w.stat("mean"), w.stat("min"), w.stat("max")) == (2.0, 2.0, 2.0)
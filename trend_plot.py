@@ -0,0 +1,230 @@
+"""Live rolling charts of the telemetry channels, one lane per channel.
+
+Each channel keeps its history in a NumPy Ring. A frame never draws more
+than two points per pixel column: the samples on screen are min/max
+decimated to the plot width first, so the paint cost depends on the widget
+size, not on how many hours of data are behind it.
+
+Repaints are driven by a FRAME_MS timer, not by incoming data. A frame
+that takes longer than the budget makes the next ones be skipped, so a slow
+station PC drops frames instead of falling behind the serial data.
+
+    self.plot = trend_plot(CHANNELS)
+    layout.addWidget(self.plot)
+    self.plot.add(parse_lines(text))
+
+The mouse wheel zooms the time span. Works with whichever of PyQt6/PyQt5
+the calling tool has imported.
+"""
+import sys
+import time
+import importlib
+
+import numpy as np
+
+from telemetry import CHANNELS, Reading, format_reading, parse_lines
+
+
+HISTORY = 1 << 16           # samples kept per channel: 18 h at 1 Hz
+WINDOW_SECONDS = 600.0      # time span on screen at start
+MIN_WINDOW = 10.0
+MAX_WINDOW = 7 * 24 * 3600.0
+FRAME_MS = 50               # at most 20 repaints a second
+IDLE_FRAME_MS = 1000        # scroll this often when no data arrives
+
+LABEL_WIDTH = 170
+LINE_COLOR = "#1565c0"
+GRID_COLOR = "#d0d0d0"
+TEXT_COLOR = "#1e1e1e"
+
+
+# ============================================================
+# RING BUFFER
+# ============================================================
+class Ring:
+    """Fixed-size (time, value) history with a zero-copy ordered view.
+
+    Every sample is written twice, at i and i + capacity, so the newest
+    `size` samples are always one contiguous slice.
+    """
+
+    def __init__(self, capacity=HISTORY):
+        self.capacity = capacity
+        self.t = np.zeros(2 * capacity)
+        self.v = np.zeros(2 * capacity, np.float32)
+        self.head = 0
+        self.size = 0
+
+    def append(self, t, value):
+        i, j = self.head, self.head + self.capacity
+        self.t[i] = self.t[j] = t
+        self.v[i] = self.v[j] = value
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def clear(self):
+        self.head = self.size = 0
+
+    def view(self):
+        """(t, values), oldest first; views into the buffer, not copies."""
+        end = self.head + (self.capacity if self.size == self.capacity else 0)
+        return self.t[end - self.size:end], self.v[end - self.size:end]
+
+
+def minmax_decimate(t, v, t0, t1, width):
+    """Samples of [t0, t1] reduced to a min and a max per pixel column.
+
+    Returns (x, y) in time/value units, at most 2 * width points, keeping
+    every spike that a plain subsample would drop.
+    """
+    lo, hi = np.searchsorted(t, (t0, t1))
+    t, v = t[lo:hi], v[lo:hi]
+    if len(t) <= 2 * width:
+        return t, v
+
+    cols = ((t - t0) * (width / (t1 - t0))).astype(np.intp)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(cols)) + 1))
+
+    x = np.repeat(t[starts], 2)
+    y = np.empty(len(x), np.float32)
+    y[0::2] = np.minimum.reduceat(v, starts)
+    y[1::2] = np.maximum.reduceat(v, starts)
+    return x, y
+
+
+# ============================================================
+# QT WIDGET
+# ============================================================
+_plot_classes = {}
+
+
+def trend_plot(channels=CHANNELS, parent=None):
+    """A QWidget with one rolling chart lane per channel; see the module doc."""
+    qt = sys.modules.get("PyQt6.QtCore") or sys.modules.get("PyQt5.QtCore")
+    if qt is None:
+        raise RuntimeError("trend_plot() needs PyQt6 or PyQt5 imported first")
+
+    binding = qt.__name__.split(".")[0]
+    cls = _plot_classes.get(binding)
+    if cls is None:
+        cls = _plot_classes[binding] = _make_plot_class(
+            qt,
+            importlib.import_module(f"{binding}.QtGui"),
+            importlib.import_module(f"{binding}.QtWidgets"),
+        )
+    return cls(channels, parent)
+
+
+def _make_plot_class(QtCore, QtGui, QtWidgets):
+    def polyline(x, y):
+        # fill a QPolygonF through its buffer instead of n QPointF objects
+        poly = QtGui.QPolygonF()
+        poly.fill(QtCore.QPointF(), len(x))
+        buf = poly.data()
+        buf.setsize(16 * len(x))
+        pts = np.frombuffer(buf, np.float64).reshape(-1, 2)
+        pts[:, 0] = x
+        pts[:, 1] = y
+        return poly
+
+    class TrendPlot(QtWidgets.QWidget):
+        def __init__(self, channels, parent=None):
+            super().__init__(parent)
+            self.channels = list(channels)
+            self.rings = {ch: Ring() for ch in self.channels}
+            self.last = {}                  # channel -> Reading
+            self.span = WINDOW_SECONDS
+            self.frame_cost = 0.0           # seconds the last paint took
+
+            self._dirty = False
+            self._skip = 0
+            self._painted_at = 0.0
+
+            self.line_pen = QtGui.QPen(QtGui.QColor(LINE_COLOR))
+            self.grid_pen = QtGui.QPen(QtGui.QColor(GRID_COLOR))
+            self.text_pen = QtGui.QPen(QtGui.QColor(TEXT_COLOR))
+            self.background = QtGui.QColor("#ffffff")
+
+            self.setMinimumHeight(36 * len(self.channels))
+            self.timer = QtCore.QTimer(self)
+            self.timer.timeout.connect(self._tick)
+            self.timer.start(FRAME_MS)
+
+        # ====================================================
+        # DATA
+        # ====================================================
+        def add(self, records, now=None):
+            now = time.monotonic() if now is None else now
+            for rec in records:
+                if isinstance(rec, Reading) and rec.channel in self.rings:
+                    self.rings[rec.channel].append(now, rec.value)
+                    self.last[rec.channel] = rec
+                    self._dirty = True
+
+        def feed(self, text):
+            self.add(parse_lines(text))
+
+        def clear(self):
+            for ring in self.rings.values():
+                ring.clear()
+            self.last.clear()
+            self.update()
+
+        # ====================================================
+        # FRAMES
+        # ====================================================
+        def _tick(self):
+            if self._skip:
+                self._skip -= 1
+                return
+            idle = time.monotonic() - self._painted_at >= IDLE_FRAME_MS / 1000
+            if (self._dirty or idle) and self.isVisible():
+                self._dirty = False
+                self.update()
+
+        def wheelEvent(self, event):
+            steps = event.angleDelta().y() / 120
+            self.span = min(MAX_WINDOW, max(MIN_WINDOW, self.span * 0.8 ** steps))
+            self.update()
+
+        def paintEvent(self, event):
+            start = time.perf_counter()
+            p = QtGui.QPainter(self)
+            p.fillRect(self.rect(), self.background)
+
+            lanes = len(self.channels)
+            lane_h = self.height() / max(1, lanes)
+            width = max(1, self.width() - LABEL_WIDTH - 4)
+            t1 = time.monotonic()
+            t0 = t1 - self.span
+
+            for i, ch in enumerate(self.channels):
+                top = i * lane_h
+                p.setPen(self.grid_pen)
+                p.drawLine(QtCore.QPointF(0, top + lane_h), QtCore.QPointF(self.width(), top + lane_h))
+
+                p.setPen(self.text_pen)
+                rec = self.last.get(ch)
+                value = format_reading(rec) if rec else "--"
+                p.drawText(QtCore.QPointF(4, top + lane_h / 2 + 5), f"{ch}: {value}")
+
+                x, y = minmax_decimate(*self.rings[ch].view(), t0, t1, width)
+                if not len(x):
+                    continue
+                lo, hi = float(y.min()), float(y.max())
+                if hi - lo < 1e-6:
+                    lo, hi = lo - 0.5, hi + 0.5
+                scale = (lane_h - 8) / (hi - lo)
+
+                px = LABEL_WIDTH + (x - t0) * (width / self.span)
+                py = top + lane_h - 4 - (y - lo) * scale
+                p.setPen(self.line_pen)
+                p.drawPolyline(polyline(px, py))
+
+            p.end()
+            self._painted_at = time.monotonic()
+            self.frame_cost = time.perf_counter() - start
+            # over budget: sit out whole frames rather than queue paints
+            self._skip = int(self.frame_cost * 1000 // FRAME_MS)
+
+    return TrendPlot